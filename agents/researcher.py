@@ -1,12 +1,12 @@
 # agents/researcher.py
 
 from crewai import Agent
-from models.local_llm import get_local_llm, load_yaml_config
-from tools.web_search import WebSearchTool
+from models.local_llm import load_yaml_config
+from models.routing import get_stage_llm
 
 
 class ResearchAgent:
-    def create(self):
+    def create(self, llm=None):
         config = load_yaml_config()
         a = config["agents"]["researcher"]
 
@@ -14,7 +14,8 @@ class ResearchAgent:
             role=a["role"],
             goal=a["goal"],
             backstory=a["backstory"],
+            # Import tools.web_search lazily here if the tool is re-enabled
             #       tools=[WebSearchTool.tool()],
             verbose=True,
-            llm=get_local_llm(),
+            llm=llm or get_stage_llm("researcher"),
         )
@@ -0,0 +1,137 @@
+# agents/section_reviewer.py
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+from models.local_llm import load_yaml_config
+from models.routing import get_stage_llm
+from utils.sections import Section, join_sections, split_sections
+from utils.telemetry import span
+from utils.tokens import estimate_tokens
+
+
+KEEP = "KEEP"
+
+
+class SectionReviewer:
+    """Reviews a tutorial one section at a time, rewriting only what needs it.
+
+    Each section gets its own model call and the sections are reviewed
+    concurrently. The model answers KEEP for a section that is fine, so
+    the output size follows the size of the edits rather than of the
+    document. Sections it does not change are kept verbatim.
+    """
+
+    def __init__(self, llm=None, max_workers: int = 4):
+        # Streaming is off: concurrent sections would interleave their tokens
+        self.llm = llm or get_stage_llm("reviewer", stream=False)
+        self.max_workers = max_workers
+        self.stats = {}
+
+    def review(self, draft: str, topic: str, only_lines: set = None) -> str:
+        """Review ``draft``; with ``only_lines``, only the sections containing
+        one of those (0-based) lines are sent to the model."""
+        sections = split_sections(draft)
+        outline = "\n".join(s.heading for s in sections if s.heading)
+        system = self._system_prompt()
+
+        selected = set(range(len(sections)))
+        if only_lines is not None:
+            selected = set()
+            start = 0
+            for index, section in enumerate(sections):
+                end = start + len(section.text.splitlines())
+                if any(start <= line < end for line in only_lines):
+                    selected.add(index)
+                start = end
+
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(self.max_workers, len(selected))),
+            thread_name_prefix="section-review",
+        ) as executor:
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run,
+                    self._review_section,
+                    system,
+                    topic,
+                    outline,
+                    index,
+                    section,
+                )
+                for index, section in enumerate(sections)
+                if index in selected
+            ]
+            results = iter([future.result() for future in futures])
+            reviewed = [
+                next(results) if index in selected else section
+                for index, section in enumerate(sections)
+            ]
+
+        changed = sum(1 for new, old in zip(reviewed, sections) if new is not old)
+        self.stats = {
+            "sections": len(sections),
+            "reviewed": len(selected),
+            "changed": changed,
+            "draft_tokens": estimate_tokens(draft),
+            "rewritten_tokens": sum(
+                estimate_tokens(new.text)
+                for new, old in zip(reviewed, sections)
+                if new is not old
+            ),
+        }
+        print(f"[Review] {changed}/{len(sections)} section(s) changed")
+        return join_sections(reviewed)
+
+    def _system_prompt(self) -> str:
+        a = load_yaml_config()["agents"]["reviewer"]
+        return (
+            f"You are a {a['role']}. {a['backstory']}\n"
+            f"Your goal: {a['goal']}\n"
+            "You review one section of a tutorial at a time. If the section is "
+            f"already clear, correct and well written, reply with exactly {KEEP}. "
+            "Otherwise reply with only the improved section in markdown, starting "
+            "with the same heading, and nothing else."
+        )
+
+    def _review_section(self, system, topic, outline, index, section):
+        if not section.text.strip():
+            return section
+
+        with span("review.section", index=index) as record:
+            messages = [
+                {"role": "system", "content": system},
+                {
+                    "role": "user",
+                    "content": (
+                        f"Tutorial topic: {topic}\n"
+                        f"Tutorial outline:\n{outline}\n\n"
+                        f"Review this section:\n\n{section.text}"
+                    ),
+                },
+            ]
+            try:
+                reply = str(self.llm.call(messages) or "").strip()
+            except Exception as e:
+                # A failed review leaves the writer's section as it was
+                print(f"[Review] Section {index} kept after error: {e}")
+                return section
+
+            replacement = self._parse_reply(reply, section)
+            record.attrs["changed"] = replacement is not section
+            return replacement
+
+    def _parse_reply(self, reply: str, section):
+        first_line = reply.splitlines()[0] if reply else ""
+        if not reply or first_line.strip(" .\"'`*").upper() == KEEP:
+            return section
+
+        # Unwrap a reply the model fenced as a markdown block
+        if reply.startswith("```") and reply.endswith("```"):
+            reply = reply.split("\n", 1)[-1].rsplit("```", 1)[0].strip()
+
+        if section.heading and not reply.startswith("#"):
+            reply = f"{section.heading}\n\n{reply}"
+
+        # Keep the original trailing spacing so sections join as before
+        trailing = section.text[len(section.text.rstrip()) :]
+        return Section(reply + (trailing or "\n"), section.heading, section.level)
@@ -1,10 +1,11 @@
 # agents/writer.py
 from crewai import Agent
-from models.local_llm import get_local_llm, load_yaml_config
+from models.local_llm import load_yaml_config
+from models.routing import get_stage_llm
 
 
 class WriterAgent:
-    def create(self):
+    def create(self, llm=None):
         config = load_yaml_config()
         a = config["agents"]["writer"]
 
@@ -13,6 +14,6 @@ class WriterAgent:
             goal=a["goal"],
             backstory=a["backstory"],
             verbose=True,
-            llm=get_local_llm(),
+            llm=llm or get_stage_llm("writer"),
             allow_delegation=False,
         )
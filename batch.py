@@ -0,0 +1,193 @@
+# batch.py
+"""Generate tutorials for many topics with a bounded number of concurrent crews.
+
+Usage:
+    python batch.py topics.txt
+    cat topics.txt | python batch.py - --concurrency 4
+
+Topics are read one per line; blank lines and lines starting with '#' are
+ignored. Each topic gets its own markdown file in the output directory and a
+summary report with per-topic latency and failures is written next to them.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from models.local_llm import load_yaml_config
+from utils.filenames import safe_filename
+
+
+DEFAULT_OUTPUT_DIR = os.path.join("output", "batch")
+
+
+def read_topics(source: str) -> list:
+    """Read topics from a file path, or from stdin when ``source`` is '-'."""
+    if source == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(source, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+
+    topics = []
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            topics.append(line)
+    return topics
+
+
+def assign_output_files(topics: list, output_dir: str) -> list:
+    """Give every topic its own output path, de-duplicating clashing names."""
+    used = set()
+    paths = []
+    for topic in topics:
+        stem = safe_filename(topic)
+        name = stem
+        suffix = 2
+        while name.lower() in used:
+            name = f"{stem}_{suffix}"
+            suffix += 1
+        used.add(name.lower())
+        paths.append(os.path.join(output_dir, f"{name}.md"))
+    return paths
+
+
+def generate_one(topic: str, output_file: str, use_cache=True, refresh=False) -> dict:
+    # Imported lazily so that `--help` and topic parsing stay fast
+    from main import run
+
+    started = time.perf_counter()
+    try:
+        run(
+            topic,
+            output_file=output_file,
+            verbose=False,
+            use_cache=use_cache,
+            refresh=refresh,
+        )
+        status, error = "done", None
+    except Exception as e:
+        status, error = "failed", f"{type(e).__name__}: {e}"
+
+    return {
+        "topic": topic,
+        "status": status,
+        "output_file": output_file if status == "done" else None,
+        "latency_seconds": round(time.perf_counter() - started, 3),
+        "error": error,
+    }
+
+
+def run_batch(
+    topics: list,
+    output_dir: str,
+    concurrency: int,
+    use_cache: bool = True,
+    refresh: bool = False,
+) -> dict:
+    """Run one crew per topic, at most ``concurrency`` at a time."""
+    os.makedirs(output_dir, exist_ok=True)
+    output_files = assign_output_files(topics, output_dir)
+    started_at = datetime.now().isoformat(timespec="seconds")
+    started = time.perf_counter()
+    print_lock = threading.Lock()
+
+    # Results are stored by input position so the report keeps topic order
+    results = [None] * len(topics)
+    completed = 0
+    with ThreadPoolExecutor(
+        max_workers=concurrency, thread_name_prefix="batch-crew"
+    ) as executor:
+        futures = {
+            executor.submit(generate_one, topic, path, use_cache, refresh): i
+            for i, (topic, path) in enumerate(zip(topics, output_files))
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            results[futures[future]] = result
+            completed += 1
+            with print_lock:
+                mark = "✅" if result["status"] == "done" else "❌"
+                print(
+                    f"[Batch] {mark} {completed}/{len(topics)} "
+                    f"{result['topic']} ({result['latency_seconds']:.1f}s)"
+                )
+
+    latencies = [r["latency_seconds"] for r in results]
+    failures = [r for r in results if r["status"] == "failed"]
+    return {
+        "started_at": started_at,
+        "concurrency": concurrency,
+        "topics": len(topics),
+        "succeeded": len(topics) - len(failures),
+        "failed": len(failures),
+        "wall_seconds": round(time.perf_counter() - started, 3),
+        "serial_seconds": round(sum(latencies), 3),
+        "max_latency_seconds": max(latencies, default=0),
+        "results": results,
+    }
+
+
+def main(argv=None):
+    batch_config = load_yaml_config().get("batch", {})
+
+    parser = argparse.ArgumentParser(
+        description="Generate tutorials for a list of topics."
+    )
+    parser.add_argument("topics", help="File with one topic per line, or '-' for stdin")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=batch_config.get("concurrency", 2),
+        help="Maximum number of crews running at once (match OLLAMA_NUM_PARALLEL)",
+    )
+    parser.add_argument(
+        "--output-dir",
+        default=batch_config.get("output_dir", DEFAULT_OUTPUT_DIR),
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Bypass the tutorial result cache"
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Regenerate even if cached, then update the cache",
+    )
+    args = parser.parse_args(argv)
+
+    topics = read_topics(args.topics)
+    if not topics:
+        print("[Batch] No topics to generate.")
+        return 1
+
+    concurrency = max(1, args.concurrency)
+    print(f"[Batch] Generating {len(topics)} tutorial(s), {concurrency} at a time")
+    summary = run_batch(
+        topics,
+        args.output_dir,
+        concurrency,
+        use_cache=not args.no_cache,
+        refresh=args.refresh,
+    )
+
+    report_file = os.path.join(args.output_dir, "batch_report.json")
+    with open(report_file, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+
+    print(
+        f"\n[Batch] {summary['succeeded']}/{summary['topics']} succeeded in "
+        f"{summary['wall_seconds']:.1f}s (serial time {summary['serial_seconds']:.1f}s)"
+    )
+    for failure in (r for r in summary["results"] if r["status"] == "failed"):
+        print(f"[Batch] ❌ {failure['topic']}: {failure['error']}")
+    print(f"[Batch] Report saved to {report_file}")
+
+    return 0 if not summary["failed"] else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+# benchmarks/bench_startup.py
+"""Startup import-time report and budget check for the CLI, batch runner and UI.
+
+Each entry point's imports run in a fresh interpreter under
+``python -X importtime``. The report lists the slowest modules, and the
+script exits non-zero if an entry point exceeds the time budget or pulls in
+a module that should only load once generation starts.
+
+Usage:
+    python benchmarks/bench_startup.py [--budget-ms 500] [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# What each entry point imports before it knows whether it has to generate.
+# The UI entry leaves out streamlit itself, which is the framework's cost.
+ENTRY_POINTS = {
+    "cli": "import main, utils.input_processor",
+    "batch": "import batch",
+    "ui": (
+        "import utils.input_processor, utils.filenames, utils.job_queue, "
+        "models.warmup"
+    ),
+}
+
+# Packages that must only be imported once a crew actually runs
+DEFERRED_PACKAGES = ("crewai", "litellm", "ddgs", "requests", "agents", "tasks")
+
+
+def import_profile(statement: str) -> list:
+    """Return ``(module, self_us, cumulative_us, depth)`` rows for ``statement``."""
+    python_path = os.pathsep.join(
+        filter(None, [ROOT, os.environ.get("PYTHONPATH")])
+    )
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT,
+        env=dict(os.environ, PYTHONPATH=python_path),
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def profile_entry(statement: str, baseline: set, runs: int) -> dict:
+    """Median import time of modules not already loaded by a bare interpreter."""
+    totals = []
+    rows = []
+    for _ in range(runs):
+        rows = [row for row in import_profile(statement) if row[0] not in baseline]
+        # Top-level rows' cumulative times cover everything imported beneath them
+        totals.append(sum(row[2] for row in rows if row[3] == 0))
+
+    modules = {row[0] for row in rows}
+    return {
+        "milliseconds": statistics.median(totals) / 1000,
+        "modules": len(modules),
+        "slowest": sorted(rows, key=lambda row: row[1], reverse=True)[:10],
+        "deferred_loaded": sorted(
+            {name.split(".")[0] for name in modules} & set(DEFERRED_PACKAGES)
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=500.0)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--entry", choices=sorted(ENTRY_POINTS), action="append")
+    args = parser.parse_args()
+
+    baseline = {row[0] for row in import_profile("pass")}
+
+    failures = []
+    for entry in args.entry or list(ENTRY_POINTS):
+        try:
+            report = profile_entry(ENTRY_POINTS[entry], baseline, max(1, args.runs))
+        except RuntimeError as e:
+            print(f"\n[{entry}] import failed: {e}")
+            failures.append(f"{entry}: import failed ({e})")
+            continue
+        print(
+            f"\n[{entry}] {report['milliseconds']:.1f}ms for {report['modules']} "
+            f"module(s) (budget {args.budget_ms:.0f}ms)"
+        )
+        print(f"  {'self [us]':>10} {'cumulative':>11}  module")
+        for name, self_us, cumulative_us, depth in report["slowest"]:
+            print(f"  {self_us:>10} {cumulative_us:>11}  {'  ' * depth}{name}")
+
+        if report["milliseconds"] > args.budget_ms:
+            failures.append(f"{entry}: {report['milliseconds']:.1f}ms over budget")
+        if report["deferred_loaded"]:
+            failures.append(
+                f"{entry}: imports {', '.join(report['deferred_loaded'])} at startup"
+            )
+
+    if failures:
+        print("\nStartup budget check failed:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+
+    print("\nStartup budget check passed.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+# benchmarks/bench_term_extraction.py
+"""Micro-benchmark: Counter/heapq term extraction vs the original implementation.
+
+Usage:
+    python benchmarks/bench_term_extraction.py [--scales 1 10 100 1000]
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+
+from tools.term_extraction import DocumentFrequencyStore, TermExtractor
+
+CORPUS_FILE = os.path.join(os.path.dirname(__file__), "data", "ddgs_results.json")
+
+
+def legacy_extract_important_terms(text: str) -> list:
+    """The original DuckDuckGoSearchTool._extract_important_terms."""
+    words = re.findall(r"\b[a-zA-Z]{4,}\b", text)
+    stop_words = {
+        "that", "this", "with", "from", "they", "have", "were", "been", "their",
+        "said", "each", "which", "then", "them", "these", "will", "about",
+        "would", "there", "could", "other", "more", "very", "what", "know",
+        "just", "first", "also", "after", "back", "work", "way", "only", "new",
+        "old", "see", "him", "two", "how", "its", "who", "oil", "sit", "now",
+        "find", "long", "down", "day", "did", "get", "has", "may", "say", "she",
+        "use", "her", "all", "any", "can", "had", "was", "one", "our", "out",
+        "are", "but", "not", "you", "all", "can", "had", "her", "was", "one",
+        "our", "out", "day", "get", "has", "him", "his", "how", "man", "new",
+        "now", "old", "see", "two", "way", "who", "boy", "did", "its", "let",
+        "put", "say", "she", "too", "use",
+    }  # fmt: skip
+    filtered_words = [word for word in words if word.lower() not in stop_words]
+
+    word_freq = {}
+    for word in filtered_words:
+        word_freq[word] = word_freq.get(word, 0) + 1
+
+    sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
+    return [word for word, freq in sorted_words if freq > 1][:10]
+
+
+def time_call(func, text, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func(text)
+    return (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100, 1000])
+    args = parser.parse_args()
+
+    with open(CORPUS_FILE, "r", encoding="utf-8") as f:
+        results = json.load(f)["results"]
+    base_text = " ".join(r["body"] for r in results).lower()
+
+    extractor = TermExtractor()
+    print(f"{'words':>9} {'legacy':>12} {'extractor':>12} {'speedup':>8}  same output")
+    for scale in args.scales:
+        text = " ".join([base_text] * scale)
+        repeat = max(3, 300 // scale)
+        legacy = time_call(legacy_extract_important_terms, text, repeat)
+        current = time_call(extractor.extract, text, repeat)
+        same = legacy_extract_important_terms(text) == extractor.extract(text)
+        print(
+            f"{len(text.split()):>9} {legacy * 1000:>10.3f}ms {current * 1000:>10.3f}ms "
+            f"{legacy / current:>7.2f}x  {same}"
+        )
+
+    # TF-IDF: feed each result as a past search, then rank the combined text
+    with tempfile.TemporaryDirectory() as tmp:
+        store = DocumentFrequencyStore(os.path.join(tmp, "df.sqlite"))
+        tfidf = TermExtractor(store, use_tfidf=True)
+        for result in results:
+            tfidf.extract(result["body"].lower())
+        print(f"\nFrequency ranking: {extractor.extract(base_text)}")
+        print(f"TF-IDF ranking:    {tfidf.extract(base_text)}")
+
+
+if __name__ == "__main__":
+    main()
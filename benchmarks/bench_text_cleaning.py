@@ -0,0 +1,100 @@
+# benchmarks/bench_text_cleaning.py
+"""Micro-benchmark: precompiled text cleaning engine vs the original _clean_text.
+
+Usage:
+    python benchmarks/bench_text_cleaning.py [--searches 2000]
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+
+from tools.text_cleaning import clean_text
+
+CORPUS_FILE = os.path.join(os.path.dirname(__file__), "data", "ddgs_results.json")
+
+
+def legacy_clean_text(text: str) -> str:
+    """The original DuckDuckGoSearchTool._clean_text, kept for comparison."""
+    if not text:
+        return ""
+
+    cleaned = re.sub(r"\s+", " ", text)
+    cleaned = re.sub(r'[^\w\s\-.,!?;:()\[\]{}"/·&%$#@]', "", cleaned)
+
+    date_patterns = [
+        r"\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2},?\s+\d{4}\b",
+        r"\b\d{1,2}[-/]\d{1,2}[-/]\d{2,4}\b",
+        r"\b\d{4}[-/]\d{1,2}[-/]\d{1,2}\b",
+        r"\b\d+\s+(?:hours?|days?|minutes?|seconds?)\s+ago\b",
+    ]
+    for pattern in date_patterns:
+        cleaned = re.sub(pattern, "", cleaned, flags=re.IGNORECASE)
+
+    ui_patterns = [
+        r"\b(?:click|menu|navigation|breadcrumb|sidebar|footer|header)\b",
+        r"\b(?:home|contact|about|login|register|subscribe)\b",
+        r"\b(?:read more|learn more|continue reading|view all)\b",
+    ]
+    for pattern in ui_patterns:
+        cleaned = re.sub(pattern, "", cleaned, flags=re.IGNORECASE)
+
+    cleaned = re.sub(r"\s+", " ", cleaned)
+    return cleaned.strip()
+
+
+def simulate_search(results, clean):
+    """Clean text the way one search does: titles and bodies, then the summary."""
+    for result in results[:6]:
+        clean(result["title"])
+        clean(result["body"])
+    for result in results[:5]:
+        clean(result["body"])
+
+
+def bench(label, results, clean, searches, reset=None):
+    start = time.perf_counter()
+    for i in range(searches):
+        if reset is not None:
+            # Each search sees fresh text, so clear the memo between searches
+            reset()
+        simulate_search(results, clean)
+    elapsed = time.perf_counter() - start
+    per_search_us = elapsed / searches * 1e6
+    print(f"{label:<28} {elapsed * 1000:9.1f} ms total  {per_search_us:8.1f} µs/search")
+    return per_search_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--searches", type=int, default=2000)
+    args = parser.parse_args()
+
+    with open(CORPUS_FILE, "r", encoding="utf-8") as f:
+        results = json.load(f)["results"]
+
+    texts = [r["title"] for r in results] + [r["body"] for r in results]
+    mismatches = [t for t in texts if legacy_clean_text(t) != clean_text(t)]
+    print(f"Corpus: {len(results)} results, {len(mismatches)} output mismatch(es)")
+    for text in mismatches:
+        print(f"  legacy: {legacy_clean_text(text)!r}")
+        print(f"  engine: {clean_text(text)!r}")
+
+    legacy = bench("legacy _clean_text", results, legacy_clean_text, args.searches)
+    engine = bench(
+        "engine (memo reset/search)",
+        results,
+        clean_text,
+        args.searches,
+        reset=clean_text.cache_clear,
+    )
+    print(f"Speedup: {legacy / engine:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# benchmarks/bench_tutorial_index.py
+"""Micro-benchmark: tutorial archive lookups with many archived tutorials.
+
+Fills a scratch index with synthetic tutorials, then times the exact-topic
+lookup, the near-duplicate lookup and the related-topic search that run
+before every crew starts.
+
+Usage:
+    python benchmarks/bench_tutorial_index.py [--tutorials 20000]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from functools import partial
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+
+from utils.tutorial_index import TutorialIndex
+
+SUBJECTS = [
+    "lists", "dictionaries", "tuples", "sets", "strings", "functions", "classes",
+    "decorators", "generators", "iterators", "closures", "exceptions", "modules",
+    "packages", "comprehensions", "lambdas", "recursion", "sorting", "file io",
+    "regular expressions", "async", "threads", "processes", "sockets", "typing",
+    "dataclasses", "enums", "context managers", "logging", "testing",
+]
+QUALIFIERS = [
+    "python", "advanced", "beginner", "introduction to", "working with",
+    "understanding", "performance of", "common mistakes with", "best practices for",
+    "a guide to", "examples of", "debugging",
+]
+# Lookups in main.run only consider tutorials from the current models and crew
+CURRENT = {"model": "mistral:latest", "definition": "0123456789abcdef"}
+FILLER = (
+    "This section explains the idea step by step with a short example and a "
+    "summary of the common pitfalls beginners run into. "
+)
+
+
+def synthetic_topic(rng: random.Random, n: int) -> str:
+    return f"{rng.choice(QUALIFIERS)} {rng.choice(SUBJECTS)} part {n}"
+
+
+def fill(index: TutorialIndex, count: int, rng: random.Random):
+    for n in range(count):
+        topic = synthetic_topic(rng, n)
+        content = f"# {topic.title()}\n\n" + FILLER * rng.randint(20, 60)
+        index.add(topic, content + str(n), stats={"words": 0}, **CURRENT)
+
+
+def timed(fn, queries) -> dict:
+    samples = []
+    for query in queries:
+        started = time.perf_counter()
+        fn(query)
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "mean_ms": round(statistics.mean(samples), 3),
+        "p50_ms": round(samples[len(samples) // 2], 3),
+        "p99_ms": round(samples[int(len(samples) * 0.99) - 1], 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tutorials", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as work_dir:
+        index = TutorialIndex(os.path.join(work_dir, "tutorials.sqlite"))
+
+        started = time.perf_counter()
+        fill(index, args.tutorials, rng)
+        fill_seconds = time.perf_counter() - started
+
+        archived = [synthetic_topic(rng, n) for n in range(args.queries)]
+        related = [
+            f"{rng.choice(QUALIFIERS)} {rng.choice(SUBJECTS)}"
+            for _ in range(args.queries)
+        ]
+        results = {
+            "tutorials": args.tutorials,
+            "fill_seconds": round(fill_seconds, 3),
+            "find_exact": timed(partial(index.find_exact, **CURRENT), archived),
+            "find_similar": timed(partial(index.find_similar, **CURRENT), related),
+            "search_related": timed(index.search, related),
+            "search_unknown": timed(index.search, ["rust borrow checker"] * 50),
+        }
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
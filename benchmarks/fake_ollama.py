@@ -0,0 +1,279 @@
+# benchmarks/fake_ollama.py
+"""Local stand-in for the Ollama HTTP API with configurable per-token latency.
+
+Serves /api/generate, /api/chat, /api/tags, /api/show and /api/version with
+canned responses, streaming NDJSON when the request asks for it. Responses
+are shaped so CrewAI agents accept them as final answers.
+
+Usage:
+    python benchmarks/fake_ollama.py --port 11435 --token-latency 0.01
+"""
+import argparse
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# Keys are matched against the prompt; they follow the task descriptions in
+# tasks/generate_tutorial.py so each agent gets a plausible answer.
+DEFAULT_RESPONSES = {
+    "research the topic": (
+        "Thought: I now can give a great answer\n"
+        "Final Answer: Key points: definition, syntax, common operations, "
+        "examples, best practices and pitfalls. Example: items = [1, 2, 3]."
+    ),
+    # Parallel research mode: one task per angle, then a merge task
+    "of the topic:": (
+        "Thought: I now can give a great answer\n"
+        "Final Answer: Key points for this angle, with an example: items = [1, 2, 3]."
+    ),
+    "merge the research findings": (
+        "Thought: I now can give a great answer\n"
+        "Final Answer: Key points: definition, syntax, common operations, "
+        "examples, best practices and pitfalls. Example: items = [1, 2, 3]."
+    ),
+    "write a beginner-friendly tutorial": (
+        "Thought: I now can give a great answer\n"
+        "Final Answer: # Tutorial\n\n## Introduction\n\nThis tutorial explains "
+        "the topic step by step.\n\n## Example\n\n```python\nitems = [1, 2, 3]\n"
+        "print(items)\n```\n\n## Summary\n\nYou learned the basics."
+    ),
+    "review the": (
+        "Thought: I now can give a great answer\n"
+        "Final Answer: # Tutorial\n\n## Introduction\n\nThis tutorial explains "
+        "the topic clearly, step by step.\n\n## Example\n\n```python\n"
+        "items = [1, 2, 3]\nprint(items)\n```\n\n## Summary\n\nYou learned the basics."
+    ),
+    # Section review mode answers per section without an agent wrapper
+    "review this section": "KEEP",
+    "topic formatter": "Python Lists",
+}
+
+DEFAULT_RESPONSE = "Thought: I now can give a great answer\nFinal Answer: OK"
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class FakeOllama:
+    """Canned-response engine plus request statistics shared by the handler."""
+
+    def __init__(
+        self, token_latency=0.0, load_latency=0.0, responses=None, num_parallel=None
+    ):
+        self.token_latency = token_latency
+        # Like OLLAMA_NUM_PARALLEL: requests beyond this many wait for a slot
+        self.slots = threading.Semaphore(num_parallel) if num_parallel else None
+        self.load_latency = load_latency
+        self.responses = dict(DEFAULT_RESPONSES if responses is None else responses)
+        self.loaded_models = set()
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def pick_response(self, prompt: str) -> str:
+        # Match on the latest part of the prompt first: the task description
+        lowered = prompt.lower()
+        best, best_pos = DEFAULT_RESPONSE, -1
+        for needle, response in self.responses.items():
+            pos = lowered.rfind(needle.lower())
+            if pos > best_pos:
+                best, best_pos = response, pos
+        return best
+
+    def begin(self, model: str) -> float:
+        """Record a request; return the simulated model load time, if any."""
+        if self.slots is not None:
+            self.slots.acquire()
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            cold = model not in self.loaded_models
+            self.loaded_models.add(model)
+        return self.load_latency if cold else 0.0
+
+    def end(self):
+        with self._lock:
+            self.in_flight -= 1
+        if self.slots is not None:
+            self.slots.release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"requests": self.requests, "max_in_flight": self.max_in_flight}
+
+
+def make_handler(engine: FakeOllama):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, payload, status=200):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path.startswith("/api/tags"):
+                self._send_json({"models": [{"name": m} for m in engine.loaded_models]})
+            elif self.path.startswith("/api/version"):
+                self._send_json({"version": "0.0.0-fake"})
+            else:
+                self._send_json({"status": "ok"})
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+
+            if self.path.startswith("/api/show"):
+                self._send_json({"model_info": {}, "details": {}, "template": ""})
+                return
+            if self.path.startswith("/api/generate"):
+                self._complete(request, request.get("prompt", ""), chat=False)
+                return
+            if self.path.startswith("/api/chat"):
+                prompt = "\n".join(
+                    str(m.get("content", "")) for m in request.get("messages", [])
+                )
+                self._complete(request, prompt, chat=True)
+                return
+            self._send_json({"error": "not found"}, status=404)
+
+        def _complete(self, request, prompt, chat):
+            model = request.get("model", "fake")
+            load_seconds = engine.begin(model)
+            try:
+                if load_seconds:
+                    time.sleep(load_seconds)
+
+                # An empty prompt is Ollama's way of just loading the model
+                text = engine.pick_response(prompt) if prompt else ""
+                words = text.split(" ") if text else []
+                tokens = [w + (" " if i < len(words) - 1 else "") for i, w in enumerate(words)]
+                final = {
+                    "model": model,
+                    "created_at": datetime.now(timezone.utc).isoformat(),
+                    "done": True,
+                    "done_reason": "stop",
+                    "load_duration": int(load_seconds * 1e9),
+                    "prompt_eval_count": estimate_tokens(prompt),
+                    "eval_count": len(tokens),
+                }
+
+                if request.get("stream", True):
+                    self._stream(model, tokens, final, chat)
+                else:
+                    time.sleep(engine.token_latency * len(tokens))
+                    if chat:
+                        final["message"] = {"role": "assistant", "content": text}
+                    else:
+                        final["response"] = text
+                    self._send_json(final)
+            finally:
+                engine.end()
+
+        def _stream(self, model, tokens, final, chat):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+
+            def write_chunk(payload):
+                line = (json.dumps(payload) + "\n").encode("utf-8")
+                self.wfile.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+                self.wfile.flush()
+
+            for token in tokens:
+                time.sleep(engine.token_latency)
+                chunk = {"model": model, "done": False}
+                if chat:
+                    chunk["message"] = {"role": "assistant", "content": token}
+                else:
+                    chunk["response"] = token
+                write_chunk(chunk)
+
+            if chat:
+                final["message"] = {"role": "assistant", "content": ""}
+            else:
+                final["response"] = ""
+            write_chunk(final)
+            self.wfile.write(b"0\r\n\r\n")
+
+    return Handler
+
+
+class FakeOllamaServer:
+    """Runs a FakeOllama engine on a background thread.
+
+    Use as a context manager; ``base_url`` is valid inside the block.
+    """
+
+    def __init__(
+        self,
+        port=0,
+        token_latency=0.0,
+        load_latency=0.0,
+        responses=None,
+        num_parallel=None,
+    ):
+        self.engine = FakeOllama(token_latency, load_latency, responses, num_parallel)
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(self.engine))
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--token-latency", type=float, default=0.01)
+    parser.add_argument("--load-latency", type=float, default=0.0)
+    parser.add_argument(
+        "--num-parallel", type=int, default=None, help="Concurrent request slots"
+    )
+    args = parser.parse_args()
+
+    server = FakeOllamaServer(
+        args.port, args.token_latency, args.load_latency, num_parallel=args.num_parallel
+    )
+    print(f"Fake Ollama listening on {server.base_url}")
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+# benchmarks/run_benchmarks.py
+"""End-to-end pipeline benchmark against a fake Ollama server and stubbed DDGS.
+
+Measures main.run() latency, per-agent latency, crew setup overhead,
+search-tool processing time, first-call latency with and without model
+warm-up and LLM throughput over one or more backends, then stores the
+results as JSON so they can be compared between commits.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--runs 3] [--token-latency 0.005]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import yaml
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(ROOT)
+sys.path.append(BENCH_DIR)
+
+from fake_ollama import FakeOllamaServer
+from stub_ddgs import install_stub_ddgs, load_corpus
+
+DEFAULT_RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+
+def write_bench_config(base_url: str, work_dir: str, research_mode: str) -> str:
+    """Copy the crew config, pointed at the fake server with caches disabled."""
+    with open(os.path.join(ROOT, "configs", "crew_config.yaml"), "r") as f:
+        config = yaml.safe_load(f)
+
+    config["llm"]["base_url"] = base_url
+    config["llm"]["replay"] = False
+    config["llm"].pop("temperature", None)
+    config.setdefault("search", {}).setdefault("cache", {})["enabled"] = False
+    # The stub search backend needs no pacing; it would dominate the timings
+    config["search"].setdefault("governor", {})["enabled"] = False
+    config.setdefault("result_cache", {})["enabled"] = False
+    config.setdefault("archive", {})["enabled"] = False
+    config.setdefault("similarity", {})["enabled"] = False
+    config.setdefault("input_processor", {})["memo_enabled"] = False
+    # The canned draft is short enough to skip review, dropping the reviewer
+    # from the per-agent numbers; every run reviews as before the gate existed
+    config.setdefault("review", {}).setdefault("gate", {})["enabled"] = False
+    config.setdefault("research", {})["mode"] = research_mode
+
+    path = os.path.join(work_dir, "crew_config.yaml")
+    with open(path, "w") as f:
+        yaml.safe_dump(config, f)
+    return path
+
+
+def summarize(samples: list) -> dict:
+    return {
+        "mean": round(statistics.mean(samples), 6),
+        "median": round(statistics.median(samples), 6),
+        "min": round(min(samples), 6),
+        "max": round(max(samples), 6),
+        "runs": len(samples),
+    }
+
+
+def bench_setup(runs: int) -> dict:
+    from agents.researcher import ResearchAgent
+    from agents.writer import WriterAgent
+    from agents.reviewer import ReviewerAgent
+    from tasks.generate_tutorial import GenerateTutorialTask
+
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        researcher = ResearchAgent().create()
+        writer = WriterAgent().create()
+        reviewer = ReviewerAgent().create()
+        GenerateTutorialTask().create(researcher, writer, reviewer, "Python Lists")
+        samples.append(time.perf_counter() - started)
+
+    # The first sample includes config parsing and client creation
+    return {"cold_seconds": round(samples[0], 6), "warm": summarize(samples[1:] or samples)}
+
+
+def bench_search(iterations: int, ddgs_stats: dict) -> dict:
+    from tools.web_search import DuckDuckGoSearchTool
+
+    tool = DuckDuckGoSearchTool()
+    results = load_corpus()
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        tool._extract_content(results, "python lists")
+    processing = (time.perf_counter() - started) / iterations
+
+    queries_before = ddgs_stats["queries"]
+    started = time.perf_counter()
+    tool._run("python lists")
+    full_run = time.perf_counter() - started
+
+    return {
+        "processing_seconds": round(processing, 6),
+        "run_seconds": round(full_run, 6),
+        "ddgs_queries_per_run": ddgs_stats["queries"] - queries_before,
+    }
+
+
+def bench_pipeline(runs: int, topic: str, work_dir: str) -> dict:
+    from main import run
+
+    totals = []
+    per_stage = {}
+    for i in range(runs):
+        events = []
+        started = time.perf_counter()
+        run(
+            topic,
+            output_file=os.path.join(work_dir, f"tutorial_{i}.md"),
+            verbose=False,
+            on_event=events.append,
+            use_cache=False,
+        )
+        totals.append(time.perf_counter() - started)
+        for event in events:
+            if event["type"] == "task_completed":
+                per_stage.setdefault(event["stage"], []).append(event["seconds"])
+
+    return {
+        "total": summarize(totals),
+        "per_agent": {stage: summarize(s) for stage, s in per_stage.items()},
+    }
+
+
+def bench_cold_start(load_latency: float, token_latency: float) -> dict:
+    """Time the first LLM call on a freshly started server, with and without warm-up.
+
+    Each measurement gets its own fake server so the model starts unloaded;
+    the warm-up case preloads it first, as app startup does.
+    """
+    from models.local_llm import get_local_llm, load_yaml_config
+    from models.warmup import ModelWarmer
+
+    model = load_yaml_config()["llm"]["model"]
+    messages = [{"role": "user", "content": "Research the topic: Python Lists"}]
+    results = {"load_latency": load_latency}
+
+    for label, warm in (("cold", False), ("warmed", True)):
+        with FakeOllamaServer(
+            token_latency=token_latency, load_latency=load_latency
+        ) as server:
+            if warm:
+                warmer = ModelWarmer(server.base_url, [model])
+                results["warmup_seconds"] = warmer.warm_up().get(model)
+            llm = get_local_llm(base_url=server.base_url)
+            started = time.perf_counter()
+            llm.call(messages)
+            results[f"first_call_{label}_seconds"] = round(
+                time.perf_counter() - started, 6
+            )
+
+    return results
+
+
+def bench_backends(counts: list, calls: int, token_latency: float) -> dict:
+    """Concurrent LLM call throughput with the calls spread over N backends.
+
+    Every fake server has a single request slot, like one GPU host, so
+    throughput should grow roughly linearly with the number of backends.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from models.backends import BackendPool
+    from models.local_llm import get_local_llm
+
+    messages = [{"role": "user", "content": "Research the topic: Python Lists"}]
+    results = {"calls": calls}
+    for count in counts:
+        servers = [
+            FakeOllamaServer(token_latency=token_latency, num_parallel=1).start()
+            for _ in range(count)
+        ]
+        try:
+            pool = BackendPool([server.base_url for server in servers], 0)
+
+            def one_call(_):
+                return pool.call(
+                    lambda url: get_local_llm(base_url=url, stream=False).call(messages)
+                )
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=max(counts) * 2) as executor:
+                list(executor.map(one_call, range(calls)))
+            seconds = time.perf_counter() - started
+        finally:
+            for server in servers:
+                server.stop()
+
+        results[str(count)] = {
+            "seconds": round(seconds, 6),
+            "calls_per_second": round(calls / seconds, 3),
+            "per_backend": [b["calls"] for b in pool.stats()["backends"]],
+        }
+
+    base = results[str(counts[0])]["calls_per_second"]
+    for count in counts:
+        entry = results[str(count)]
+        entry["speedup"] = round(entry["calls_per_second"] / base, 2)
+    return results
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True
+        ).strip()
+    except Exception:
+        return "unknown"
+
+
+def compare_with_previous(results: dict, results_dir: str):
+    """Print the change in headline numbers against the last stored run."""
+    previous_file = os.path.join(results_dir, "latest.json")
+    if not os.path.exists(previous_file):
+        return
+    with open(previous_file, "r") as f:
+        previous = json.load(f)
+
+    metrics = [
+        ("pipeline mean", ("pipeline", "total", "mean")),
+        ("setup warm mean", ("setup", "warm", "mean")),
+        ("search processing", ("search", "processing_seconds")),
+        ("first call (cold)", ("cold_start", "first_call_cold_seconds")),
+        ("first call (warmed)", ("cold_start", "first_call_warmed_seconds")),
+    ]
+    for count in results.get("backends", {}):
+        if count != "calls":
+            label = f"{count} backend(s)"
+            metrics.append((label, ("backends", count, "seconds")))
+    print(f"\nChange vs {previous['commit']}:")
+    for label, path in metrics:
+        old, new = previous, results
+        for key in path:
+            old, new = old.get(key, {}), new.get(key, {})
+        if isinstance(old, (int, float)) and old and isinstance(new, (int, float)):
+            print(f"  {label:<20} {old:.4f}s -> {new:.4f}s ({(new - old) / old:+.1%})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--topic", default="Python Lists")
+    parser.add_argument("--token-latency", type=float, default=0.005)
+    parser.add_argument("--search-latency", type=float, default=0.05)
+    parser.add_argument(
+        "--load-latency",
+        type=float,
+        default=2.0,
+        help="Simulated model load time for the cold-start measurement",
+    )
+    parser.add_argument("--search-iterations", type=int, default=200)
+    parser.add_argument(
+        "--research-mode", choices=["single", "parallel"], default="single"
+    )
+    parser.add_argument(
+        "--num-parallel",
+        type=int,
+        default=4,
+        help="Request slots on the fake server, like OLLAMA_NUM_PARALLEL",
+    )
+    parser.add_argument(
+        "--backends",
+        default="1,2,4",
+        help="Comma-separated backend counts for the throughput measurement",
+    )
+    parser.add_argument("--backend-calls", type=int, default=24)
+    parser.add_argument("--results-dir", default=DEFAULT_RESULTS_DIR)
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    work_dir = tempfile.mkdtemp(prefix="tutorial-bench-")
+
+    with FakeOllamaServer(
+        token_latency=args.token_latency, num_parallel=args.num_parallel
+    ) as server:
+        # Must happen before any project module reads the config or imports ddgs
+        os.environ["CREW_CONFIG_PATH"] = write_bench_config(
+            server.base_url, work_dir, args.research_mode
+        )
+        ddgs_stats = install_stub_ddgs(latency=args.search_latency)
+
+        started = time.perf_counter()
+        import main  # noqa: F401
+
+        import_seconds = time.perf_counter() - started
+        from models.local_llm import load_yaml_config
+
+        review = load_yaml_config().get("review", {})
+
+        results = {
+            "commit": git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "params": vars(args),
+            "import_seconds": round(import_seconds, 6),
+            "review": {
+                "mode": review.get("mode", "full"),
+                "gate": review.get("gate", {}).get("enabled", True),
+            },
+            "setup": bench_setup(max(2, args.runs)),
+            "search": bench_search(args.search_iterations, ddgs_stats),
+            "pipeline": bench_pipeline(args.runs, args.topic, work_dir),
+            "cold_start": bench_cold_start(args.load_latency, args.token_latency),
+            "backends": bench_backends(
+                [int(n) for n in args.backends.split(",")],
+                args.backend_calls,
+                args.token_latency,
+            ),
+            "server": server.engine.stats(),
+        }
+
+    print(json.dumps(results, indent=2))
+
+    os.makedirs(args.results_dir, exist_ok=True)
+    compare_with_previous(results, args.results_dir)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    result_file = os.path.join(args.results_dir, f"{stamp}-{results['commit']}.json")
+    for path in (result_file, os.path.join(args.results_dir, "latest.json")):
+        with open(path, "w") as f:
+            json.dump(results, f, indent=2)
+    print(f"\nResults saved to {result_file}")
+
+
+if __name__ == "__main__":
+    main()
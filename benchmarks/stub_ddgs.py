@@ -0,0 +1,44 @@
+# benchmarks/stub_ddgs.py
+"""Offline replacement for the ``ddgs`` package used by the search tool.
+
+``install_stub_ddgs()`` registers a fake ``ddgs`` module whose ``DDGS.text``
+returns saved results from benchmarks/data after a configurable delay, so
+search-tool benchmarks never touch the network.
+"""
+import json
+import os
+import sys
+import time
+import types
+
+
+CORPUS_FILE = os.path.join(os.path.dirname(__file__), "data", "ddgs_results.json")
+
+
+def load_corpus(path: str = CORPUS_FILE) -> list:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def install_stub_ddgs(latency: float = 0.0, corpus_file: str = CORPUS_FILE):
+    """Install the stub as ``ddgs`` in ``sys.modules`` and return its stats dict."""
+    corpus = load_corpus(corpus_file)
+    stats = {"queries": 0}
+
+    class DDGS:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def text(self, query, max_results=10, **kwargs):
+            stats["queries"] += 1
+            if latency:
+                time.sleep(latency)
+            return [dict(result) for result in corpus[:max_results]]
+
+    module = types.ModuleType("ddgs")
+    module.DDGS = DDGS
+    sys.modules["ddgs"] = module
+    return stats
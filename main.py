@@ -1,20 +1,39 @@
 # main.py
-from crewai import Crew
-from agents.researcher import ResearchAgent
-from agents.writer import WriterAgent
-from agents.reviewer import ReviewerAgent
-from tasks.generate_tutorial import GenerateTutorialTask
 import os
-from models.local_llm import get_local_llm
+import time
+from models.local_llm import get_registry, load_yaml_config, registry_stats_since
+from models.routing import get_router
+from utils.context_budget import create_context_budget
+from utils.progress import ProgressTracker
+from utils.quality_gate import FULL, LIGHT, SKIP, get_quality_gate
+from utils.result_cache import definition_hash, get_result_cache
+from utils.telemetry import get_metrics, span, start_trace
+from utils.topic_similarity import get_in_flight_topics, similarity_threshold
+from utils.tutorial_index import get_tutorial_index
 
 
 OUTPUT_DIR = "output"
 OUTPUT_FILE = os.path.join(OUTPUT_DIR, "tutorial.md")
+TELEMETRY_SPANS_FILE = os.path.join(OUTPUT_DIR, "telemetry", "spans.jsonl")
+TELEMETRY_METRICS_FILE = os.path.join(OUTPUT_DIR, "telemetry", "metrics.prom")
 
 
-def save_output_to_file(content):
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
+def export_trace(trace):
+    """Append the run's spans as JSON lines and refresh the Prometheus file."""
+    telemetry = load_yaml_config().get("telemetry", {})
+    if not telemetry.get("enabled", True):
+        return
+    trace.write_jsonl(telemetry.get("spans_path", TELEMETRY_SPANS_FILE))
+    get_metrics().write_prometheus(
+        telemetry.get("prometheus_path", TELEMETRY_METRICS_FILE)
+    )
+
+
+def save_output_to_file(content, output_file=OUTPUT_FILE):
+    output_dir = os.path.dirname(output_file)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(output_file, "w", encoding="utf-8") as f:
         # Handle CrewOutput object - extract the raw content
         if hasattr(content, "raw"):
             f.write(str(content.raw))
@@ -22,34 +41,385 @@ def save_output_to_file(content):
             f.write(str(content))
 
 
-def run(topic):
-    llm = get_local_llm()
+STAGES = ["researcher", "writer", "reviewer"]
+
+
+def research_llms(count: int, research_config: dict) -> list:
+    """One LLM client per parallel researcher.
+
+    With ``research.base_urls`` the researchers are spread round-robin over
+    several Ollama servers; otherwise they share the configured server, which
+    then needs ``OLLAMA_NUM_PARALLEL`` >= ``count`` to run them at once.
+    Researchers running together would interleave their tokens in the
+    progress output, so they do not stream.
+    """
+    base_urls = research_config.get("base_urls") or [None]
+    router = get_router()
+    return [
+        router.llm_for(
+            "researcher", base_url=base_urls[i % len(base_urls)], stream=False
+        )
+        for i in range(count)
+    ]
+
+
+def review_draft(draft, topic, report=None, emit=None, llm=None):
+    """Review the writer's draft outside the crew, as the quality gate decided.
+
+    SKIP keeps the draft as is, LIGHT reviews only the sections the gate
+    flagged (all of them if its issues were document-wide) and anything else
+    reviews every section.
+    """
+    from agents.section_reviewer import SectionReviewer
+
+    if report is not None and report.decision == SKIP:
+        return draft
+
+    only_lines = None
+    if report is not None and report.decision == LIGHT and not report.document_wide:
+        only_lines = report.flagged_lines or None
+
+    reviewer = SectionReviewer(
+        llm=llm,
+        max_workers=load_yaml_config().get("review", {}).get("max_workers", 4),
+    )
+    reviewed = reviewer.review(draft, topic, only_lines)
+    if emit:
+        emit({"type": "section_review", **reviewer.stats})
+    return reviewed
+
+
+def run(
+    topic,
+    output_file=OUTPUT_FILE,
+    verbose=True,
+    on_event=None,
+    use_cache=True,
+    refresh=False,
+):
+    """Generate a tutorial for ``topic`` and save it to ``output_file``.
+
+    If ``on_event`` is given it receives progress events (task started and
+    completed, streamed tokens) as the crew runs; see ``ProgressTracker``.
+
+    Finished tutorials are cached by topic, model and crew definition, and
+    archived in the tutorial index; with ``archive.serve_exact`` an archived
+    tutorial for the same topic is served even after the cache evicted it,
+    as long as it was written by the current models and crew definition
+    within ``result_cache.ttl_seconds``. Near-duplicate topics ("Lists in
+    Python" for "Python lists") are served from the archive too, or wait for
+    a run of such a topic already in progress. ``use_cache=False`` bypasses
+    all of these lookups; ``refresh=True`` skips them but stores the newly
+    generated tutorial.
+    """
+    cache = get_result_cache() if use_cache else None
+    if cache is not None and not refresh:
+        cached = cache.get(topic)
+        if cached is not None:
+            save_output_to_file(cached, output_file)
+            print(f"\n⚡ Served cached tutorial for: {topic} ({output_file})")
+            if on_event:
+                on_event({"type": "cache_hit", "topic": topic})
+                on_event({"type": "run_completed", "seconds": 0.0})
+            return cached
+
+    archive = get_tutorial_index()
+    if archive is not None and use_cache and not refresh:
+        archived = None
+        config = load_yaml_config()
+        # The same invalidation rules as the result cache
+        current = {
+            "model": get_router().signature(),
+            "definition": definition_hash(),
+            "max_age": config.get("result_cache", {}).get("ttl_seconds"),
+        }
+        if config.get("archive", {}).get("serve_exact", True):
+            archived = archive.find_exact(topic, **current)
+        threshold = similarity_threshold()
+        if archived is None and threshold:
+            archived = archive.find_similar(topic, threshold, **current)
+        if archived is not None:
+            save_output_to_file(archived.content, output_file)
+            print(
+                f"\n📚 Served archived tutorial #{archived.id} "
+                f"({archived.topic}) for: {topic} ({output_file})"
+            )
+            if on_event:
+                on_event(
+                    {
+                        "type": "archive_hit",
+                        "topic": topic,
+                        "id": archived.id,
+                        "matched_topic": archived.topic,
+                    }
+                )
+                on_event({"type": "run_completed", "seconds": 0.0})
+            return archived.content
+
+    in_flight = get_in_flight_topics() if use_cache and not refresh else None
+    flight, leader = in_flight.start(topic) if in_flight else (None, False)
+    if flight is not None and not leader:
+        print(f"\n⏳ Waiting for the tutorial on '{flight.topic}' already in progress")
+        content = flight.wait()
+        if content is not None:
+            save_output_to_file(content, output_file)
+            if on_event:
+                on_event(
+                    {
+                        "type": "in_flight_hit",
+                        "topic": topic,
+                        "matched_topic": flight.topic,
+                    }
+                )
+                on_event({"type": "run_completed", "seconds": 0.0})
+            return content
+        # The other run failed, so this one generates its own tutorial
+
+    content = None
+    try:
+        content = generate(topic, output_file, verbose, on_event, cache, archive)
+    finally:
+        if leader:
+            in_flight.finish(flight, content)
+    return content
+
+
+def generate(topic, output_file, verbose, on_event, cache, archive):
+    """Run the crew for ``topic``, save the result and store it for reuse."""
+    # The CrewAI stack is only imported once a tutorial has to be generated,
+    # so cached results and the UI's first page load stay fast
+    from crewai import Crew
+    from agents.researcher import ResearchAgent
+    from agents.writer import WriterAgent
+    from agents.reviewer import ReviewerAgent
+    from tasks.generate_tutorial import GenerateTutorialTask, RESEARCH_ANGLES
+    from models.warmup import get_model_warmer
+
+    emit = on_event or (lambda event: None)
+    started = time.perf_counter()
+    setup_snapshot = get_registry().stats()
 
-    researcher = ResearchAgent().create()
-    writer = WriterAgent().create()
-    reviewer = ReviewerAgent().create()
+    with start_trace(topic) as trace:
 
-    # Apply LLM override
-    researcher.llm = llm
-    writer.llm = llm
-    reviewer.llm = llm
+        router = get_router()
+        stage_models = {stage: router.model_for(stage) for stage in STAGES}
+        print(
+            "[Routing] "
+            + ", ".join(f"{stage}={model}" for stage, model in stage_models.items())
+        )
 
-    # Pass topic to task generator
-    tasks = GenerateTutorialTask().create(researcher, writer, reviewer, topic)
+        def on_progress(event):
+            trace.on_progress_event(event)
+            if event["type"] == "task_completed":
+                stage = event["stage"]
+                router.observe(stage, event["seconds"], stage_models[stage])
+            emit(event)
 
-    crew = Crew(agents=[researcher, writer, reviewer], tasks=tasks, verbose=True)
+        # Load the model while the crew is being built, unless already warm
+        warmer = get_model_warmer()
+        if warmer is not None:
+            warmer.warm_up_async()
 
-    print(f"\n🚀 Running your AI Tutorial Team for topic: {topic}...\n")
-    result = crew.kickoff()
+        with span("crew.setup"):
+            # Agents share pooled LLM clients and the cached config from the registry
+            # Each stage gets the model it is routed to (see models/routing.py)
+            writer = WriterAgent().create(llm=router.llm_for("writer"))
+            reviewer = ReviewerAgent().create(llm=router.llm_for("reviewer"))
 
-    print("\n📘 Final Output:\n")
-    print(result)
+            # Section review replaces the reviewer task with per-section calls
+            section_review = (
+                load_yaml_config().get("review", {}).get("mode", "full") == "sections"
+            )
+            gate = get_quality_gate()
+            # In full mode the gate decides whether the reviewer task runs at all
+            review_condition = None
+            if gate is not None and not section_review:
+                review_condition = gate.needs_full_review
 
-    save_output_to_file(result)
-    print(f"\n✅ Output saved to {OUTPUT_FILE}")
+            research = load_yaml_config().get("research", {})
+            if research.get("mode", "single") == "parallel":
+                angles = research.get("angles") or RESEARCH_ANGLES
+                researchers = [
+                    ResearchAgent().create(llm=llm)
+                    for llm in research_llms(len(angles), research)
+                ]
+                tasks = GenerateTutorialTask().create_parallel(
+                    researchers, writer, reviewer, topic, angles, review_condition
+                )
+                # The parallel research tasks and their merge form one stage
+                tasks_per_stage = {"researcher": len(angles) + 1}
+            else:
+                researchers = [ResearchAgent().create(llm=router.llm_for("researcher"))]
+                tasks = GenerateTutorialTask().create(
+                    researchers[0], writer, reviewer, topic, review_condition
+                )
+                tasks_per_stage = None
+
+            crew_agents = researchers + [writer]
+            review_llm = None
+            if section_review:
+                tasks = tasks[:-1]
+            else:
+                crew_agents.append(reviewer)
+            if gate is not None or section_review:
+                # Section calls run concurrently, so their tokens are not streamed
+                review_llm = router.llm_for("reviewer", stream=False)
+
+            # Clients are built, so this run now counts against any fallback
+            for stage in STAGES:
+                router.start_run(stage)
+
+        tracker = ProgressTracker(STAGES, on_progress, tasks_per_stage)
+        context_budget = create_context_budget(topic)
+
+        def on_task_output(output):
+            stage = tracker.current_stage
+            tracker.on_task_output(output)
+            # Only a finished stage's final output is passed on as context, and
+            # section review does not send the research to the reviewer
+            if context_budget is not None and tracker.current_stage != stage:
+                if not (section_review and stage == "writer"):
+                    context_budget.on_task_output(stage, output)
+
+        crew = Crew(
+            agents=crew_agents,
+            tasks=tasks,
+            verbose=verbose,
+            task_callback=on_task_output,
+        )
+
+        print(f"\n🚀 Running your AI Tutorial Team for topic: {topic}...\n")
+        with tracker:
+            result = crew.kickoff()
+
+            draft = None
+            if section_review:
+                draft = str(result.raw) if hasattr(result, "raw") else str(result)
+                if gate is not None:
+                    gate.evaluate(draft)
+            elif gate is not None and gate.report and gate.report.decision != FULL:
+                # The reviewer task was skipped; the writer's draft is the result
+                draft = gate.draft
+
+            if gate is not None and gate.report is not None:
+                emit({"type": "quality_gate", **gate.report.to_dict()})
+            if draft is not None:
+                result = review_draft(
+                    draft, topic, gate and gate.report, emit, review_llm
+                )
+            if tracker.current_stage == "reviewer":
+                # Completes the reviewer stage when the crew did not run it
+                tracker.on_task_output(result)
+
+    if verbose:
+        print("\n📘 Final Output:\n")
+        print(result)
+
+    save_output_to_file(result, output_file)
+    print(f"\n✅ Output saved to {output_file}")
+
+    setup = registry_stats_since(setup_snapshot)
+    print(
+        f"[LLM] Setup for this run: {setup['clients_created']} client(s) created, "
+        f"{setup['config_parses']} config parse(s)"
+    )
+
+    breakdown = trace.breakdown()
+    export_trace(trace)
+    emit({"type": "trace", "run_id": trace.run_id, "breakdown": breakdown})
+    if context_budget is not None:
+        emit({"type": "context_budget", "savings": context_budget.savings})
+    for row in breakdown:
+        print(
+            f"[Telemetry] {row['name']:<22} {row['seconds']:8.2f}s  x{row['count']}"
+            f"  tokens {row['prompt_tokens']}/{row['completion_tokens']}"
+            f"  retries {row['retries']}"
+        )
+
+    content = str(result.raw) if hasattr(result, "raw") else str(result)
+    # A stage that fell back ran on another model than a lookup would expect
+    models = router.signature(stage_models)
+    if cache is not None:
+        cache.set(topic, content, model=models)
+    if archive is not None:
+        stats = {
+            "words": len(content.split()),
+            "seconds": round(time.perf_counter() - started, 1),
+        }
+        if gate is not None and gate.report is not None:
+            stats["quality_score"] = gate.report.score
+        archive.add(
+            topic,
+            content,
+            model=models,
+            stats=stats,
+            definition=definition_hash(),
+        )
+
+    return content
 
 
-"""
 if __name__ == "__main__":
-    run()
-"""
+    import argparse
+    from datetime import datetime
+    from utils.input_processor import process_user_input
+
+    parser = argparse.ArgumentParser(
+        description="Generate a tutorial. Use batch.py for many topics."
+    )
+    parser.add_argument("topic", nargs="*", help="Tutorial topic")
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Bypass the tutorial result cache"
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Regenerate even if cached, then update the cache",
+    )
+    parser.add_argument(
+        "--search", metavar="TEXT", help="List archived tutorials matching TEXT"
+    )
+    parser.add_argument(
+        "--archived",
+        type=int,
+        metavar="ID",
+        help="Write archived tutorial ID to the output file instead of generating",
+    )
+    args = parser.parse_args()
+
+    def print_archived(tutorials):
+        for tutorial in tutorials:
+            created = datetime.fromtimestamp(tutorial.created_at)
+            print(
+                f"  #{tutorial.id:<6} {tutorial.topic}  "
+                f"({tutorial.model}, {created:%Y-%m-%d %H:%M})"
+            )
+
+    archive = get_tutorial_index()
+    if args.search or args.archived is not None:
+        if archive is None:
+            parser.error("the tutorial archive is disabled in the config")
+        if args.search:
+            matches = archive.search(args.search, limit=20, topics_only=False)
+            print_archived(matches)
+            if not matches:
+                print(f"No archived tutorials match: {args.search}")
+        if args.archived is not None:
+            tutorial = archive.get(args.archived)
+            if tutorial is None:
+                parser.error(f"no archived tutorial #{args.archived}")
+            save_output_to_file(tutorial.content)
+            print(f"📚 Archived tutorial #{tutorial.id} saved to {OUTPUT_FILE}")
+        raise SystemExit(0)
+
+    if not args.topic:
+        parser.error("a topic is required")
+    topic = process_user_input(" ".join(args.topic))
+
+    if archive is not None and not args.refresh:
+        related = [t for t in archive.search(topic) if not t.exact]
+        if related:
+            print("📚 Related tutorials already archived (use --archived ID):")
+            print_archived(related)
+
+    run(topic, use_cache=not args.no_cache, refresh=args.refresh)
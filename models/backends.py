@@ -0,0 +1,221 @@
+# models/backends.py
+import threading
+import time
+
+from utils.telemetry import span
+
+
+DEFAULT_HEALTH_INTERVAL = 15
+
+
+def is_backend_error(error: Exception) -> bool:
+    """Whether ``error`` is the server's fault rather than the request's.
+
+    Connection errors, timeouts and 5xx responses are; a 4xx response such
+    as a rejected prompt or an overflowing context would fail on any
+    backend, so it is not.
+    """
+    while error is not None:
+        if isinstance(error, (ConnectionError, TimeoutError)):
+            return True
+        # requests, httpx and litellm name their errors this way
+        names = [cls.__name__ for cls in type(error).__mro__]
+        if any("Connect" in name or "Timeout" in name for name in names):
+            return True
+        status = getattr(error, "status_code", None)
+        if status is None:
+            status = getattr(getattr(error, "response", None), "status_code", None)
+        if isinstance(status, int):
+            return status >= 500
+        error = error.__cause__
+    return False
+
+
+class Backend:
+    """One Ollama server and its scheduling state."""
+
+    __slots__ = ("url", "healthy", "outstanding", "calls", "failures", "checked_at")
+
+    def __init__(self, url: str):
+        self.url = url.rstrip("/")
+        # Assumed healthy until a check or a call says otherwise
+        self.healthy = True
+        self.outstanding = 0
+        self.calls = 0
+        self.failures = 0
+        self.checked_at = None
+
+    def to_dict(self) -> dict:
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "outstanding": self.outstanding,
+            "calls": self.calls,
+            "failures": self.failures,
+        }
+
+
+class BackendPool:
+    """Spreads LLM calls over several Ollama servers.
+
+    Each call goes to the healthy backend with the fewest requests in
+    flight, so agents, parallel researchers and concurrent crews share the
+    servers evenly and a slow server naturally gets less work. A call that
+    fails because of its backend (see ``is_backend_error``) marks the
+    backend down and is retried on another one; a background thread polls
+    ``/api/tags`` and brings backends back once they answer again.
+    """
+
+    def __init__(
+        self,
+        urls: list,
+        health_interval: float = DEFAULT_HEALTH_INTERVAL,
+        timeout: float = 2.0,
+    ):
+        if not urls:
+            raise ValueError("BackendPool needs at least one backend URL")
+        self.backends = [Backend(url) for url in dict.fromkeys(urls)]
+        self.health_interval = health_interval
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._health_thread = None
+        self._session = None
+        self._stats = {"calls": 0, "retries": 0, "failed_calls": 0}
+
+    @property
+    def urls(self) -> list:
+        return [backend.url for backend in self.backends]
+
+    def acquire(self, exclude=()) -> Backend:
+        """Reserve the least busy healthy backend not in ``exclude``."""
+        self.start_health_checks()
+        with self._lock:
+            candidates = [b for b in self.backends if b.url not in exclude]
+            # With every backend marked down, trying one beats failing outright
+            healthy = [b for b in candidates if b.healthy] or candidates
+            if not healthy:
+                return None
+            backend = min(healthy, key=lambda b: (b.outstanding, b.calls))
+            backend.outstanding += 1
+            backend.calls += 1
+            return backend
+
+    def release(self, backend: Backend, failed: bool = False):
+        with self._lock:
+            backend.outstanding -= 1
+            if failed:
+                backend.failures += 1
+                backend.healthy = False
+
+    def call(self, fn, can_retry=None):
+        """Run ``fn(url)`` on a backend, retrying on the others if it fails.
+
+        Only backend errors are retried; any other error is raised at once
+        without marking the backend down. ``can_retry()``, if given, is asked
+        before each retry and can refuse it, for example once tokens have
+        been streamed.
+        """
+        tried, error = [], None
+        with self._lock:
+            self._stats["calls"] += 1
+        while True:
+            backend = self.acquire(exclude=tried)
+            if backend is None:
+                with self._lock:
+                    self._stats["failed_calls"] += 1
+                raise error
+            if tried:
+                with self._lock:
+                    self._stats["retries"] += 1
+            tried.append(backend.url)
+            try:
+                with span("llm.backend", url=backend.url, attempt=len(tried)):
+                    result = fn(backend.url)
+            except Exception as e:
+                backend_error = is_backend_error(e)
+                self.release(backend, failed=backend_error)
+                if not backend_error or (can_retry is not None and not can_retry()):
+                    with self._lock:
+                        self._stats["failed_calls"] += 1
+                    raise
+                error = e
+                if len(tried) < len(self.backends):
+                    print(f"[Backends] {backend.url} failed ({e}); retrying elsewhere")
+                continue
+            self.release(backend)
+            return result
+
+    def check_health(self):
+        """Poll every backend once and update its health."""
+        if self._session is None:
+            import requests
+
+            self._session = requests.Session()
+        for backend in self.backends:
+            try:
+                response = self._session.get(
+                    f"{backend.url}/api/tags", timeout=self.timeout
+                )
+                healthy = response.ok
+            except Exception:
+                healthy = False
+            with self._lock:
+                if healthy != backend.healthy:
+                    state = "back up" if healthy else "down"
+                    print(f"[Backends] {backend.url} is {state}")
+                backend.healthy = healthy
+                backend.checked_at = time.time()
+
+    def start_health_checks(self):
+        if self._health_thread is not None or not self.health_interval:
+            return
+        with self._lock:
+            if self._health_thread is not None:
+                return
+            self._health_thread = threading.Thread(
+                target=self._health_loop, name="backend-health", daemon=True
+            )
+            self._health_thread.start()
+
+    def stop_health_checks(self):
+        self._stop.set()
+
+    def _health_loop(self):
+        while True:
+            try:
+                self.check_health()
+            except Exception as e:
+                print(f"[Backends] Health check failed: {e}")
+            if self._stop.wait(self.health_interval):
+                return
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(
+                self._stats, backends=[backend.to_dict() for backend in self.backends]
+            )
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_backend_pool():
+    """Return the shared pool for ``llm.backends``, or None if none are listed."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            from models.local_llm import load_yaml_config
+
+            llm_config = load_yaml_config().get("llm", {})
+            urls = llm_config.get("backends") or []
+            if not urls:
+                return None
+            _pool = BackendPool(
+                urls,
+                health_interval=llm_config.get(
+                    "health_check_seconds", DEFAULT_HEALTH_INTERVAL
+                ),
+            )
+        return _pool
@@ -0,0 +1,68 @@
+# models/completion_cache.py
+import hashlib
+import json
+import os
+import threading
+from utils.disk_cache import DiskCache
+
+
+DEFAULT_CACHE_PATH = "cache/completions.sqlite"
+
+# Setting this environment variable forces replay caching on for any temperature
+REPLAY_ENV_VAR = "TUTORIAL_LLM_REPLAY"
+
+
+class CompletionCache:
+    """Content-addressed store of LLM completions.
+
+    Each completion is stored under the SHA-256 of its request: model, full
+    message list and sampling parameters. Identical prompts map to the same
+    entry no matter which agent or run produced them. The store is capped
+    in bytes and evicts the least recently used completions first.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int = 256 * 2**20):
+        self._store = DiskCache(path, namespace="completions", max_bytes=max_bytes)
+
+    @staticmethod
+    def request_key(model: str, messages, params: dict) -> str:
+        request = {"model": model, "messages": messages, "params": params}
+        payload = json.dumps(request, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        return self._store.get(key)
+
+    def set(self, key: str, completion: str):
+        self._store.set(key, completion)
+
+    def stats(self) -> dict:
+        return self._store.stats()
+
+    def clear(self):
+        self._store.clear()
+
+
+def replay_enabled(llm_config: dict, temperature) -> bool:
+    """Caching is safe for deterministic sampling or when replay is forced."""
+    if os.environ.get(REPLAY_ENV_VAR, "").lower() in ("1", "true", "yes"):
+        return True
+    if llm_config.get("replay", False):
+        return True
+    return temperature is not None and float(temperature) == 0.0
+
+
+_completion_cache = None
+_completion_cache_lock = threading.Lock()
+
+
+def get_completion_cache(llm_config: dict) -> CompletionCache:
+    global _completion_cache
+    with _completion_cache_lock:
+        if _completion_cache is None:
+            cache_config = llm_config.get("completion_cache", {})
+            _completion_cache = CompletionCache(
+                path=cache_config.get("path", DEFAULT_CACHE_PATH),
+                max_bytes=cache_config.get("max_megabytes", 256) * 2**20,
+            )
+        return _completion_cache
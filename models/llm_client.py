@@ -0,0 +1,78 @@
+# models/llm_client.py
+from crewai import LLM
+from utils.progress import stray_chunk_count, stream_chunk_count, streaming_call
+from utils.telemetry import span
+from utils.tokens import estimate_tokens
+
+
+# Sampling settings that make two otherwise identical requests differ
+SAMPLING_PARAMS = ("temperature", "top_p", "max_tokens", "stop", "seed")
+
+
+class LocalLLM(LLM):
+    """Ollama LLM client that records a telemetry span for every call.
+
+    With a ``completion_cache`` it also replays completions for requests it
+    has already seen. Calls that hand the model tools or callable functions
+    are never cached, since their results can depend on side effects.
+
+    With a ``backend_pool`` the client only dispatches: each call is made by
+    ``backend_client(url)``, a client for the backend the pool picked. A
+    call that already streamed tokens is not retried on another backend.
+    """
+
+    def __init__(
+        self,
+        *args,
+        completion_cache=None,
+        backend_pool=None,
+        backend_client=None,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.completion_cache = completion_cache
+        self.backend_pool = backend_pool
+        self.backend_client = backend_client
+
+    def call(self, messages, tools=None, *args, **kwargs):
+        if self.backend_pool is not None:
+            chunks, stray = stream_chunk_count(), stray_chunk_count()
+            with streaming_call():
+                return self.backend_pool.call(
+                    lambda url: self.backend_client(url).call(
+                        messages, tools, *args, **kwargs
+                    ),
+                    # A retry would stream the same tokens to the progress
+                    # output again; chunks counted on no calling thread may
+                    # be this call's, so they refuse the retry too
+                    can_retry=lambda: stream_chunk_count() == chunks
+                    and stray_chunk_count() == stray,
+                )
+
+        cacheable = self.completion_cache is not None and not (
+            tools or kwargs.get("available_functions")
+        )
+
+        with span(
+            "llm.call",
+            model=self.model,
+            base_url=self.base_url,
+            prompt_tokens=estimate_tokens(messages),
+        ) as record:
+            key = None
+            if cacheable:
+                params = {name: getattr(self, name, None) for name in SAMPLING_PARAMS}
+                key = self.completion_cache.request_key(self.model, messages, params)
+                cached = self.completion_cache.get(key)
+                if cached is not None:
+                    record.attrs.update(
+                        cached=True, completion_tokens=estimate_tokens(cached)
+                    )
+                    return cached
+
+            response = super().call(messages, tools, *args, **kwargs)
+            if isinstance(response, str):
+                record.attrs["completion_tokens"] = estimate_tokens(response)
+                if key is not None and response:
+                    self.completion_cache.set(key, response)
+            return response
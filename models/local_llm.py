@@ -1,19 +1,146 @@
 # models/local_llm.py
+import os
+import threading
 import yaml
-from pathlib import Path
-from crewai import LLM
+from models.backends import get_backend_pool
+from models.completion_cache import get_completion_cache, replay_enabled
 
 
-def load_yaml_config(path="configs/crew_config.yaml"):
-    with open(path, "r") as file:
-        return yaml.safe_load(file)
+# CREW_CONFIG_PATH lets benchmarks and deployments point at another config
+DEFAULT_CONFIG_PATH = os.environ.get("CREW_CONFIG_PATH", "configs/crew_config.yaml")
 
 
-def get_local_llm():
-    config = load_yaml_config()
-    llm_config = config.get("llm", {})
-    model_name = llm_config.get("model", "mistral:latest")
-    base_url = llm_config.get("base_url", "http://localhost:11434")
+class LLMRegistry:
+    """Process-wide cache of the parsed crew config and pooled LLM clients.
 
-    print(f"[LLM] Loading local model: {model_name} from {base_url}")
-    return LLM(model=f"ollama/{model_name}", base_url=base_url)
+    The YAML file is parsed once and only re-read when its mtime changes.
+    LLM clients are keyed by (model, base_url, params) and shared by every
+    agent and helper that asks for the same settings.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._configs = {}
+        self._clients = {}
+        self._stats = {
+            "config_parses": 0,
+            "config_hits": 0,
+            "clients_created": 0,
+            "client_hits": 0,
+        }
+
+    def load_config(self, path: str = DEFAULT_CONFIG_PATH) -> dict:
+        """Return the parsed config, re-reading the file only if it changed.
+
+        The returned dict is shared between callers and must be treated as
+        read-only.
+        """
+        path = os.path.abspath(path)
+        mtime = os.stat(path).st_mtime_ns
+
+        with self._lock:
+            cached = self._configs.get(path)
+            if cached and cached[0] == mtime:
+                self._stats["config_hits"] += 1
+                return cached[1]
+
+            with open(path, "r") as file:
+                config = yaml.safe_load(file) or {}
+
+            self._configs[path] = (mtime, config)
+            self._stats["config_parses"] += 1
+            return config
+
+    def get_llm(self, model: str = None, base_url: str = None, **params):
+        """Return a pooled LLM client for the given settings.
+
+        Missing ``model``/``base_url`` values fall back to the ``llm`` section
+        of the crew config, which can also set ``stream``, ``temperature`` and
+        ``keep_alive`` (how long Ollama keeps the model loaded after a call).
+        Deterministic (temperature 0) or replay-mode clients cache their
+        completions on disk. Without an explicit ``base_url``, calls are
+        spread over ``llm.backends`` when that list is set.
+        """
+        llm_config = self.load_config().get("llm", {})
+        model = model or llm_config.get("model", "mistral:latest")
+        backend_pool = None if base_url else get_backend_pool()
+        if backend_pool is not None:
+            base_url = backend_pool.urls[0]
+        base_url = base_url or llm_config.get("base_url", "http://localhost:11434")
+        for name in ("stream", "temperature", "keep_alive"):
+            if name in llm_config and name not in params:
+                params[name] = llm_config[name]
+        key = (model, base_url, backend_pool is not None, tuple(sorted(params.items())))
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._stats["client_hits"] += 1
+                return client
+
+            # CrewAI is only imported once a client is actually needed
+            from models.llm_client import LocalLLM
+
+            if backend_pool is not None:
+                # Calls are dispatched to a pooled client per backend
+                print(f"[LLM] Spreading {model} over {len(backend_pool.urls)} backends")
+                extra = {
+                    "backend_pool": backend_pool,
+                    "backend_client": lambda url: self.get_llm(model, url, **params),
+                }
+            else:
+                print(f"[LLM] Loading local model: {model} from {base_url}")
+                extra = {}
+                if replay_enabled(llm_config, params.get("temperature")):
+                    extra["completion_cache"] = get_completion_cache(llm_config)
+            client = LocalLLM(
+                model=f"ollama/{model}", base_url=base_url, **extra, **params
+            )
+            self._clients[key] = client
+            self._stats["clients_created"] += 1
+            return client
+
+    def stats(self) -> dict:
+        """Return a snapshot of the registry counters."""
+        with self._lock:
+            return dict(self._stats, pooled_clients=len(self._clients))
+
+    def clear(self):
+        """Drop cached configs and pooled clients (counters are kept)."""
+        with self._lock:
+            self._configs.clear()
+            self._clients.clear()
+
+
+_registry = LLMRegistry()
+
+
+def __getattr__(name):
+    # Keep ``from models.local_llm import LocalLLM`` working without paying
+    # for the CrewAI import when only the config is needed
+    if name == "LocalLLM":
+        from models.llm_client import LocalLLM
+
+        return LocalLLM
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_registry() -> LLMRegistry:
+    return _registry
+
+
+def load_yaml_config(path=DEFAULT_CONFIG_PATH):
+    return _registry.load_config(path)
+
+
+def get_local_llm(model=None, base_url=None, **params):
+    return _registry.get_llm(model=model, base_url=base_url, **params)
+
+
+def registry_stats_since(snapshot: dict) -> dict:
+    """Return how many config parses and clients were created since ``snapshot``."""
+    current = _registry.stats()
+    return {
+        key: current[key] - snapshot.get(key, 0)
+        for key in ("config_parses", "config_hits", "clients_created", "client_hits")
+    }
@@ -0,0 +1,130 @@
+# models/routing.py
+import threading
+
+from models.local_llm import get_local_llm, load_yaml_config
+
+
+# Stages that can be routed to their own model in ``llm.stages``
+STAGES = ("input_processor", "researcher", "writer", "reviewer")
+
+# Per-stage settings that are passed through to the LLM client
+STAGE_PARAMS = ("temperature", "top_p", "max_tokens", "stream", "keep_alive")
+
+
+class StageRouter:
+    """Chooses the model for each pipeline stage.
+
+    ``llm.stages.<stage>`` can override ``model``, ``base_url`` and sampling
+    settings; stages without overrides use ``llm.model``. When
+    ``llm.fallback.latency_budgets`` gives a stage a budget in seconds and a
+    run of that stage takes longer, the next ``llm.fallback.runs`` runs use
+    ``llm.fallback.model`` before the stage's own model is tried again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._fallback_remaining = {}
+        self._stats = {"fallback_runs": 0, "budget_overruns": 0}
+
+    def _config(self) -> dict:
+        return load_yaml_config().get("llm", {})
+
+    def stage_config(self, stage: str) -> dict:
+        return (self._config().get("stages") or {}).get(stage) or {}
+
+    def model_for(self, stage: str) -> str:
+        llm_config = self._config()
+        fallback_model = (llm_config.get("fallback") or {}).get("model")
+        with self._lock:
+            if fallback_model and self._fallback_remaining.get(stage, 0) > 0:
+                return fallback_model
+        return self.stage_config(stage).get("model") or llm_config.get(
+            "model", "mistral:latest"
+        )
+
+    def llm_for(self, stage: str, base_url: str = None, **params):
+        """Pooled LLM client for ``stage``; explicit arguments win over config."""
+        stage_config = self.stage_config(stage)
+        for name in STAGE_PARAMS:
+            if name in stage_config and name not in params:
+                params[name] = stage_config[name]
+        return get_local_llm(
+            model=self.model_for(stage),
+            base_url=base_url or stage_config.get("base_url"),
+            **params,
+        )
+
+    def start_run(self, stage: str):
+        """Count one run of ``stage`` against any fallback period in effect."""
+        with self._lock:
+            remaining = self._fallback_remaining.get(stage, 0)
+            if remaining > 0:
+                self._fallback_remaining[stage] = remaining - 1
+                self._stats["fallback_runs"] += 1
+
+    def observe(self, stage: str, seconds: float, model: str):
+        """Record how long a stage took; overruns switch it to the fallback."""
+        fallback = self._config().get("fallback") or {}
+        budget = (fallback.get("latency_budgets") or {}).get(stage)
+        if not budget or not fallback.get("model") or model == fallback["model"]:
+            return
+        if seconds > budget:
+            with self._lock:
+                self._fallback_remaining[stage] = fallback.get("runs", 3)
+                self._stats["budget_overruns"] += 1
+            print(
+                f"[Routing] {stage} took {seconds:.1f}s on {model} "
+                f"(budget {budget}s); using {fallback['model']} for the next "
+                f"{fallback.get('runs', 3)} run(s)"
+            )
+
+    def signature(self, stage_models: dict = None) -> str:
+        """The models a run uses, for cache keys.
+
+        Just ``llm.model`` unless stages are routed to other models, so keys
+        from before routing stay valid. ``stage_models`` maps stages to the
+        models a run actually used, so a run that fell back is not stored as
+        the work of the configured models.
+        """
+        llm_config = self._config()
+        default = llm_config.get("model", "mistral:latest")
+        models = {
+            stage: config["model"]
+            for stage, config in (llm_config.get("stages") or {}).items()
+            if config and config.get("model")
+        }
+        models.update(stage_models or {})
+        overrides = [
+            f"{stage}={model}"
+            for stage, model in sorted(models.items())
+            if model != default
+        ]
+        return "|".join([default] + overrides)
+
+    def models(self) -> list:
+        """Every model the configured stages and fallback may use."""
+        llm_config = self._config()
+        models = [llm_config.get("model", "mistral:latest")]
+        for config in (llm_config.get("stages") or {}).values():
+            if config and config.get("model"):
+                models.append(config["model"])
+        fallback_model = (llm_config.get("fallback") or {}).get("model")
+        if fallback_model:
+            models.append(fallback_model)
+        return list(dict.fromkeys(models))
+
+    def stats(self) -> dict:
+        with self._lock:
+            falling_back = [s for s, n in self._fallback_remaining.items() if n > 0]
+            return dict(self._stats, falling_back=sorted(falling_back))
+
+
+_router = StageRouter()
+
+
+def get_router() -> StageRouter:
+    return _router
+
+
+def get_stage_llm(stage: str, **params):
+    return _router.llm_for(stage, **params)
@@ -0,0 +1,233 @@
+# models/warmup.py
+import threading
+import time
+
+from utils.telemetry import span
+
+
+# Ollama unloads idle models after 5 minutes unless told otherwise
+DEFAULT_KEEP_ALIVE = "30m"
+DEFAULT_PING_INTERVAL = 240
+
+
+class ModelWarmer:
+    """Preloads Ollama models and keeps them resident while the app runs.
+
+    A generate request with an empty prompt makes Ollama load the model
+    without producing any tokens, and its ``keep_alive`` resets how long the
+    model stays in memory. All requests share one pooled HTTP session.
+    ``base_url`` may also be a list of backends, each of which gets every
+    model. ``targets`` lists ``(model, url)`` pairs to warm instead, for
+    models that are routed to their own servers. ``keep_warm`` limits the
+    keep-warm pings to those models; the others are only loaded once.
+    """
+
+    def __init__(
+        self,
+        base_url,
+        models: list,
+        keep_alive=DEFAULT_KEEP_ALIVE,
+        ping_interval: float = DEFAULT_PING_INTERVAL,
+        timeout: float = 300,
+        targets: list = None,
+        keep_warm: list = None,
+    ):
+        urls = [base_url] if isinstance(base_url, str) else base_url or []
+        self.base_urls = [url.rstrip("/") for url in urls]
+        if targets is None:
+            targets = [(model, url) for model in models for url in self.base_urls]
+        self.targets = list(
+            dict.fromkeys((model, url.rstrip("/")) for model, url in targets)
+        )
+        self.models = list(dict.fromkeys(model for model, _ in self.targets))
+        self.keep_warm = set(self.models if keep_warm is None else keep_warm)
+        self.keep_alive = keep_alive
+        self.ping_interval = ping_interval
+        self.timeout = timeout
+        self._session = None
+        self._lock = threading.Lock()
+        self._last_warm = {}
+        self._warming = None
+        self._stop = threading.Event()
+        self._keep_warm_thread = None
+        self._stats = {"warmups": 0, "pings": 0, "failures": 0, "load_seconds": 0.0}
+
+    @property
+    def session(self):
+        # requests is imported on first use so importing this module stays cheap
+        if self._session is None:
+            import requests
+
+            self._session = requests.Session()
+        return self._session
+
+    def warm_model(self, model: str, base_url: str = None) -> float:
+        """Load ``model`` and return the wall time the request took."""
+        base_url = base_url or self.targets[0][1]
+        with span("llm.warmup", model=model, url=base_url) as record:
+            started = time.perf_counter()
+            response = self.session.post(
+                f"{base_url}/api/generate",
+                json={
+                    "model": model,
+                    "prompt": "",
+                    "stream": False,
+                    "keep_alive": self.keep_alive,
+                },
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            seconds = time.perf_counter() - started
+
+            # load_duration is 0 when the model was already resident
+            load_seconds = response.json().get("load_duration", 0) / 1e9
+            record.attrs["load_seconds"] = round(load_seconds, 3)
+
+        with self._lock:
+            self._last_warm[(model, base_url)] = time.time()
+            self._stats["load_seconds"] += load_seconds
+        return seconds
+
+    def warm_up(self) -> dict:
+        """Load every model on its servers; returns seconds per model."""
+        timings = {}
+        for model, url in self.targets:
+            try:
+                seconds = round(self.warm_model(model, url), 3)
+                timings[model] = max(timings.get(model, 0), seconds)
+                print(f"[Warmup] {model} ready on {url} in {seconds:.2f}s")
+            except Exception as e:
+                with self._lock:
+                    self._stats["failures"] += 1
+                print(f"[Warmup] Could not preload {model} on {url}: {e}")
+        with self._lock:
+            self._stats["warmups"] += 1
+        return timings
+
+    def warm_up_async(self) -> threading.Thread:
+        """Start ``warm_up`` in the background unless it is running or fresh."""
+        with self._lock:
+            if self._warming is not None and self._warming.is_alive():
+                return self._warming
+            if self.targets and all(self._is_fresh(t) for t in self.targets):
+                return None
+            self._warming = threading.Thread(
+                target=self.warm_up, name="model-warmup", daemon=True
+            )
+            self._warming.start()
+            return self._warming
+
+    def _is_fresh(self, target: tuple) -> bool:
+        last = self._last_warm.get(target)
+        return last is not None and time.time() - last < self.ping_interval
+
+    def start_keep_warm(self):
+        """Ping the ``keep_warm`` models every ``ping_interval`` seconds."""
+        with self._lock:
+            if self._keep_warm_thread is not None and self._keep_warm_thread.is_alive():
+                return
+            self._stop.clear()
+            self._keep_warm_thread = threading.Thread(
+                target=self._keep_warm_loop, name="model-keep-warm", daemon=True
+            )
+            self._keep_warm_thread.start()
+
+    def stop_keep_warm(self):
+        self._stop.set()
+
+    def _keep_warm_loop(self):
+        while not self._stop.wait(self.ping_interval):
+            for model, url in self.targets:
+                if model not in self.keep_warm:
+                    continue
+                try:
+                    self.warm_model(model, url)
+                    with self._lock:
+                        self._stats["pings"] += 1
+                except Exception as e:
+                    with self._lock:
+                        self._stats["failures"] += 1
+                    print(f"[Warmup] Keep-warm ping to {url} failed: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            warm_models = {model for model, _ in self._last_warm}
+            return dict(self._stats, warm_models=sorted(warm_models))
+
+
+_warmer = None
+_warmer_lock = threading.Lock()
+
+
+def warmup_targets(config: dict):
+    """``(model, url)`` pairs for every routed stage, and the fallback model.
+
+    Each stage's model is warmed on the servers its calls go to: the stage's
+    own ``base_url``, ``research.base_urls`` for parallel researchers, or
+    else ``llm.backends``/``llm.base_url``. The fallback model is warmed on
+    the servers of the stages that have a latency budget.
+    """
+    from models.routing import STAGES
+
+    llm_config = config.get("llm", {})
+    research = config.get("research", {})
+    default_model = llm_config.get("model", "mistral:latest")
+    default_urls = llm_config.get("backends") or [
+        llm_config.get("base_url", "http://localhost:11434")
+    ]
+    stages = llm_config.get("stages") or {}
+
+    targets, stage_urls = [], {}
+    for stage in STAGES:
+        stage_config = stages.get(stage) or {}
+        urls = [stage_config["base_url"]] if stage_config.get("base_url") else []
+        if stage == "researcher" and research.get("mode", "single") == "parallel":
+            urls = research.get("base_urls") or urls
+        stage_urls[stage] = urls or default_urls
+        model = stage_config.get("model") or default_model
+        targets += [(model, url) for url in stage_urls[stage]]
+
+    extras = (llm_config.get("warmup") or {}).get("models") or []
+    targets += [(model, url) for model in extras for url in default_urls]
+
+    fallback = llm_config.get("fallback") or {}
+    fallback_targets = []
+    if fallback.get("model"):
+        budgeted = fallback.get("latency_budgets") or {}
+        fallback_targets = [
+            (fallback["model"], url)
+            for stage in budgeted
+            for url in stage_urls.get(stage, default_urls)
+        ]
+    return targets, fallback_targets
+
+
+def get_model_warmer():
+    """Return the shared warmer configured from ``llm.warmup``.
+
+    Returns None when warm-up is disabled. The fallback model is preloaded
+    but not kept warm, so it leaves memory again when it is not in use.
+    """
+    global _warmer
+    with _warmer_lock:
+        if _warmer is None:
+            from models.local_llm import load_yaml_config
+
+            config = load_yaml_config()
+            llm_config = config.get("llm", {})
+            warmup_config = llm_config.get("warmup", {})
+            if not warmup_config.get("enabled", True):
+                return None
+
+            targets, fallback_targets = warmup_targets(config)
+            _warmer = ModelWarmer(
+                base_url=None,
+                models=[],
+                targets=targets + fallback_targets,
+                keep_warm=[model for model, _ in targets],
+                keep_alive=llm_config.get("keep_alive", DEFAULT_KEEP_ALIVE),
+                ping_interval=warmup_config.get(
+                    "ping_interval_seconds", DEFAULT_PING_INTERVAL
+                ),
+            )
+        return _warmer
@@ -1,9 +1,18 @@
 # tasks/generate_tutorial.py
 from crewai import Task
+from crewai.tasks.conditional_task import ConditionalTask
+
+
+# Research angles for parallel mode, one researcher task each
+RESEARCH_ANGLES = [
+    "the definition and core concepts",
+    "syntax and common operations, with short code examples",
+    "best practices and common beginner mistakes",
+]
 
 
 class GenerateTutorialTask:
-    def create(self, researcher, writer, reviewer, topic: str):
+    def create(self, researcher, writer, reviewer, topic: str, review_condition=None):
         return [
             Task(
                 description=f"Research the topic: {topic}.",
@@ -15,9 +24,61 @@ class GenerateTutorialTask:
                 expected_output=f"Full tutorial on {topic} in markdown format",
                 agent=writer,
             ),
+            self._review_task(reviewer, topic, review_condition),
+        ]
+
+    def create_parallel(
+        self,
+        researchers,
+        writer,
+        reviewer,
+        topic: str,
+        angles=RESEARCH_ANGLES,
+        review_condition=None,
+    ):
+        """Research each angle concurrently, then merge before writing.
+
+        One async task per angle runs on its own researcher agent; the merge
+        task waits for all of them and gives the writer a single set of
+        findings, like the research task in ``create``.
+        """
+        research = [
             Task(
-                description=f"Review the {topic} tutorial for clarity and quality.",
-                expected_output="Edited and improved final version",
-                agent=reviewer,
-            ),
+                description=f"Research {angle} of the topic: {topic}.",
+                expected_output=f"Key points and examples about {angle}",
+                agent=agent,
+                async_execution=True,
+            )
+            for agent, angle in zip(researchers, angles)
         ]
+        merged = Task(
+            description=(
+                f"Merge the research findings on {topic} into one structured "
+                "summary, removing duplicates."
+            ),
+            expected_output=f"Key points and examples about {topic.lower()}",
+            agent=researchers[0],
+            context=research,
+        )
+        write = Task(
+            description=f"Write a beginner-friendly tutorial on {topic} using research output.",
+            expected_output=f"Full tutorial on {topic} in markdown format",
+            agent=writer,
+            context=[merged],
+        )
+        review = self._review_task(reviewer, topic, review_condition, [merged, write])
+        return research + [merged, write, review]
+
+    def _review_task(self, reviewer, topic: str, condition=None, context=None):
+        """The review task; with ``condition`` it only runs when that returns
+        True for the writer's output (see ``utils.quality_gate``)."""
+        kwargs = {
+            "description": f"Review the {topic} tutorial for clarity and quality.",
+            "expected_output": "Edited and improved final version",
+            "agent": reviewer,
+        }
+        if context is not None:
+            kwargs["context"] = context
+        if condition is None:
+            return Task(**kwargs)
+        return ConditionalTask(condition=condition, **kwargs)
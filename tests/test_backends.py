@@ -0,0 +1,152 @@
+# tests/test_backends.py
+import http.client
+import json
+import threading
+from urllib.parse import urlsplit
+
+import pytest
+
+from benchmarks.fake_ollama import FakeOllamaServer
+from models.backends import BackendPool, is_backend_error
+from utils.progress import (
+    _count_stream_chunk,
+    stray_chunk_count,
+    stream_chunk_count,
+    streaming_call,
+)
+
+
+class ClientError(Exception):
+    """Stands in for an LLM library's error, raised from the one underneath."""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def generate(url, path="/api/generate", stream=False, fail_after=None):
+    """POST a prompt to ``url``; with ``stream``, count each chunk received.
+
+    ``fail_after`` chunks into the stream, the connection is treated as
+    reset by the server.
+    """
+    parts = urlsplit(url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=5)
+    try:
+        body = json.dumps({"model": "fake", "prompt": "hi", "stream": stream})
+        connection.request("POST", path, body=body)
+        response = connection.getresponse()
+        if response.status >= 400:
+            raise ClientError(f"{url} answered {response.status}", response.status)
+        if not stream:
+            return json.loads(response.read())["response"]
+        text, received = "", 0
+        for line in response:
+            text += json.loads(line)["response"]
+            received += 1
+            _count_stream_chunk()
+            if received == fail_after:
+                raise ConnectionResetError("connection reset mid-stream")
+        return text
+    except OSError as e:
+        raise ClientError(f"request to {url} failed") from e
+    finally:
+        connection.close()
+
+
+@pytest.fixture
+def servers():
+    first, second = FakeOllamaServer().start(), FakeOllamaServer().start()
+    yield first, second
+    second.stop()
+    first.stop()
+
+
+def test_call_fails_over_to_the_running_server(servers):
+    first, second = servers
+    first.stop()
+    pool = BackendPool([first.base_url, second.base_url], health_interval=0)
+
+    assert pool.call(generate).startswith("Thought:")
+    stats = pool.stats()
+    assert stats["retries"] == 1 and stats["failed_calls"] == 0
+    assert [b["healthy"] for b in stats["backends"]] == [False, True]
+    assert second.engine.stats()["requests"] == 1
+
+    # The stopped server is skipped until a health check brings it back
+    pool.call(generate)
+    assert pool.stats()["retries"] == 1
+
+
+def test_backend_error_is_found_through_cause(servers):
+    first, _ = servers
+    first.stop()
+    with pytest.raises(ClientError) as raised:
+        generate(first.base_url)
+    assert not isinstance(raised.value, OSError)
+    assert isinstance(raised.value.__cause__, ConnectionError)
+    assert is_backend_error(raised.value)
+
+
+def test_request_error_is_not_retried(servers):
+    first, second = servers
+    pool = BackendPool([first.base_url, second.base_url], health_interval=0)
+
+    with pytest.raises(ClientError) as raised:
+        pool.call(lambda url: generate(url, path="/api/missing"))
+    assert raised.value.status_code == 404
+    assert not is_backend_error(raised.value)
+    stats = pool.stats()
+    assert stats["retries"] == 0 and stats["failed_calls"] == 1
+    assert all(b["healthy"] for b in stats["backends"])
+    assert second.engine.stats()["requests"] == 0
+
+
+def streaming_pool_call(pool, fn):
+    # What LocalLLM does for a pooled call
+    chunks, stray = stream_chunk_count(), stray_chunk_count()
+    with streaming_call():
+        return pool.call(
+            fn,
+            can_retry=lambda: stream_chunk_count() == chunks
+            and stray_chunk_count() == stray,
+        )
+
+
+def test_no_retry_once_streaming_has_started(servers):
+    first, second = servers
+    pool = BackendPool([first.base_url, second.base_url], health_interval=0)
+
+    with pytest.raises(ClientError):
+        streaming_pool_call(pool, lambda url: generate(url, stream=True, fail_after=1))
+    stats = pool.stats()
+    assert stats["retries"] == 0 and stats["failed_calls"] == 1
+    assert second.engine.stats()["requests"] == 0
+
+
+def test_stream_retried_before_first_chunk(servers):
+    first, second = servers
+    first.stop()
+    pool = BackendPool([first.base_url, second.base_url], health_interval=0)
+
+    text = streaming_pool_call(pool, lambda url: generate(url, stream=True))
+    assert text.startswith("Thought:")
+    assert pool.stats()["retries"] == 1
+
+
+def test_chunk_on_another_thread_refuses_retry(servers):
+    first, second = servers
+    first.stop()
+    pool = BackendPool([first.base_url, second.base_url], health_interval=0)
+
+    def stream_elsewhere(url):
+        # A bus that runs the chunk handler on its own thread
+        handler = threading.Thread(target=_count_stream_chunk)
+        handler.start()
+        handler.join()
+        return generate(url)
+
+    with pytest.raises(ClientError):
+        streaming_pool_call(pool, stream_elsewhere)
+    assert pool.stats()["retries"] == 0
+    assert second.engine.stats()["requests"] == 0
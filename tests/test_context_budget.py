@@ -0,0 +1,29 @@
+# tests/test_context_budget.py
+from utils.context_budget import compress
+from utils.tokens import estimate_tokens
+
+RESEARCH = (
+    "# Python lists\n"
+    "\n"
+    "Lists are ordered. They can be changed in place.\n"
+    "\n"
+    "```python\n"
+    "items = [1, 2, 3]\n"
+    "```\n"
+    "\n"
+    "- append adds one item\n"
+    "- extend adds many items\n"
+)
+
+
+def test_text_within_budget_is_unchanged():
+    assert compress(RESEARCH, "python lists", 1500) == RESEARCH
+
+
+def test_trimmed_text_keeps_blank_lines_between_blocks():
+    filler = "Unrelated notes about the weather and the history of computing. " * 30
+    text = RESEARCH + "\n" + filler + "\n\nLists are ordered. They can be changed.\n"
+    result = compress(text, "python lists", 60)
+    assert estimate_tokens(result) <= 60
+    assert result.startswith("# Python lists\n\nLists are ordered.")
+    assert "```\n\n- append adds one item\n- extend adds many items" in result
@@ -0,0 +1,19 @@
+# tests/test_job_queue.py
+from utils.job_queue import Job
+
+
+def test_tokens_are_merged_into_the_running_text():
+    job = Job("Python lists", output_file="")
+    job.add_event({"type": "task_started", "stage": "writer", "index": 0, "total": 1})
+    for text in ("# Py", "thon ", "lists"):
+        job.add_event({"type": "token", "stage": "writer", "text": text, "at": 1.0})
+
+    events, cursor = job.events_since(0)
+    assert [event["type"] for event in events] == ["task_started"]
+    assert job.live_text == "# Python lists"
+    assert job.first_token_at == 1.0
+
+    job.add_event({"type": "task_completed", "stage": "writer", "output": "done"})
+    events, _ = job.events_since(cursor)
+    assert [event["type"] for event in events] == ["task_completed"]
+    assert job.live_text == ""
@@ -0,0 +1,48 @@
+# tests/test_quality_gate.py
+from utils.quality_gate import FULL, LIGHT, SKIP, QualityGate
+
+SECTION = (
+    "This part explains the idea with short and simple sentences. "
+    "You can try each step on your own. "
+)
+
+
+def tutorial(sentences_per_section: int) -> str:
+    body = SECTION * sentences_per_section
+    return (
+        "# Python Lists\n\n"
+        f"{body}\n\n"
+        "## Creating a list\n\n"
+        f"{body}\n\n"
+        "```python\nitems = [1, 2, 3]\n```\n\n"
+        "## Changing a list\n\n"
+        f"{body}\n"
+    )
+
+
+def test_good_draft_is_skipped():
+    report = QualityGate(min_words=300).evaluate(tutorial(10))
+    assert report.issues == []
+    assert report.decision == SKIP
+
+
+def test_too_short_draft_is_not_skipped():
+    draft = "# Python Lists\n\nLists hold items in order and you can change them."
+    report = QualityGate(min_words=300).evaluate(draft)
+    assert any(issue.check == "length" for issue in report.issues)
+    assert report.decision != SKIP
+
+
+def test_short_draft_is_a_document_wide_issue():
+    report = QualityGate(min_words=300).evaluate(tutorial(2))
+    assert [issue.check for issue in report.issues] == ["length"]
+    assert report.score >= 70
+    assert report.decision == LIGHT
+    assert report.document_wide
+
+
+def test_broken_code_is_reviewed():
+    draft = tutorial(10).replace("items = [1, 2, 3]", "items = [1, 2, 3")
+    report = QualityGate(min_words=300).evaluate(draft)
+    assert report.decision in (LIGHT, FULL)
+    assert report.flagged_lines
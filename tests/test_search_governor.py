@@ -0,0 +1,63 @@
+# tests/test_search_governor.py
+import asyncio
+
+import pytest
+
+from tools.search_governor import (
+    CLOSED,
+    OPEN,
+    CircuitOpenError,
+    SearchGovernor,
+)
+
+
+def failing():
+    raise OSError("provider down")
+
+
+def open_governor(**params) -> SearchGovernor:
+    governor = SearchGovernor(
+        rate=1000, burst=1000, failure_threshold=1, reset_seconds=0, **params
+    )
+    with pytest.raises(OSError):
+        governor.call(failing)
+    assert governor.breaker.state == OPEN
+    return governor
+
+
+def test_successful_probe_closes_circuit():
+    governor = open_governor()
+    assert governor.call(lambda: "ok") == "ok"
+    assert governor.breaker.state == CLOSED
+
+
+def test_cancelled_async_probe_is_given_back():
+    governor = open_governor()
+
+    async def cancelled_probe():
+        task = asyncio.ensure_future(governor.call_async(lambda: asyncio.sleep(10)))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancelled_probe())
+    assert governor.call(lambda: "ok") == "ok"
+
+
+def test_probe_interrupted_by_base_exception_is_given_back():
+    governor = open_governor()
+
+    def interrupted():
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        governor.call(interrupted)
+    assert governor.call(lambda: "ok") == "ok"
+
+
+def test_concurrent_probe_is_refused():
+    governor = open_governor()
+    with governor._admitted():
+        with pytest.raises(CircuitOpenError):
+            governor.call(lambda: "ok")
@@ -0,0 +1,104 @@
+# tests/test_topic_similarity.py
+import pytest
+
+from utils.topic_similarity import (
+    TopicSimilarityIndex,
+    canonical_similarity,
+    canonical_topic,
+    stem,
+)
+
+THRESHOLD = 0.7
+
+
+def similarity(a: str, b: str) -> float:
+    return canonical_similarity(canonical_topic(a), canonical_topic(b))
+
+
+@pytest.mark.parametrize(
+    "a, b",
+    [
+        ("Python is operator", "Python in operator"),
+        ("Python is operator", "Python and operator"),
+        ("Python in operator", "Python and operator"),
+        ("Python is operator", "Python operators"),
+        ("Python in operator", "Python operators"),
+        ("Python and operator", "Python operators"),
+        ("Python with statement", "Python statements"),
+        ("Python with statement", "Python if statements"),
+    ],
+)
+def test_keyword_topics_do_not_match(a, b):
+    assert similarity(a, b) < THRESHOLD
+    assert similarity(b, a) < THRESHOLD
+
+
+@pytest.mark.parametrize(
+    "a, b",
+    [
+        ("Python class", "Python classes"),
+        ("Python lists", "Lists in Python"),
+        ("Python lists", "python list tutorial"),
+        ("Python for loops", "for loop in Python"),
+    ],
+)
+def test_same_topic_matches(a, b):
+    assert similarity(a, b) >= THRESHOLD
+    assert similarity(b, a) >= THRESHOLD
+
+
+def test_stem_handles_es_plurals():
+    assert stem("classes") == "class"
+    assert stem("boxes") == "box"
+    assert stem("matches") == "match"
+    assert stem("lists") == "list"
+    assert stem("dictionaries") == "dictionary"
+
+
+def test_filler_keywords_dropped_unless_before_syntax_word():
+    assert canonical_topic("Lists in Python") == "list python"
+    assert canonical_topic("Python for beginners") == "python"
+    assert canonical_topic("Python is operator") == "is operator python"
+    assert canonical_topic("the with statement") == "statement with"
+
+
+@pytest.mark.parametrize(
+    "registered, query",
+    [
+        ("Python is operator", "Python in operator"),
+        ("Python operators", "Python and operator"),
+        ("Python with statement", "Python if statements"),
+    ],
+)
+def test_index_does_not_join_keyword_topics(registered, query):
+    for first, second in ((registered, query), (query, registered)):
+        index = TopicSimilarityIndex(THRESHOLD)
+        index.add("job", first, "value")
+        assert index.lookup(second) is None
+
+
+@pytest.mark.parametrize(
+    "registered, query",
+    [("Python class", "Python classes"), ("Python classes", "Python class")],
+)
+def test_index_joins_plural_topic(registered, query):
+    index = TopicSimilarityIndex(THRESHOLD)
+    index.add("job", registered, "value")
+    assert index.lookup(query)[2] == "value"
+
+
+@pytest.mark.parametrize(
+    "a, b",
+    [
+        ("Binary search trees in Python", "Binary search in Python"),
+        ("Python unit testing with pytest", "Python unit testing with unittest"),
+        ("Python 2 strings", "Python 3 strings"),
+    ],
+)
+def test_different_content_words_do_not_match(a, b):
+    assert similarity(a, b) == 0.0
+    assert similarity(b, a) == 0.0
+
+
+def test_typo_in_longer_word_still_matches():
+    assert similarity("Python dictionaries", "Python dictionnaries") >= THRESHOLD
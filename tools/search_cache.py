@@ -0,0 +1,124 @@
+# tools/search_cache.py
+import re
+import threading
+from models.local_llm import load_yaml_config
+from utils.disk_cache import DiskCache
+
+
+DEFAULT_CACHE_PATH = "cache/search_cache.sqlite"
+
+
+class SearchCache:
+    """On-disk cache of raw DDGS results with stale-while-revalidate serving.
+
+    Entries younger than ``ttl`` are served as-is. Entries older than that but
+    within ``stale_ttl`` more seconds are still served immediately, while a
+    background thread refreshes them from the network.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        ttl: float = 24 * 3600,
+        stale_ttl: float = 7 * 24 * 3600,
+        max_entries: int = 2000,
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._store = DiskCache(
+            path,
+            namespace="ddgs",
+            ttl=ttl,
+            max_entries=max_entries,
+            max_age=ttl + stale_ttl,
+        )
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0}
+
+    @staticmethod
+    def make_key(query: str, max_results: int) -> str:
+        normalized = re.sub(r"\s+", " ", query.strip().lower())
+        return f"{max_results}:{normalized}"
+
+    def get_or_fetch(self, query: str, max_results: int, fetch) -> list:
+        """Return cached results for the query, calling ``fetch()`` on a miss.
+
+        Empty results are never cached so that a transient failure does not
+        hide a topic until the TTL runs out.
+        """
+        key = self.make_key(query, max_results)
+        entry = self._store.get_entry(key)
+
+        if entry is not None:
+            age = entry.age
+            if age <= self.ttl:
+                self._count("hits")
+                return entry.value
+            if age <= self.ttl + self.stale_ttl:
+                self._count("stale_hits")
+                self._refresh_in_background(key, fetch)
+                return entry.value
+
+        self._count("misses")
+        results = fetch()
+        if results:
+            self._store.set(key, results)
+        return results
+
+    def _refresh_in_background(self, key: str, fetch):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                results = fetch()
+                if results:
+                    self._store.set(key, results)
+                    self._count("refreshes")
+            except Exception as e:
+                print(f"[SearchCache] Background refresh failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"]
+        served = stats["hits"] + stats["stale_hits"]
+        stats["hit_rate"] = served / lookups if lookups else 0.0
+        stats["entries"] = self._store.stats()["entries"]
+        return stats
+
+    def clear(self):
+        self._store.clear()
+
+
+_search_cache = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache():
+    """Return the process-wide search cache, or None if disabled in the config."""
+    global _search_cache
+    with _search_cache_lock:
+        if _search_cache is None:
+            cache_config = load_yaml_config().get("search", {}).get("cache", {})
+            if not cache_config.get("enabled", True):
+                return None
+            _search_cache = SearchCache(
+                path=cache_config.get("path", DEFAULT_CACHE_PATH),
+                ttl=cache_config.get("ttl_seconds", 24 * 3600),
+                stale_ttl=cache_config.get("stale_seconds", 7 * 24 * 3600),
+                max_entries=cache_config.get("max_entries", 2000),
+            )
+        return _search_cache
@@ -0,0 +1,254 @@
+# tools/search_governor.py
+import asyncio
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+
+from models.local_llm import load_yaml_config
+from utils.telemetry import span
+
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class SearchUnavailableError(Exception):
+    """A search was refused locally instead of being sent to the provider."""
+
+
+class CircuitOpenError(SearchUnavailableError):
+    pass
+
+
+class RateLimitedError(SearchUnavailableError):
+    pass
+
+
+class TokenBucket:
+    """Allows ``rate`` requests per second on average and ``burst`` at once.
+
+    ``reserve`` takes a token immediately and returns how long the caller
+    must wait before using it, so waiting happens outside the lock and
+    works the same for threads and async tasks.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait: float):
+        """Seconds to wait for a token, or None if it would exceed ``max_wait``."""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._updated
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+            wait = max(0.0, (1 - self._tokens) / self.rate)
+            if wait > max_wait:
+                return None
+            self._tokens -= 1
+            return wait
+
+
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive failures.
+
+    While open every call is refused. After ``reset_seconds`` a single probe
+    call is let through: success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_seconds: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Raise CircuitOpenError unless a call may go ahead now."""
+        with self._lock:
+            if self.state == OPEN:
+                retry_in = self._opened_at + self.reset_seconds - time.monotonic()
+                if retry_in > 0:
+                    raise CircuitOpenError(
+                        "web search is temporarily unavailable after repeated "
+                        f"failures; retrying in {retry_in:.0f}s"
+                    )
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN:
+                if self._probing:
+                    raise CircuitOpenError(
+                        "web search is temporarily unavailable; a retry is in progress"
+                    )
+                self._probing = True
+
+    def cancel(self):
+        """Give back a probe that was admitted but never sent."""
+        with self._lock:
+            self._probing = False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                print("[SearchGovernor] Search provider recovered; circuit closed")
+            self.state = CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self.state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    print(
+                        f"[SearchGovernor] Circuit open for {self.reset_seconds}s "
+                        f"after {self._failures} failure(s)"
+                    )
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+
+
+class SearchGovernor:
+    """Process-wide admission control for web searches.
+
+    Every search, from any crew, thread or async task, takes a token from a
+    shared bucket and is refused outright while the circuit is open. A
+    caller that would wait longer than ``max_wait`` for a token is refused
+    too, so a search either starts within a known delay or fails fast.
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        burst: int = 5,
+        max_wait: float = 5.0,
+        failure_threshold: int = 3,
+        reset_seconds: float = 30,
+    ):
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(failure_threshold, reset_seconds)
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        self._stats = {
+            "calls": 0,
+            "failures": 0,
+            "rejected_open": 0,
+            "rejected_rate": 0,
+            "waited_calls": 0,
+            "wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+        }
+
+    def _admit(self) -> float:
+        """Check the breaker and reserve a token; returns the wait in seconds."""
+        try:
+            self.breaker.allow()
+        except CircuitOpenError:
+            self._count("rejected_open")
+            raise
+
+        wait = self.bucket.reserve(self.max_wait)
+        if wait is None:
+            self.breaker.cancel()
+            self._count("rejected_rate")
+            raise RateLimitedError(
+                f"web search is rate limited; no slot within {self.max_wait}s"
+            )
+
+        with self._lock:
+            self._stats["calls"] += 1
+            if wait > 0:
+                self._stats["waited_calls"] += 1
+                self._stats["wait_seconds"] += wait
+                self._stats["max_wait_seconds"] = max(
+                    self._stats["max_wait_seconds"], wait
+                )
+        return wait
+
+    @contextmanager
+    def _admitted(self):
+        """Admit one search and record how it ended; yields the wait in seconds.
+
+        An ``Exception`` from the block counts as a provider failure. Any
+        other exit without a result, such as a cancelled task, gives a
+        half-open probe back unrecorded, so the breaker cannot be left
+        refusing every search.
+        """
+        wait = self._admit()
+        recorded = False
+        try:
+            yield wait
+            recorded = True
+            self.breaker.record_success()
+        except Exception:
+            recorded = True
+            self._failed()
+            raise
+        finally:
+            if not recorded:
+                self.breaker.cancel()
+
+    def call(self, fn):
+        """Run ``fn()`` once admitted, recording its outcome in the breaker."""
+        with self._admitted() as wait:
+            with span("search.wait", wait_seconds=round(wait, 3)):
+                if wait:
+                    time.sleep(wait)
+            return fn()
+
+    async def call_async(self, fn):
+        """Async ``call``; ``fn`` may return a value or an awaitable."""
+        with self._admitted() as wait:
+            with span("search.wait", wait_seconds=round(wait, 3)):
+                if wait:
+                    await asyncio.sleep(wait)
+            result = fn()
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+
+    def _failed(self):
+        self._count("failures")
+        self.breaker.record_failure()
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["state"] = self.breaker.state
+        stats["mean_wait_seconds"] = (
+            stats["wait_seconds"] / stats["calls"] if stats["calls"] else 0.0
+        )
+        return stats
+
+
+_governor = None
+_governor_lock = threading.Lock()
+
+
+def get_search_governor():
+    """Return the shared governor from ``search.governor``, or None if disabled."""
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            config = load_yaml_config().get("search", {}).get("governor", {})
+            if not config.get("enabled", True):
+                return None
+            _governor = SearchGovernor(
+                rate=config.get("rate_per_second", 1.0),
+                burst=config.get("burst", 5),
+                max_wait=config.get("max_wait_seconds", 5.0),
+                failure_threshold=config.get("failure_threshold", 3),
+                reset_seconds=config.get("reset_seconds", 30),
+            )
+        return _governor
@@ -0,0 +1,131 @@
+# tools/term_extraction.py
+import heapq
+import math
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter
+
+
+# Only words of four or more letters are considered terms
+WORD_RE = re.compile(r"\b[a-zA-Z]{4,}\b")
+
+STOP_WORDS = frozenset(
+    {
+        "that", "this", "with", "from", "they", "have", "were", "been",
+        "their", "said", "each", "which", "then", "them", "these", "will",
+        "about", "would", "there", "could", "other", "more", "very", "what",
+        "know", "just", "first", "also", "after", "back", "work", "only",
+        "find", "long", "down",
+    }
+)  # fmt: skip
+
+DEFAULT_DF_PATH = "cache/term_df.sqlite"
+
+
+class DocumentFrequencyStore:
+    """Persistent document frequencies of terms seen in past searches.
+
+    Counts are loaded into memory once and written through to SQLite as new
+    documents are added, so they accumulate across runs.
+    """
+
+    def __init__(self, path: str = DEFAULT_DF_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS term_df (term TEXT PRIMARY KEY, df INTEGER NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS term_meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+        )
+        self._conn.commit()
+
+        self._df = Counter(dict(self._conn.execute("SELECT term, df FROM term_df")))
+        row = self._conn.execute(
+            "SELECT value FROM term_meta WHERE key = 'documents'"
+        ).fetchone()
+        self.documents = row[0] if row else 0
+
+    def add_document(self, terms):
+        """Count one document containing the given (unique) terms."""
+        terms = set(terms)
+        with self._lock:
+            self._df.update(terms)
+            self.documents += 1
+            self._conn.executemany(
+                "INSERT INTO term_df (term, df) VALUES (?, 1) "
+                "ON CONFLICT(term) DO UPDATE SET df = df + 1",
+                ((term,) for term in terms),
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO term_meta (key, value) VALUES ('documents', ?)",
+                (self.documents,),
+            )
+            self._conn.commit()
+
+    def idf(self, term: str) -> float:
+        # Smoothed IDF, always positive so frequent terms are damped, not dropped
+        return math.log((1 + self.documents) / (1 + self._df.get(term, 0))) + 1.0
+
+
+class TermExtractor:
+    """Top-k term extraction by frequency, optionally weighted by TF-IDF.
+
+    ``extract`` keeps the original contract: at most ``top_k`` words that
+    occur more than once, most important first.
+    """
+
+    def __init__(self, df_store: DocumentFrequencyStore = None, use_tfidf: bool = False):
+        self.df_store = df_store
+        self.use_tfidf = use_tfidf and df_store is not None
+
+    def extract(self, text: str, top_k: int = 10) -> list:
+        # Count first, then filter stop words once per distinct word
+        counts = Counter(WORD_RE.findall(text))
+        candidates = [
+            (word, freq)
+            for word, freq in counts.items()
+            if freq > 1 and word.lower() not in STOP_WORDS
+        ]
+
+        if self.use_tfidf and self.df_store.documents:
+            idf = self.df_store.idf
+            top = heapq.nlargest(
+                top_k, candidates, key=lambda item: item[1] * idf(item[0].lower())
+            )
+        else:
+            top = heapq.nlargest(top_k, candidates, key=lambda item: item[1])
+
+        if self.df_store is not None:
+            self.df_store.add_document(
+                word.lower() for word in counts if word.lower() not in STOP_WORDS
+            )
+
+        return [word for word, _ in top]
+
+
+_term_extractor = None
+_term_extractor_lock = threading.Lock()
+
+
+def get_term_extractor() -> TermExtractor:
+    """Return the shared extractor configured from ``search.terms``."""
+    global _term_extractor
+    with _term_extractor_lock:
+        if _term_extractor is None:
+            from models.local_llm import load_yaml_config
+
+            terms_config = load_yaml_config().get("search", {}).get("terms", {})
+            df_store = None
+            if terms_config.get("tfidf", False):
+                df_store = DocumentFrequencyStore(
+                    terms_config.get("df_path", DEFAULT_DF_PATH)
+                )
+            _term_extractor = TermExtractor(df_store, use_tfidf=df_store is not None)
+        return _term_extractor
@@ -0,0 +1,48 @@
+# tools/text_cleaning.py
+import re
+from functools import lru_cache
+
+
+# Patterns are compiled once at import time instead of being looked up in the
+# ``re`` module cache on every call.
+WHITESPACE_RE = re.compile(r"\s+")
+
+# Anything outside word characters, whitespace and basic punctuation
+DISALLOWED_CHARS_RE = re.compile(r'[^\w\s\-.,!?;:()\[\]{}"/·&%$#@]')
+
+# Dates and timestamps, merged into a single alternation
+DATE_RE = re.compile(
+    r"\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2},?\s+\d{4}\b"
+    r"|\b\d{1,2}[-/]\d{1,2}[-/]\d{2,4}\b"
+    r"|\b\d{4}[-/]\d{1,2}[-/]\d{1,2}\b"
+    r"|\b\d+\s+(?:hours?|days?|minutes?|seconds?)\s+ago\b",
+    re.IGNORECASE,
+)
+
+# Navigation and UI leftovers, merged into a single alternation
+UI_NOISE_RE = re.compile(
+    r"\b(?:click|menu|navigation|breadcrumb|sidebar|footer|header"
+    r"|home|contact|about|login|register|subscribe"
+    r"|read more|learn more|continue reading|view all)\b",
+    re.IGNORECASE,
+)
+
+
+@lru_cache(maxsize=4096)
+def clean_text(text: str) -> str:
+    """Clean and normalize text content from a search result.
+
+    Results are memoized, so a title or body that is cleaned more than once
+    during a search (e.g. for the content list and again for the summary)
+    only pays for the regex work the first time.
+    """
+    if not text:
+        return ""
+
+    cleaned = WHITESPACE_RE.sub(" ", text)
+    cleaned = DISALLOWED_CHARS_RE.sub("", cleaned)
+    cleaned = DATE_RE.sub("", cleaned)
+    cleaned = UI_NOISE_RE.sub("", cleaned)
+    cleaned = WHITESPACE_RE.sub(" ", cleaned)
+
+    return cleaned.strip()
@@ -1,11 +1,35 @@
 # tools/web_search.py
 from crewai.tools import BaseTool
-from ddgs import DDGS
 from typing import Type, Any
 from pydantic import BaseModel, Field
-import time
-import random
 import re
+import time
+import contextvars
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from models.local_llm import load_yaml_config
+from tools.search_cache import get_search_cache
+from tools.search_governor import SearchUnavailableError, get_search_governor
+from tools.term_extraction import get_term_extractor
+from tools.text_cleaning import clean_text
+from utils.telemetry import span
+
+
+# Sub-query templates used by fan-out mode, one per research angle
+FAN_OUT_TEMPLATES = [
+    "{topic}",
+    "what is {topic} definition",
+    "{topic} examples",
+    "{topic} best practices",
+    "{topic} common mistakes pitfalls",
+]
+
+# Phrases that mark a result as a given kind of content, checked in order
+CONTENT_INDICATORS = {
+    "definition": ["what is", "definition", "means", "refers to", "is a", "is an"],
+    "example": ["example", "for instance", "such as", "like", "including"],
+    "explanation": ["how to", "steps", "process", "method", "approach"],
+}
 
 
 class SearchInput(BaseModel):
@@ -22,119 +46,259 @@ class DuckDuckGoSearchTool(BaseTool):
         "that can be used to create comprehensive tutorials."
     )
     args_schema: Type[BaseModel] = SearchInput
+    max_results: int = 8
+    fan_out: bool = False
+    fan_out_timeout: float = 15.0
+    fan_out_workers: int = 4
+    # Stop consuming results once this many usable sources span enough
+    # categories; 0 disables early stopping
+    min_sources: int = 0
+    min_categories: int = 0
+    # In fan-out mode the sources must also come from this many sub-queries,
+    # or the first sub-query to finish would end the search on its own
+    min_sub_queries: int = 0
+    # Attempts per query; pacing between them is left to the search governor
+    max_attempts: int = 2
 
     def _run(self, query: str) -> str:
         """Execute the search and return content-focused results"""
-        max_retries = 3
-        base_delay = 1
-
-        for attempt in range(max_retries):
-            try:
-                if attempt > 0:
-                    delay = base_delay * (2**attempt) + random.uniform(0, 1)
-                    time.sleep(delay)
-
-                with DDGS() as ddgs:
-                    results = ddgs.text(query, max_results=8)
-
-                    if not results:
-                        if attempt < max_retries - 1:
+        # Fan-out merges several result sets, so allow more sources through
+        source_limit = 12 if self.fan_out else 6
+
+        results = self._iter_results(query)
+        try:
+            content_summary = self._extract_content(results, query, source_limit)
+        except Exception as e:
+            return f"Search error: {str(e)}"
+        finally:
+            # Stops any sub-queries still running once we have enough content
+            results.close()
+
+        if content_summary is None:
+            return f"No results found for the topic: {query}"
+
+        if not content_summary:
+            return f"No relevant educational content found for: {query}"
+
+        return content_summary
+
+    def _search(self, query: str) -> list:
+        """Return raw results for one query, served from the cache when possible"""
+        cache = get_search_cache()
+        if cache is None:
+            return self._fetch_results(query, self.max_results)
+
+        return cache.get_or_fetch(
+            query,
+            self.max_results,
+            lambda: self._fetch_results(query, self.max_results),
+        )
+
+    def _iter_results(self, query: str):
+        """Yield raw results as they arrive, without duplicate URLs.
+
+        In fan-out mode each sub-query's results are yielded as soon as that
+        sub-query completes, tagged with the sub-query's index as
+        ``sub_query``. Each sub-query gets ``fan_out_timeout`` seconds
+        from when a worker starts it, so queued sub-queries get as long as
+        the first ones. Sub-queries that run out of time, or are still
+        pending when the consumer stops early, are abandoned.
+        """
+        if not self.fan_out:
+            yield from self._search(query)
+            return
+
+        sub_queries = self._expand_queries(query)
+        workers = min(self.fan_out_workers, len(sub_queries))
+        executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="search-fan-out"
+        )
+        started = {}
+
+        def search(index, sub_query):
+            started[index] = time.monotonic()
+            return self._search(sub_query)
+
+        seen = set()
+        yielded = False
+        errors = []
+        try:
+            # Copy the context per sub-query so telemetry spans land in this run
+            futures = {
+                executor.submit(contextvars.copy_context().run, search, i, q): i
+                for i, q in enumerate(sub_queries)
+            }
+            pending = set(futures)
+            abandoned = set()
+            while pending:
+                now = time.monotonic()
+                deadlines = {
+                    future: started[futures[future]] + self.fan_out_timeout
+                    for future in pending
+                    if futures[future] in started
+                }
+                expired = {f for f, deadline in deadlines.items() if deadline <= now}
+                pending -= expired
+                abandoned = {f for f in abandoned | expired if not f.done()}
+                # Abandoned sub-queries keep their worker; once they hold all
+                # of them, the queued ones would never start
+                if not pending or len(abandoned) >= workers:
+                    break
+
+                live = [d for f, d in deadlines.items() if f in pending]
+                timeout = min(live) - now if live else self.fan_out_timeout
+                done, _ = wait(
+                    pending | abandoned, timeout=timeout, return_when=FIRST_COMPLETED
+                )
+                for future in done & pending:
+                    pending.discard(future)
+                    try:
+                        results = future.result()
+                    except Exception as e:
+                        errors.append(e)
+                        continue
+                    for result in results:
+                        url = result.get("href", "").rstrip("/").lower()
+                        if url and url in seen:
                             continue
-                        return f"No results found for the topic: {query}"
-
-                    # Extract and format content
-                    content_summary = self._extract_content(results, query)
-
-                    if not content_summary:
-                        return f"No relevant educational content found for: {query}"
-
-                    return content_summary
-
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    continue
-                else:
-                    return f"Search error: {str(e)}"
-
-        return f"Search failed after {max_retries} attempts"
-
-    def _extract_content(self, results: list, query: str) -> str:
-        """Extract and synthesize actual content from search results"""
-        if not results:
-            return "No content found."
-
-        # Initialize content sections
-        content_sections = {
-            "definitions": [],
-            "key_concepts": [],
-            "examples": [],
-            "explanations": [],
-            "best_practices": [],
-        }
-
+                        seen.add(url)
+                        yielded = True
+                        yield dict(result, sub_query=futures[future])
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        if not yielded and errors:
+            raise errors[0]
+
+    def _expand_queries(self, query: str) -> list:
+        """Expand a topic into sub-queries covering different research angles"""
+        topic = query.strip()
+        return [template.format(topic=topic) for template in FAN_OUT_TEMPLATES]
+
+    def _fetch_results(self, query: str, max_results: int) -> list:
+        """Fetch raw results from DDGS through the shared search governor.
+
+        The governor paces requests across all crews and refuses them while
+        the provider keeps failing; a refused search is not retried.
+        """
+        governor = get_search_governor()
+
+        for attempt in range(self.max_attempts):
+            with span("search.attempt", query=query, retries=attempt) as record:
+                try:
+                    if governor is None:
+                        results = self._ddgs_text(query, max_results)
+                    else:
+                        results = governor.call(
+                            lambda: self._ddgs_text(query, max_results)
+                        )
+
+                    record.attrs["results"] = len(results or [])
+                    if results:
+                        return results
+
+                except SearchUnavailableError as e:
+                    record.attrs["error"] = f"{type(e).__name__}: {e}"
+                    raise
+                except Exception as e:
+                    record.attrs["error"] = f"{type(e).__name__}: {e}"
+                    if attempt == self.max_attempts - 1:
+                        raise
+
+        return []
+
+    def _ddgs_text(self, query: str, max_results: int) -> list:
+        # Deferred: ddgs is slow to import and only needed on a cache miss
+        from ddgs import DDGS
+
+        with DDGS() as ddgs:
+            return ddgs.text(query, max_results=max_results)
+
+    def _extract_content(self, results, query: str, limit: int = 6):
+        """Extract and synthesize actual content from search results.
+
+        ``results`` may be any iterable; it is consumed lazily and each result
+        is cleaned and categorized once. Consumption stops after ``limit``
+        results, or earlier once ``min_sources`` usable bodies covering
+        ``min_categories`` categories (and, in fan-out mode,
+        ``min_sub_queries`` sub-queries) have been gathered. Returns None
+        when the iterable yielded nothing.
+        """
         content_output = []
         content_output.append(f"Research Content for: {query}")
         content_output.append("=" * 60)
 
-        for i, result in enumerate(results[:6], 1):
-            title = result.get("title", "")
-            body = result.get("body", "")
+        summary_bodies = []
+        categories = set()
+        sub_queries = set()
+        sources = 0
+        seen_any = False
+
+        for i, result in enumerate(islice(results, limit), 1):
+            seen_any = True
+            title = self._clean_text(result.get("title", ""))
+            body = self._clean_text(result.get("body", ""))
             href = result.get("href", "")
 
-            # Clean the content
-            title = self._clean_text(title)
-            body = self._clean_text(body)
+            if len(summary_bodies) < 5 and len(body) > 30:
+                summary_bodies.append(body)
 
             # Skip if content is too short
             if len(body) < 50:
                 continue
 
             # Categorize and extract content
-            categorized_content = self._categorize_content(title, body)
+            category = self._classify_content(title, body)
+            categorized_content = self._extract_for_category(category, body)
 
             if categorized_content:
                 content_output.append(f"\n--- Source {i}: {title} ---")
                 content_output.append(f"Content: {categorized_content}")
                 if href:
                     content_output.append(f"Reference: {href}")
+                sources += 1
+                categories.add(category)
+                sub_queries.add(result.get("sub_query"))
+
+            if self._has_enough_content(sources, categories, sub_queries):
+                break
+
+        if not seen_any:
+            return None
 
         # Add synthesized summary
         content_output.append("\n" + "=" * 60)
         content_output.append("RESEARCH SUMMARY:")
-        content_output.append(self._create_summary(results, query))
+        content_output.append(self._create_summary(summary_bodies, query))
 
         return "\n".join(content_output)
 
-    def _categorize_content(self, title: str, body: str) -> str:
-        """Categorize and extract meaningful content"""
-        # Look for different types of content
-        content_indicators = {
-            "definition": [
-                "what is",
-                "definition",
-                "means",
-                "refers to",
-                "is a",
-                "is an",
-            ],
-            "example": ["example", "for instance", "such as", "like", "including"],
-            "explanation": ["how to", "steps", "process", "method", "approach"],
-            "benefit": ["advantage", "benefit", "useful", "helpful", "important"],
-            "concept": ["concept", "principle", "theory", "idea", "fundamental"],
-        }
-
+    def _has_enough_content(
+        self, sources: int, categories: set, sub_queries: set = ()
+    ) -> bool:
+        """Whether the early-stop thresholds are met (disabled when 0)"""
+        if not self.min_sources:
+            return False
+        if self.fan_out and len(sub_queries) < self.min_sub_queries:
+            return False
+        return sources >= self.min_sources and len(categories) >= self.min_categories
+
+    def _classify_content(self, title: str, body: str) -> str:
+        """Return the content category a result best fits"""
         full_text = f"{title} {body}".lower()
 
-        # Extract the most relevant content
-        if any(
-            indicator in full_text for indicator in content_indicators["definition"]
-        ):
+        for category in ("definition", "example", "explanation"):
+            indicators = CONTENT_INDICATORS[category]
+            if any(indicator in full_text for indicator in indicators):
+                return category
+        return "key_info"
+
+    def _extract_for_category(self, category: str, body: str) -> str:
+        if category == "definition":
             return self._extract_definition(body)
-        elif any(indicator in full_text for indicator in content_indicators["example"]):
+        elif category == "example":
             return self._extract_example(body)
-        elif any(
-            indicator in full_text for indicator in content_indicators["explanation"]
-        ):
+        elif category == "explanation":
             return self._extract_explanation(body)
         else:
             # Return the most informative part
@@ -178,15 +342,8 @@ class DuckDuckGoSearchTool(BaseTool):
         # Return the first substantial part of the text
         return text[:180] + "..." if len(text) > 180 else text
 
-    def _create_summary(self, results: list, query: str) -> str:
-        """Create a synthesized summary of all findings"""
-        all_content = []
-
-        for result in results[:5]:
-            body = result.get("body", "")
-            if body and len(body) > 30:
-                all_content.append(self._clean_text(body))
-
+    def _create_summary(self, all_content: list, query: str) -> str:
+        """Create a synthesized summary from already-cleaned result bodies"""
         if not all_content:
             return "No substantial content found for synthesis."
 
@@ -209,165 +366,28 @@ class DuckDuckGoSearchTool(BaseTool):
 
     def _extract_important_terms(self, text: str) -> list:
         """Extract important terms from the combined text"""
-        # Simple keyword extraction (you could use more sophisticated NLP here)
-        words = re.findall(r"\b[a-zA-Z]{4,}\b", text)
-
-        # Filter out common words
-        stop_words = {
-            "that",
-            "this",
-            "with",
-            "from",
-            "they",
-            "have",
-            "were",
-            "been",
-            "their",
-            "said",
-            "each",
-            "which",
-            "then",
-            "them",
-            "these",
-            "will",
-            "about",
-            "would",
-            "there",
-            "could",
-            "other",
-            "more",
-            "very",
-            "what",
-            "know",
-            "just",
-            "first",
-            "also",
-            "after",
-            "back",
-            "work",
-            "way",
-            "only",
-            "new",
-            "old",
-            "see",
-            "him",
-            "two",
-            "how",
-            "its",
-            "who",
-            "oil",
-            "sit",
-            "now",
-            "find",
-            "long",
-            "down",
-            "day",
-            "did",
-            "get",
-            "has",
-            "may",
-            "say",
-            "she",
-            "use",
-            "her",
-            "all",
-            "any",
-            "can",
-            "had",
-            "was",
-            "one",
-            "our",
-            "out",
-            "are",
-            "but",
-            "not",
-            "you",
-            "all",
-            "can",
-            "had",
-            "her",
-            "was",
-            "one",
-            "our",
-            "out",
-            "day",
-            "get",
-            "has",
-            "him",
-            "his",
-            "how",
-            "man",
-            "new",
-            "now",
-            "old",
-            "see",
-            "two",
-            "way",
-            "who",
-            "boy",
-            "did",
-            "its",
-            "let",
-            "put",
-            "say",
-            "she",
-            "too",
-            "use",
-        }
-
-        filtered_words = [word for word in words if word.lower() not in stop_words]
-
-        # Count frequency and return most common
-        word_freq = {}
-        for word in filtered_words:
-            word_freq[word] = word_freq.get(word, 0) + 1
-
-        # Sort by frequency and return top terms
-        sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
-        return [word for word, freq in sorted_words if freq > 1][:10]
+        return get_term_extractor().extract(text)
 
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text content"""
-        if not text:
-            return ""
-
-        # Remove excessive whitespace
-        cleaned = re.sub(r"\s+", " ", text)
-
-        # Remove unwanted characters but keep basic punctuation
-        cleaned = re.sub(r'[^\w\s\-.,!?;:()\[\]{}"/·&%$#@]', "", cleaned)
-
-        # Remove dates and timestamps
-        date_patterns = [
-            r"\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{1,2},?\s+\d{4}\b",
-            r"\b\d{1,2}[-/]\d{1,2}[-/]\d{2,4}\b",
-            r"\b\d{4}[-/]\d{1,2}[-/]\d{1,2}\b",
-            r"\b\d+\s+(?:hours?|days?|minutes?|seconds?)\s+ago\b",
-        ]
-
-        for pattern in date_patterns:
-            cleaned = re.sub(pattern, "", cleaned, flags=re.IGNORECASE)
-
-        # Remove navigation and UI elements
-        ui_patterns = [
-            r"\b(?:click|menu|navigation|breadcrumb|sidebar|footer|header)\b",
-            r"\b(?:home|contact|about|login|register|subscribe)\b",
-            r"\b(?:read more|learn more|continue reading|view all)\b",
-        ]
-
-        for pattern in ui_patterns:
-            cleaned = re.sub(pattern, "", cleaned, flags=re.IGNORECASE)
-
-        # Clean up multiple spaces
-        cleaned = re.sub(r"\s+", " ", cleaned)
-
-        return cleaned.strip()
+        return clean_text(text)
 
 
 class WebSearchTool:
     @staticmethod
     def tool():
-        return DuckDuckGoSearchTool()
+        search_config = load_yaml_config().get("search", {})
+        fan_out_config = search_config.get("fan_out", {})
+        early_stop_config = search_config.get("early_stop", {})
+        return DuckDuckGoSearchTool(
+            fan_out=fan_out_config.get("enabled", False),
+            fan_out_timeout=fan_out_config.get("timeout_seconds", 15.0),
+            fan_out_workers=fan_out_config.get("max_workers", 4),
+            min_sources=early_stop_config.get("min_sources", 0),
+            min_categories=early_stop_config.get("min_categories", 0),
+            min_sub_queries=early_stop_config.get("min_sub_queries", 3),
+            max_attempts=search_config.get("governor", {}).get("max_attempts", 2),
+        )
 
 
 # Test the tool
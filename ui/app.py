@@ -6,12 +6,123 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import streamlit as st
-from main import run, OUTPUT_FILE
-from utils.input_processor import process_user_input
+from utils.input_processor import process_user_input, get_input_processor
+from utils.filenames import safe_filename
+from utils.job_queue import get_job_queue, QUEUED, RUNNING, DONE, FAILED
+from utils.tutorial_index import get_tutorial_index
+from models.warmup import get_model_warmer
 import os
-import re
+import time
+
+STAGE_MESSAGES = {
+    "researcher": "🔍 Research Agent: Gathering information and key concepts...",
+    "writer": "✍️ Writer Agent: Creating tutorial content...",
+    "reviewer": "📋 Reviewer Agent: Checking quality and clarity...",
+}
+
+# How often a page with a running job re-polls the queue
+POLL_INTERVAL_SECONDS = 0.5
+
+# How long the topic input must stay unchanged before the preview asks the model
+PREVIEW_DEBOUNCE_SECONDS = 0.8
+
+
+@st.cache_resource
+def job_queue():
+    """One job queue shared by every session of this Streamlit server."""
+    return get_job_queue()
+
+
+@st.cache_resource
+def tutorial_index():
+    """The archive of generated tutorials, or None if disabled."""
+    return get_tutorial_index()
+
+
+@st.cache_resource
+def model_warmer():
+    """Preload the model once per server and keep it loaded while it runs."""
+    warmer = get_model_warmer()
+    if warmer is not None:
+        warmer.warm_up_async()
+        warmer.start_keep_warm()
+    return warmer
+
+
+def open_archived(tutorial_id):
+    """Show an archived tutorial as if it had just been generated."""
+    tutorial = tutorial_index().get(tutorial_id)
+    output_dir = job_queue().output_dir
+    os.makedirs(output_dir, exist_ok=True)
+    output_file = os.path.join(output_dir, f"archived-{tutorial.id}.md")
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.write(tutorial.content)
+
+    st.session_state.tutorial_generated = True
+    st.session_state.final_topic = tutorial.topic
+    st.session_state.output_file = output_file
+    for key in (
+        "run_breakdown",
+        "context_savings",
+        "section_review",
+        "quality_gate",
+        "reused_topic",
+    ):
+        st.session_state.pop(key, None)
+
+
+def render_job_progress(job):
+    """Show a job's progress bar and live output.
+
+    Only events added since the last rerun are applied to the view kept in
+    the session; streamed tokens are read from the job's running text.
+    """
+    view = st.session_state.get("job_view")
+    if view is None or view["job_id"] != job.id:
+        view = {
+            "job_id": job.id,
+            "cursor": 0,
+            "progress": 0,
+            "status": "🤖 Initializing AI agents and local LLM...",
+            "stage": None,
+            "output": "",
+            "stage_log": [],
+        }
+        st.session_state.job_view = view
+
+    events, view["cursor"] = job.events_since(view["cursor"])
+    for event in events:
+        if event["type"] == "task_started":
+            view["progress"] = int(event["index"] / event["total"] * 100)
+            view["status"] = STAGE_MESSAGES.get(event["stage"], "Working...")
+            view["stage"] = event["stage"]
+            view["output"] = ""
+        elif event["type"] == "subtask_completed":
+            view["status"] = (
+                f"{STAGE_MESSAGES.get(event['stage'], 'Working...')} "
+                f"({event['done']}/{event['of']} parts done)"
+            )
+        elif event["type"] == "task_completed":
+            view["output"] = event["output"]
+            view["stage_log"].append(
+                f"✅ {event['stage'].capitalize()} finished in {event['seconds']:.1f}s"
+            )
+
+    st.progress(view["progress"])
+    st.text(view["status"])
+    for line in view["stage_log"]:
+        st.write(line)
+    if job.first_token_at is not None and job.started_at:
+        first_token_seconds = job.first_token_at - job.started_at
+        st.caption(f"⚡ First output after {first_token_seconds:.1f}s")
+    live_text = job.live_text or view["output"]
+    if live_text:
+        st.caption(f"Live output from the {view['stage']}:")
+        st.markdown(live_text)
+
 
 st.set_page_config(page_title="AI Tutorial Generator", layout="centered")
+model_warmer()
 
 st.title("🧠 AI-Powered Tutorial Generator")
 st.markdown("Generate beginner tutorials using CrewAI agents and a local model.")
@@ -21,8 +132,27 @@ raw_topic = st.text_input("Enter Tutorial Topic")
 
 # Show processed topic preview
 if raw_topic:
-    with st.spinner("Processing input..."):
-        processed_topic = process_user_input(raw_topic)
+    # Instant preview from basic cleanup or the memo table, no model call
+    processed_topic = process_user_input(raw_topic, allow_llm=False)
+    # Inputs already sent to the model in this session, with the result. A
+    # failed call is not memoized, so without this every job-status rerun
+    # would call the model again.
+    previews = st.session_state.setdefault("previews", {})
+
+    if raw_topic in previews:
+        processed_topic = previews[raw_topic]
+    elif get_input_processor().needs_llm(raw_topic):
+        if st.session_state.get("preview_pending") != raw_topic:
+            # Debounce: only ask the model once the input has settled. A new
+            # edit during the sleep interrupts this run and starts over.
+            st.session_state.preview_pending = raw_topic
+            st.info(f"📝 Processed topic: **{processed_topic}**")
+            time.sleep(PREVIEW_DEBOUNCE_SECONDS)
+            st.rerun()
+
+        with st.spinner("Processing input..."):
+            processed_topic = process_user_input(raw_topic)
+        previews[raw_topic] = processed_topic
 
     if processed_topic != raw_topic:
         st.info(f"📝 Processed topic: **{processed_topic}**")
@@ -34,74 +164,106 @@ if "tutorial_generated" not in st.session_state:
 if "final_topic" not in st.session_state:
     st.session_state.final_topic = ""
 
-# Trigger button - only show if tutorial hasn't been generated yet
-if not st.session_state.tutorial_generated:
-    if st.button("🚀 Generate Tutorial"):
-        # Process the input first
-        st.session_state.final_topic = process_user_input(raw_topic)
-
-        # Create a progress container
-        progress_container = st.container()
-
-        with progress_container:
-            st.write(f"🎯 **Target Topic:** {st.session_state.final_topic}")
-
-            # Create progress bar
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-
-            # Step 1: Processing Input
-            status_text.text("🔄 Processing and validating input...")
-            progress_bar.progress(10)
-
-            # Step 2: Initializing Agents
-            status_text.text("🤖 Initializing AI agents and local LLM...")
-            progress_bar.progress(25)
-
-            # Step 3: Research Phase
-            status_text.text(
-                "🔍 Research Agent: Gathering information and key concepts..."
-            )
-            progress_bar.progress(40)
-
-            # Step 4: Writing Phase
-            status_text.text("✍️ Writer Agent: Creating tutorial content...")
-            progress_bar.progress(65)
-
-            # Step 5: Review Phase
-            status_text.text("📋 Reviewer Agent: Checking quality and clarity...")
-            progress_bar.progress(85)
-
-            # Step 6: Finalizing
-            status_text.text("🎨 Finalizing tutorial and saving output...")
-            progress_bar.progress(95)
-
-            # Run the actual generation
-            run(st.session_state.final_topic)
-
-            # Complete
-            progress_bar.progress(100)
-            status_text.text("✅ Tutorial generation completed!")
-
-            # Small delay to show completion
-            import time
-
-            time.sleep(1)
+if "job_id" not in st.session_state:
+    # Restore a job across page reloads from the URL
+    st.session_state.job_id = st.query_params.get("job")
+
+if "output_file" not in st.session_state:
+    st.session_state.output_file = ""
+
+job = job_queue().get(st.session_state.job_id) if st.session_state.job_id else None
+
+# Offer tutorials generated earlier for this or a related topic
+if raw_topic and not st.session_state.tutorial_generated and job is None:
+    archive = tutorial_index()
+    matches = archive.search(processed_topic) if archive is not None else []
+    if matches:
+        with st.expander(
+            f"📚 {len(matches)} tutorial(s) already generated on this topic",
+            expanded=matches[0].exact,
+        ):
+            for tutorial in matches:
+                col1, col2 = st.columns([4, 1])
+                created = time.strftime(
+                    "%Y-%m-%d", time.localtime(tutorial.created_at)
+                )
+                col1.write(f"**{tutorial.topic}** · {tutorial.model} · {created}")
+                if col2.button("Open", key=f"archived-{tutorial.id}"):
+                    open_archived(tutorial.id)
+                    st.rerun()
 
-            # Clear progress indicators
-            progress_bar.empty()
-            status_text.empty()
+# Trigger button - only show if no tutorial is generated or in progress
+if not st.session_state.tutorial_generated and job is None:
+    if st.button("🚀 Generate Tutorial"):
+        # Process the input first, reusing the preview's model call
+        previews = st.session_state.get("previews", {})
+        if raw_topic in previews:
+            st.session_state.final_topic = previews[raw_topic]
+        else:
+            st.session_state.final_topic = process_user_input(raw_topic)
+
+        # Queue the generation; a worker thread runs the crew
+        job = job_queue().submit(st.session_state.final_topic)
+        st.session_state.job_id = job.id
+        st.query_params["job"] = job.id
+        st.rerun()
 
-        # Hide the button by using session state
+# Show the status of a queued or running job
+if job is not None and not st.session_state.tutorial_generated:
+    st.session_state.final_topic = job.topic
+    st.write(f"🎯 **Target Topic:** {job.topic}")
+
+    if job.status == QUEUED:
+        position = job_queue().queue_position(job.id)
+        st.info(f"⏳ Waiting in queue (position {position})...")
+    elif job.status == RUNNING:
+        render_job_progress(job)
+    elif job.status == DONE:
         st.session_state.tutorial_generated = True
+        st.session_state.output_file = job.output_file
+        events, _ = job.events_since(0)
+        st.session_state.run_breakdown = next(
+            (e["breakdown"] for e in reversed(events) if e["type"] == "trace"), []
+        )
+        st.session_state.context_savings = next(
+            (e["savings"] for e in reversed(events) if e["type"] == "context_budget"),
+            {},
+        )
+        st.session_state.section_review = next(
+            (e for e in reversed(events) if e["type"] == "section_review"), None
+        )
+        st.session_state.quality_gate = next(
+            (e for e in reversed(events) if e["type"] == "quality_gate"), None
+        )
+        st.session_state.reused_topic = next(
+            (
+                e["matched_topic"]
+                for e in events
+                if e["type"] in ("archive_hit", "in_flight_hit")
+                and e["matched_topic"] != job.topic
+            ),
+            None,
+        )
         st.success("🎉 Tutorial Generated Successfully!")
         st.rerun()
+    elif job.status == FAILED:
+        st.error(f"❌ Tutorial generation failed: {job.error}")
+        if st.button("🔄 Try Again"):
+            st.session_state.job_id = None
+            st.query_params.clear()
+            st.rerun()
+
+    if not job.finished:
+        # Poll again shortly; the script thread is free between reruns
+        time.sleep(POLL_INTERVAL_SECONDS)
+        st.rerun()
 
 # Show tutorial content if it has been generated
 if st.session_state.tutorial_generated:
     # Display content
-    if os.path.exists(OUTPUT_FILE):
-        with open(OUTPUT_FILE, "r", encoding="utf-8") as f:
+    output_file = st.session_state.output_file
+    if output_file and os.path.exists(output_file):
+        with open(output_file, "r", encoding="utf-8") as f:
             content = f.read()
 
             # Create tabs for different views
@@ -109,6 +271,11 @@ if st.session_state.tutorial_generated:
 
             with tab1:
                 st.subheader("📘 Tutorial Preview")
+                if st.session_state.get("reused_topic"):
+                    st.info(
+                        "♻️ Reused the tutorial for the similar topic "
+                        f"**{st.session_state.reused_topic}**"
+                    )
 
                 # Clean and process the content for better rendering
                 if content.strip():
@@ -148,6 +315,35 @@ if st.session_state.tutorial_generated:
                     char_count = len(content)
                     st.metric("Characters", char_count)
 
+                # Show where this run spent its time
+                if st.session_state.get("run_breakdown"):
+                    with st.expander("⏱️ Run breakdown"):
+                        st.dataframe(
+                            st.session_state.run_breakdown,
+                            hide_index=True,
+                            use_container_width=True,
+                        )
+                        for stage, saved in st.session_state.get(
+                            "context_savings", {}
+                        ).items():
+                            st.caption(
+                                f"✂️ {stage.capitalize()} context: "
+                                f"{saved['tokens_before']} → {saved['tokens_after']} "
+                                f"tokens (saved {saved['tokens_saved']})"
+                            )
+                        gate = st.session_state.get("quality_gate")
+                        if gate:
+                            st.caption(
+                                f"🚦 Quality gate: {gate['decision']} review "
+                                f"(score {gate['score']}): {'; '.join(gate['reasons'])}"
+                            )
+                        review = st.session_state.get("section_review")
+                        if review:
+                            st.caption(
+                                f"📝 Review changed {review['changed']} of "
+                                f"{review['sections']} section(s)"
+                            )
+
             with tab2:
                 st.subheader("📝 Raw Markdown")
                 # Show raw markdown in a code block
@@ -160,15 +356,11 @@ if st.session_state.tutorial_generated:
         with col1:
             st.write("**Ready to save your tutorial?**")
         with col2:
-            with open(OUTPUT_FILE, "rb") as f:
-                # Create a safe filename
-                safe_filename = re.sub(r"[^\w\s-]", "", st.session_state.final_topic)
-                safe_filename = re.sub(r"[-\s]+", "_", safe_filename)
-
+            with open(output_file, "rb") as f:
                 st.download_button(
                     label="💾 Download Tutorial",
                     data=f,
-                    file_name=f"{safe_filename}_tutorial.md",
+                    file_name=f"{safe_filename(st.session_state.final_topic)}_tutorial.md",
                     mime="text/markdown",
                     use_container_width=True,
                 )
@@ -176,10 +368,14 @@ if st.session_state.tutorial_generated:
             # Add a reset button to generate a new tutorial
             if st.button("🔄 Generate New", use_container_width=True):
                 st.session_state.tutorial_generated = False
+                st.session_state.job_id = None
+                st.query_params.clear()
                 st.rerun()
     else:
         st.error("❌ Output file not found. Please try generating the tutorial again.")
         # Add reset button in case of error
         if st.button("🔄 Try Again"):
             st.session_state.tutorial_generated = False
+            st.session_state.job_id = None
+            st.query_params.clear()
             st.rerun()
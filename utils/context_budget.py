@@ -0,0 +1,236 @@
+# utils/context_budget.py
+import math
+import re
+from collections import Counter
+
+from tools.term_extraction import STOP_WORDS, WORD_RE
+from utils.telemetry import span
+from utils.tokens import estimate_tokens
+
+
+SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+NORMALIZE_RE = re.compile(r"[^a-z0-9]+")
+
+# Lines longer than this are split into sentences before ranking
+MAX_UNIT_TOKENS = 60
+
+# Units whose word sets overlap this much with a kept unit are near-duplicates
+NEAR_DUPLICATE_JACCARD = 0.8
+
+EXAMPLE_HINTS = ("example", "e.g.", "`", "=", ">>>")
+
+
+class Unit:
+    """One extractable piece of text: a line, a sentence or a code block."""
+
+    __slots__ = (
+        "text", "position", "tokens", "words", "is_code", "score", "line", "block"
+    )
+
+    def __init__(
+        self,
+        text: str,
+        position: int,
+        is_code: bool = False,
+        line: int = 0,
+        block: int = 0,
+    ):
+        self.text = text
+        self.position = position
+        # Source line and blank-line separated block, to rebuild the layout
+        self.line = line
+        self.block = block
+        self.tokens = estimate_tokens(text)
+        self.words = {w.lower() for w in WORD_RE.findall(text)} - STOP_WORDS
+        self.is_code = is_code
+        self.score = 0.0
+
+
+def split_units(text: str) -> list:
+    """Split text into lines and sentences, keeping fenced code blocks whole."""
+    units = []
+    code = None
+    block = 0
+    for number, line in enumerate(text.splitlines()):
+        if line.strip().startswith("```"):
+            if code is None:
+                code = [line]
+                block += 1
+            else:
+                code.append(line)
+                units.append(Unit("\n".join(code), len(units), True, number, block))
+                code = None
+                block += 1
+            continue
+        if code is not None:
+            code.append(line)
+            continue
+        if not line.strip():
+            block += 1
+            continue
+        if estimate_tokens(line) > MAX_UNIT_TOKENS:
+            for sentence in SENTENCE_SPLIT_RE.split(line.strip()):
+                if sentence:
+                    units.append(Unit(sentence, len(units), False, number, block))
+        else:
+            units.append(Unit(line, len(units), False, number, block))
+
+    if code is not None:
+        # Unterminated fence: keep what there is as one block
+        units.append(Unit("\n".join(code), len(units), True, number, block))
+    return units
+
+
+def join_units(units: list) -> str:
+    """Join units in order, keeping sentences on their line and blank lines
+    between blocks."""
+    parts = []
+    previous = None
+    for unit in units:
+        if previous is not None:
+            if unit.line == previous.line and not unit.is_code:
+                parts.append(" ")
+            elif unit.block == previous.block:
+                parts.append("\n")
+            else:
+                parts.append("\n\n")
+        parts.append(unit.text)
+        previous = unit
+    return "".join(parts)
+
+
+def deduplicate(units: list) -> list:
+    """Drop exact and near-duplicate units, keeping the first occurrence."""
+    kept = []
+    seen = set()
+    for unit in units:
+        key = NORMALIZE_RE.sub(" ", unit.text.lower()).strip()
+        if not key or key in seen:
+            continue
+        if len(unit.words) >= 5 and any(
+            len(unit.words & other.words) / len(unit.words | other.words)
+            >= NEAR_DUPLICATE_JACCARD
+            for other in kept
+            if other.words
+        ):
+            continue
+        seen.add(key)
+        kept.append(unit)
+    return kept
+
+
+def score_units(units: list, topic: str):
+    """Score units by topic overlap, key-term density and example content."""
+    topic_words = {w.lower() for w in WORD_RE.findall(topic)} - STOP_WORDS
+    term_counts = Counter(word for unit in units for word in unit.words)
+    for unit in units:
+        if not unit.tokens:
+            continue
+        topic_hits = len(unit.words & topic_words)
+        # Terms shared by several units are what the findings are about
+        key_terms = sum(term_counts[w] - 1 for w in unit.words)
+        score = 2.0 * topic_hits + key_terms / math.sqrt(unit.tokens)
+        if unit.is_code or any(hint in unit.text.lower() for hint in EXAMPLE_HINTS):
+            score += 1.5
+        if unit.text.lstrip().startswith("#"):
+            score += 1.0
+        # Slight preference for earlier findings, which are usually the overview
+        unit.score = score / (1 + 0.01 * unit.position)
+
+
+def compress(text: str, topic: str, max_tokens: int) -> str:
+    """Fit ``text`` into ``max_tokens`` by deduplicating and then keeping the
+    most relevant units in their original order.
+
+    Text already within budget is returned unchanged.
+    """
+    if max_tokens <= 0:
+        return ""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    units = deduplicate(split_units(text))
+    if sum(unit.tokens for unit in units) <= max_tokens:
+        return join_units(units)
+
+    score_units(units, topic)
+    selected = []
+    used = 0
+    for unit in sorted(units, key=lambda u: u.score, reverse=True):
+        if used + unit.tokens <= max_tokens:
+            selected.append(unit)
+            used += unit.tokens
+
+    if not selected:
+        # Nothing fits whole (one huge unit): fall back to a word cut
+        return " ".join(text.split()[: max(1, int(max_tokens * 0.75))])
+
+    selected.sort(key=lambda unit: unit.position)
+    return join_units(selected)
+
+
+class ContextBudgetManager:
+    """Keeps the context handed to the writer and reviewer within budget.
+
+    Call ``on_task_output(stage, output)`` after each task; it rewrites
+    ``output.raw`` in place, which is what CrewAI reads when it builds the
+    next task's context. Research is fitted to ``writer_tokens``; once the
+    draft exists, research is re-fitted so research plus draft stay within
+    ``reviewer_tokens``. The draft itself is never cut, since the reviewer
+    has to return all of it.
+    """
+
+    def __init__(self, topic: str, writer_tokens: int, reviewer_tokens: int):
+        self.topic = topic
+        self.writer_tokens = writer_tokens
+        self.reviewer_tokens = reviewer_tokens
+        self._research = []
+        self._originals = {}
+        self.savings = {}
+
+    def on_task_output(self, stage: str, output):
+        if stage == "researcher":
+            self._research.append(output)
+            self._originals[id(output)] = str(getattr(output, "raw", "") or "")
+            self._fit_research("writer", self.writer_tokens)
+        elif stage == "writer":
+            draft_tokens = estimate_tokens(str(getattr(output, "raw", "") or ""))
+            room = max(0, self.reviewer_tokens - draft_tokens)
+            self._fit_research("reviewer", room, extra_tokens=draft_tokens)
+
+    def _fit_research(self, stage: str, budget: int, extra_tokens: int = 0):
+        # Budget is shared evenly by the research outputs seen so far
+        share = budget // max(1, len(self._research))
+        before = extra_tokens
+        after = extra_tokens
+        with span("context.budget", stage=stage, budget_tokens=budget) as record:
+            for output in self._research:
+                original = self._originals[id(output)]
+                before += estimate_tokens(original)
+                output.raw = compress(original, self.topic, share)
+                after += estimate_tokens(output.raw)
+            record.attrs.update(
+                tokens_before=before, tokens_after=after, tokens_saved=before - after
+            )
+        self.savings[stage] = {
+            "tokens_before": before,
+            "tokens_after": after,
+            "tokens_saved": before - after,
+        }
+        print(
+            f"[ContextBudget] {stage}: {before} -> {after} tokens "
+            f"(saved {before - after})"
+        )
+
+
+def create_context_budget(topic: str):
+    """Return a manager configured from ``context_budget``, or None if disabled."""
+    from models.local_llm import load_yaml_config
+
+    config = load_yaml_config().get("context_budget", {})
+    if not config.get("enabled", True):
+        return None
+    return ContextBudgetManager(
+        topic,
+        writer_tokens=config.get("writer_tokens", 1500),
+        reviewer_tokens=config.get("reviewer_tokens", 3000),
+    )
@@ -0,0 +1,198 @@
+# utils/disk_cache.py
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class CacheEntry:
+    """A cached value together with the time it was stored."""
+
+    __slots__ = ("value", "created_at")
+
+    def __init__(self, value, created_at: float):
+        self.value = value
+        self.created_at = created_at
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.created_at
+
+
+class DiskCache:
+    """Small SQLite-backed key/value cache with TTL and LRU eviction.
+
+    Values must be JSON-serialisable. Several caches can share one database
+    file by using different namespaces; size limits apply per namespace.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        namespace: str = "default",
+        ttl: float = None,
+        max_entries: int = None,
+        max_bytes: int = None,
+        max_age: float = None,
+    ):
+        self.path = path
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # Entries older than this are purged outright; defaults to the TTL
+        self.max_age = max_age if max_age is not None else ttl
+
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "sets": 0, "evictions": 0}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_lru "
+            "ON cache_entries (namespace, accessed_at)"
+        )
+        self._conn.commit()
+
+    def get_entry(self, key: str):
+        """Return the stored ``CacheEntry`` for ``key`` regardless of TTL.
+
+        Callers that implement their own freshness policy (for example
+        stale-while-revalidate) use this instead of ``get``.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM cache_entries "
+                "WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE cache_entries SET accessed_at = ? "
+                "WHERE namespace = ? AND key = ?",
+                (now, self.namespace, key),
+            )
+            self._conn.commit()
+            self._stats["hits"] += 1
+
+        return CacheEntry(json.loads(row[0]), row[1])
+
+    def get(self, key: str, default=None):
+        """Return the cached value, or ``default`` if missing or expired."""
+        entry = self.get_entry(key)
+        if entry is None:
+            return default
+
+        if self.ttl is not None and entry.age > self.ttl:
+            with self._lock:
+                self._stats["hits"] -= 1
+                self._stats["misses"] += 1
+            return default
+
+        return entry.value
+
+    def set(self, key: str, value):
+        payload = json.dumps(value)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries "
+                "(namespace, key, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self.namespace, key, payload, len(payload), now, now),
+            )
+            self._stats["sets"] += 1
+            self._evict()
+            self._conn.commit()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            )
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,)
+            )
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop least recently used entries until the namespace fits its limits."""
+        if self.max_age is not None:
+            cursor = self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND created_at < ?",
+                (self.namespace, time.time() - self.max_age),
+            )
+            self._stats["evictions"] += max(cursor.rowcount, 0)
+
+        if self.max_entries is not None:
+            cursor = self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key IN ("
+                "SELECT key FROM cache_entries WHERE namespace = ? "
+                "ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.namespace, self.namespace, self.max_entries),
+            )
+            self._stats["evictions"] += max(cursor.rowcount, 0)
+
+        if self.max_bytes is not None:
+            total = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM cache_entries WHERE namespace = ?",
+                (self.namespace,),
+            ).fetchone()[0]
+            if total <= self.max_bytes:
+                return
+
+            rows = self._conn.execute(
+                "SELECT key, size FROM cache_entries WHERE namespace = ? "
+                "ORDER BY accessed_at ASC",
+                (self.namespace,),
+            ).fetchall()
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                self._conn.execute(
+                    "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                    (self.namespace, key),
+                )
+                total -= size
+                self._stats["evictions"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries "
+                "WHERE namespace = ?",
+                (self.namespace,),
+            ).fetchone()
+            stats = dict(self._stats, entries=entries, bytes=size)
+
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
@@ -0,0 +1,9 @@
+# utils/filenames.py
+import re
+
+
+def safe_filename(topic: str, default: str = "tutorial") -> str:
+    """Turn a topic into a filesystem-safe file stem, e.g. 'Python Lists' -> 'Python_Lists'."""
+    name = re.sub(r"[^\w\s-]", "", topic)
+    name = re.sub(r"[-\s]+", "_", name).strip("_")
+    return name or default
@@ -1,18 +1,47 @@
 # utils/input_processor.py
-from models.local_llm import get_local_llm
+from models.local_llm import load_yaml_config
+from models.routing import get_router, get_stage_llm
+from utils.disk_cache import DiskCache
+from utils.telemetry import span
 import re
+import threading
 
 
-class InputProcessor:
-    def __init__(self):
-        self.llm = get_local_llm()
+DEFAULT_MEMO_PATH = "cache/topics.sqlite"
+
 
-    def process_input(self, raw_input: str) -> str:
+class InputProcessor:
+    def __init__(self, memo: DiskCache = None):
+        self.memo = memo
+
+    @property
+    def llm(self):
+        # Only built when an unclear input actually needs the model; a small
+        # model can be routed to this stage in llm.stages.input_processor.
+        # The registry pools the client, so a routing change is picked up.
+        return get_stage_llm("input_processor")
+
+    def _memo_key(self, cleaned_input: str) -> str:
+        """Memo key for an input: the model and server that answer it, too."""
+        router = get_router()
+        llm_config = load_yaml_config().get("llm", {})
+        base_url = router.stage_config("input_processor").get("base_url")
+        if not base_url:
+            base_url = ",".join(
+                llm_config.get("backends")
+                or [llm_config.get("base_url", "http://localhost:11434")]
+            )
+        model = router.model_for("input_processor")
+        return f"{model}@{base_url}\n{cleaned_input}"
+
+    def process_input(self, raw_input: str, allow_llm: bool = True) -> str:
         """
         Process raw user input to create a clear, well-formatted topic for tutorial generation.
 
         Args:
             raw_input (str): Raw user input (potentially broken/unclear)
+            allow_llm (bool): If False, never call the model; unclear inputs
+                that are not memoized come back with basic cleanup only
 
         Returns:
             str: Clean, formatted topic ready for tutorial generation
@@ -24,11 +53,35 @@ class InputProcessor:
         if self._is_clear_input(cleaned_input):
             return cleaned_input
 
+        # Reuse the model's answer for inputs we have already seen
+        if self.memo is not None:
+            memoized = self.memo.get(self._memo_key(cleaned_input))
+            if memoized is not None:
+                return memoized
+
+        if not allow_llm:
+            return self._final_cleanup(cleaned_input)
+
         # Use LLM to fix and clarify the input
         processed_input = self._llm_process(cleaned_input)
+        if processed_input is None:
+            # Don't memoize failures; the model may be back next time
+            return self._final_cleanup(cleaned_input)
 
         # Final cleanup
-        return self._final_cleanup(processed_input)
+        result = self._final_cleanup(processed_input)
+        if self.memo is not None:
+            self.memo.set(self._memo_key(cleaned_input), result)
+        return result
+
+    def needs_llm(self, raw_input: str) -> bool:
+        """Whether processing this input would call the model."""
+        cleaned_input = self._basic_cleanup(raw_input)
+        if self._is_clear_input(cleaned_input):
+            return False
+        if self.memo is None:
+            return True
+        return self.memo.get(self._memo_key(cleaned_input)) is None
 
     def _basic_cleanup(self, text: str) -> str:
         """Basic text cleanup - remove extra spaces, fix common typos"""
@@ -107,7 +160,8 @@ Formatted topic:"""
 
         try:
             # Use the correct method for CrewAI LLM
-            response = self.llm.call(prompt)
+            with span("input_processor.llm"):
+                response = self.llm.call(prompt)
 
             # Extract the response content
             if hasattr(response, "content"):
@@ -125,7 +179,7 @@ Formatted topic:"""
 
         except Exception as e:
             print(f"[InputProcessor] LLM processing failed: {e}")
-            return text
+            return None
 
     def _final_cleanup(self, text: str) -> str:
         """Final cleanup of processed text"""
@@ -143,19 +197,40 @@ Formatted topic:"""
         return text
 
 
+_processor = None
+_processor_lock = threading.Lock()
+
+
+def get_input_processor() -> InputProcessor:
+    """Return the shared processor, backed by the persistent topic memo table."""
+    global _processor
+    with _processor_lock:
+        if _processor is None:
+            config = load_yaml_config().get("input_processor", {})
+            memo = None
+            if config.get("memo_enabled", True):
+                memo = DiskCache(
+                    config.get("memo_path", DEFAULT_MEMO_PATH),
+                    namespace="topics",
+                    max_entries=config.get("memo_max_entries", 5000),
+                )
+            _processor = InputProcessor(memo=memo)
+        return _processor
+
+
 # Convenience function for easy import
-def process_user_input(raw_input: str) -> str:
+def process_user_input(raw_input: str, allow_llm: bool = True) -> str:
     """
     Process raw user input into a clean tutorial topic.
 
     Args:
         raw_input (str): Raw user input
+        allow_llm (bool): If False, skip the model for unclear inputs
 
     Returns:
         str: Processed topic ready for tutorial generation
     """
-    processor = InputProcessor()
-    return processor.process_input(raw_input)
+    return get_input_processor().process_input(raw_input, allow_llm=allow_llm)
 
 
 """
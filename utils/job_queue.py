@@ -0,0 +1,211 @@
+# utils/job_queue.py
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from utils.topic_similarity import TopicSimilarityIndex, similarity_threshold
+
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+DEFAULT_OUTPUT_DIR = os.path.join("output", "jobs")
+
+
+class Job:
+    """One tutorial generation request and everything the UI needs to show it."""
+
+    def __init__(self, topic: str, output_file: str, job_id: str = None):
+        self.id = job_id or uuid.uuid4().hex[:12]
+        self.topic = topic
+        self.output_file = output_file
+        self.status = QUEUED
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.events = []
+        # Streamed tokens of the running task, merged rather than kept as events
+        self.live_text = ""
+        self.first_token_at = None
+        self._lock = threading.Lock()
+
+    def add_event(self, event: dict):
+        event.setdefault("at", time.time())
+        with self._lock:
+            if event["type"] == "token":
+                if self.first_token_at is None:
+                    self.first_token_at = event["at"]
+                self.live_text += event["text"]
+                return
+            if event["type"] in ("task_started", "task_completed"):
+                self.live_text = ""
+            self.events.append(event)
+
+    def events_since(self, cursor: int = 0):
+        """Return ``(new_events, next_cursor)`` for incremental polling."""
+        with self._lock:
+            return self.events[cursor:], len(self.events)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "topic": self.topic,
+            "status": self.status,
+            "output_file": self.output_file,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "first_token_at": self.first_token_at,
+            "events": len(self.events),
+        }
+
+
+class JobQueue:
+    """FIFO queue of tutorial jobs served by a fixed pool of worker threads.
+
+    Every job writes to its own output file, so concurrent users never
+    overwrite each other's results. Callers poll ``get``/``status`` and
+    ``Job.events_since`` for progress. With a ``similarity_threshold``, a
+    topic that nearly duplicates a queued or running job's topic joins
+    that job instead of queueing another crew.
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        output_dir: str = DEFAULT_OUTPUT_DIR,
+        max_jobs: int = 500,
+        runner=None,
+        similarity_threshold: float = 0.0,
+    ):
+        self.output_dir = output_dir
+        self.max_jobs = max_jobs
+        self._runner = runner
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._pending = None
+        if similarity_threshold:
+            self._pending = TopicSimilarityIndex(similarity_threshold)
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="tutorial-job"
+        )
+
+    def submit(self, topic: str) -> Job:
+        os.makedirs(self.output_dir, exist_ok=True)
+        job = Job(topic, output_file="")
+        job.output_file = os.path.join(self.output_dir, f"{job.id}.md")
+
+        with self._lock:
+            match = self._pending.lookup(topic) if self._pending else None
+            if match is not None:
+                _, _, existing, similarity = match
+                print(
+                    f"[JobQueue] '{topic}' joins job {existing.id} for "
+                    f"'{existing.topic}' (similarity {similarity:.2f})"
+                )
+                return existing
+            if self._pending is not None:
+                self._pending.add(job.id, topic, job)
+            self._jobs[job.id] = job
+            self._prune()
+
+        self._executor.submit(self._execute, job)
+        return job
+
+    def get(self, job_id: str):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def status(self, job_id: str):
+        """Return the job as a dict, including its place in the queue."""
+        job = self.get(job_id)
+        if job is None:
+            return None
+        status = job.to_dict()
+        status["queue_position"] = self.queue_position(job_id)
+        return status
+
+    def queue_position(self, job_id: str) -> int:
+        """1-based position among queued jobs, or 0 if the job is not queued."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != QUEUED:
+                return 0
+            return 1 + sum(
+                1
+                for other in self._jobs.values()
+                if other.status == QUEUED and other.created_at < job.created_at
+            )
+
+    def list_jobs(self) -> list:
+        with self._lock:
+            return [job.to_dict() for job in self._jobs.values()]
+
+    def _execute(self, job: Job):
+        job.status = RUNNING
+        job.started_at = time.time()
+        try:
+            runner = self._runner
+            if runner is None:
+                # Imported lazily so creating the queue stays cheap
+                from main import run as runner
+
+            runner(job.topic, output_file=job.output_file, on_event=job.add_event)
+            job.status = DONE
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            job.status = FAILED
+            print(f"[JobQueue] Job {job.id} failed: {job.error}")
+        finally:
+            job.finished_at = time.time()
+            if self._pending is not None:
+                self._pending.remove(job.id)
+
+    def similarity_stats(self) -> dict:
+        """Hit rate of near-duplicate topics joining pending jobs."""
+        return self._pending.stats() if self._pending is not None else {}
+
+    def _prune(self):
+        """Forget the oldest finished jobs once more than ``max_jobs`` are held."""
+        excess = len(self._jobs) - self.max_jobs
+        if excess <= 0:
+            return
+        finished = sorted(
+            (job for job in self._jobs.values() if job.finished),
+            key=lambda job: job.finished_at,
+        )
+        for job in finished[:excess]:
+            del self._jobs[job.id]
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+
+_job_queue = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """Return the process-wide job queue configured from ``jobs`` in the config."""
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            from models.local_llm import load_yaml_config
+
+            jobs_config = load_yaml_config().get("jobs", {})
+            _job_queue = JobQueue(
+                workers=jobs_config.get("workers", 1),
+                output_dir=jobs_config.get("output_dir", DEFAULT_OUTPUT_DIR),
+                max_jobs=jobs_config.get("max_jobs", 500),
+                similarity_threshold=similarity_threshold(),
+            )
+        return _job_queue
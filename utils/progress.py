@@ -0,0 +1,196 @@
+# utils/progress.py
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+
+def _stream_event_types():
+    """Return (event_bus, LLMStreamChunkEvent) for the installed CrewAI, if any."""
+    try:
+        from crewai.events import crewai_event_bus, LLMStreamChunkEvent
+    except ImportError:
+        try:
+            from crewai.utilities.events import crewai_event_bus, LLMStreamChunkEvent
+        except ImportError:
+            return None, None
+    return crewai_event_bus, LLMStreamChunkEvent
+
+
+_active_trackers = []
+# The tracker of the run in this thread or task; crews running at once in
+# other threads (job queue workers, batch mode) each see their own
+_current_tracker = contextvars.ContextVar("progress_tracker", default=None)
+_active_lock = threading.Lock()
+_stream_handler_installed = False
+# Chunks streamed by LLM calls made in the current thread
+_thread_chunks = threading.local()
+# Chunks that arrived on a thread with no ``streaming_call`` in progress
+_stray_chunks = 0
+
+
+def stream_chunk_count() -> int:
+    """Number of streamed chunks handled so far for calls in this thread.
+
+    This relies on the event bus running the chunk handler on the thread
+    that made the LLM call, which CrewAI's bus does for sync handlers. A bus
+    that dispatches elsewhere shows up in ``stray_chunk_count`` instead.
+    """
+    return getattr(_thread_chunks, "count", 0)
+
+
+def stray_chunk_count() -> int:
+    """Number of chunks handled on threads not inside a ``streaming_call``."""
+    return _stray_chunks
+
+
+@contextmanager
+def streaming_call():
+    """Mark the current thread as making an LLM call whose chunks are counted."""
+    _thread_chunks.calls = getattr(_thread_chunks, "calls", 0) + 1
+    try:
+        yield
+    finally:
+        _thread_chunks.calls -= 1
+
+
+def _count_stream_chunk():
+    global _stray_chunks
+    if getattr(_thread_chunks, "calls", 0):
+        _thread_chunks.count = stream_chunk_count() + 1
+    else:
+        with _active_lock:
+            _stray_chunks += 1
+
+
+def _install_stream_handler():
+    """Subscribe once to CrewAI's token stream and fan chunks out to trackers."""
+    global _stream_handler_installed
+    with _active_lock:
+        if _stream_handler_installed:
+            return
+        event_bus, chunk_event = _stream_event_types()
+        if event_bus is None:
+            return
+
+        @event_bus.on(chunk_event)
+        def _on_stream_chunk(source, event):
+            _count_stream_chunk()
+            tracker = _current_tracker.get()
+            if tracker is None:
+                # A thread started without this context: the chunk can only
+                # be attributed when a single crew is running in the process
+                with _active_lock:
+                    trackers = list(_active_trackers)
+                tracker = trackers[0] if len(trackers) == 1 else None
+            if tracker is not None:
+                tracker.on_token(getattr(event, "chunk", ""))
+
+        _stream_handler_installed = True
+
+
+class ProgressTracker:
+    """Turns CrewAI task callbacks and LLM stream chunks into progress events.
+
+    Events are plain dicts passed to ``on_event``:
+
+    - ``{"type": "task_started", "stage", "index", "total"}``
+    - ``{"type": "token", "stage", "text"}``
+    - ``{"type": "subtask_completed", "stage", "done", "of", "seconds"}``
+    - ``{"type": "task_completed", "stage", "index", "total", "output", "seconds"}``
+    - ``{"type": "run_completed", "seconds"}``
+
+    Stages are assumed to run in order, so a stage starts when the previous
+    one completes. ``tasks_per_stage`` lets one stage span several crew
+    tasks (e.g. parallel research plus its merge); the stage completes with
+    the output of its last task.
+    """
+
+    def __init__(self, stages: list, on_event, tasks_per_stage: dict = None):
+        self.stages = list(stages)
+        self.on_event = on_event
+        self.tasks_per_stage = tasks_per_stage or {}
+        self._index = 0
+        self._stage_tasks_done = 0
+        self._lock = threading.Lock()
+        self._run_started = None
+        self._stage_started = None
+        self._context_token = None
+
+    @property
+    def current_stage(self):
+        if self._index < len(self.stages):
+            return self.stages[self._index]
+        return None
+
+    def __enter__(self):
+        _install_stream_handler()
+        with _active_lock:
+            _active_trackers.append(self)
+        self._context_token = _current_tracker.set(self)
+        self._run_started = time.perf_counter()
+        self._start_stage()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        with _active_lock:
+            if self in _active_trackers:
+                _active_trackers.remove(self)
+        _current_tracker.reset(self._context_token)
+        if exc_type is None:
+            self._emit(
+                type="run_completed",
+                seconds=time.perf_counter() - self._run_started,
+            )
+        return False
+
+    def _start_stage(self):
+        self._stage_started = time.perf_counter()
+        self._stage_tasks_done = 0
+        if self.current_stage is not None:
+            self._emit(
+                type="task_started",
+                stage=self.current_stage,
+                index=self._index,
+                total=len(self.stages),
+            )
+
+    def on_token(self, text: str):
+        if text and self.current_stage is not None:
+            self._emit(type="token", stage=self.current_stage, text=text)
+
+    def on_task_output(self, output):
+        """CrewAI ``task_callback``: called with each finished TaskOutput.
+
+        Async tasks call this from their own threads, hence the lock.
+        """
+        raw = getattr(output, "raw", output)
+        with self._lock:
+            expected = self.tasks_per_stage.get(self.current_stage, 1)
+            self._stage_tasks_done += 1
+            if self._stage_tasks_done < expected:
+                self._emit(
+                    type="subtask_completed",
+                    stage=self.current_stage,
+                    done=self._stage_tasks_done,
+                    of=expected,
+                    seconds=time.perf_counter() - self._stage_started,
+                )
+                return
+
+            self._emit(
+                type="task_completed",
+                stage=self.current_stage,
+                index=self._index,
+                total=len(self.stages),
+                output=str(raw),
+                seconds=time.perf_counter() - self._stage_started,
+            )
+            self._index += 1
+            self._start_stage()
+
+    def _emit(self, **event):
+        try:
+            self.on_event(event)
+        except Exception as e:
+            print(f"[Progress] Event handler failed: {e}")
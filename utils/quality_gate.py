@@ -0,0 +1,307 @@
+# utils/quality_gate.py
+import ast
+import re
+from urllib.parse import urlparse
+
+from utils.sections import split_sections
+from utils.telemetry import span
+
+
+FENCE_RE = re.compile(r"^```\s*([\w+-]*)\s*$")
+LINK_RE = re.compile(r"!?\[([^\]]*)\]\(([^)\s]*)(?:\s+\"[^\"]*\")?\)")
+INLINE_CODE_RE = re.compile(r"`[^`]*`")
+WORD_RE = re.compile(r"[A-Za-z]+(?:'[A-Za-z]+)?")
+SENTENCE_END_RE = re.compile(r"[.!?]+|\n")
+VOWEL_GROUP_RE = re.compile(r"[aeiouy]+")
+SLUG_DROP_RE = re.compile(r"[^\w\s-]")
+
+PYTHON_LANGS = {"python", "py", "python3", "pycon"}
+LINK_SCHEMES = {"http", "https", "mailto"}
+
+# Score penalty per issue, by severity
+PENALTIES = {"error": 20, "warning": 10, "minor": 5}
+
+SKIP, LIGHT, FULL = "skip", "light", "full"
+
+
+class Issue:
+    __slots__ = ("check", "severity", "message", "line")
+
+    def __init__(self, check: str, severity: str, message: str, line=None):
+        self.check = check
+        self.severity = severity
+        self.message = message
+        # First line (0-based) of the section at fault; None if document-wide
+        self.line = line
+
+    def __str__(self):
+        return f"{self.check}: {self.message}"
+
+
+class QualityReport:
+    """Result of checking one draft: score, issues and the review decision."""
+
+    def __init__(self, issues: list, metrics: dict, decision: str):
+        self.issues = issues
+        self.metrics = metrics
+        self.decision = decision
+
+    @property
+    def score(self) -> int:
+        return max(0, 100 - sum(PENALTIES[issue.severity] for issue in self.issues))
+
+    @property
+    def flagged_lines(self) -> set:
+        return {issue.line for issue in self.issues if issue.line is not None}
+
+    @property
+    def document_wide(self) -> bool:
+        """Whether any issue concerns the whole draft rather than one section."""
+        return any(issue.line is None for issue in self.issues)
+
+    @property
+    def errors(self) -> int:
+        return sum(1 for issue in self.issues if issue.severity == "error")
+
+    def reasons(self) -> list:
+        return [str(issue) for issue in self.issues] or ["no issues found"]
+
+    def to_dict(self) -> dict:
+        return {
+            "decision": self.decision,
+            "score": self.score,
+            "reasons": self.reasons(),
+            **self.metrics,
+        }
+
+
+def heading_slug(heading: str) -> str:
+    """GitHub-style anchor for a heading line."""
+    text = SLUG_DROP_RE.sub("", heading.lstrip("#").strip().lower())
+    return re.sub(r"\s", "-", text)
+
+
+def python_source(code: str, lang: str) -> str:
+    """Strip REPL prompts and output so interactive examples can be parsed."""
+    if lang != "pycon" and ">>> " not in code:
+        return code
+    lines = []
+    for line in code.splitlines():
+        if line.startswith(">>> ") or line.startswith("... "):
+            lines.append(line[4:])
+        elif line.strip() in (">>>", "..."):
+            lines.append("")
+    return "\n".join(lines)
+
+
+def count_syllables(word: str) -> int:
+    word = word.lower()
+    count = len(VOWEL_GROUP_RE.findall(word))
+    if word.endswith("e") and not word.endswith("le") and count > 1:
+        count -= 1
+    return max(1, count)
+
+
+def reading_ease(prose: str) -> float:
+    """Flesch reading ease of ``prose`` (higher is easier, 60+ is plain English)."""
+    words = WORD_RE.findall(prose)
+    if not words:
+        return 100.0
+    sentences = sum(1 for s in SENTENCE_END_RE.split(prose) if WORD_RE.search(s))
+    sentences = max(1, sentences)
+    syllables = sum(count_syllables(word) for word in words)
+    return 206.835 - 1.015 * len(words) / sentences - 84.6 * syllables / len(words)
+
+
+class QualityGate:
+    """Deterministic pre-review checks that decide how much review a draft needs.
+
+    Drafts scoring at least ``skip_score`` with no errors skip the reviewer,
+    drafts scoring at least ``light_score`` only get their flagged sections
+    reviewed, and the rest get the full review. A draft outside the word
+    limits is an error, so a truncated draft is never skipped. ``evaluate``
+    keeps the last draft and report so the caller can act on the decision
+    after the crew finishes.
+    """
+
+    def __init__(
+        self,
+        skip_score: int = 90,
+        light_score: int = 70,
+        min_words: int = 300,
+        max_words: int = 3000,
+        min_readability: float = 50.0,
+    ):
+        self.skip_score = skip_score
+        self.light_score = light_score
+        self.min_words = min_words
+        self.max_words = max_words
+        self.min_readability = min_readability
+        self.draft = None
+        self.report = None
+
+    def evaluate(self, draft: str) -> QualityReport:
+        with span("quality_gate") as record:
+            issues, metrics = self.check(draft)
+            report = QualityReport(issues, metrics, FULL)
+            if report.score >= self.skip_score and not report.errors:
+                report.decision = SKIP
+            elif report.score >= self.light_score:
+                report.decision = LIGHT
+            record.attrs.update(
+                decision=report.decision, score=report.score, reasons=report.reasons()
+            )
+
+        self.draft = draft
+        self.report = report
+        print(
+            f"[QualityGate] {report.decision} (score {report.score}): "
+            f"{'; '.join(report.reasons())}"
+        )
+        return report
+
+    def needs_full_review(self, output) -> bool:
+        """``ConditionalTask`` condition: run the reviewer task only for FULL."""
+        return self.evaluate(str(getattr(output, "raw", output))).decision == FULL
+
+    def check(self, draft: str):
+        issues = []
+        sections = split_sections(draft, max_level=6)
+        slugs = {heading_slug(s.heading) for s in sections if s.heading}
+        prose = []
+        code_blocks = 0
+        previous_level = 0
+        h1_count = 0
+        next_start = 0
+
+        for index, section in enumerate(sections):
+            start = next_start
+            next_start += len(section.text.splitlines())
+            if section.level:
+                if section.level == 1:
+                    h1_count += 1
+                elif previous_level and section.level > previous_level + 1:
+                    issues.append(
+                        Issue(
+                            "headings",
+                            "warning",
+                            f"'{section.heading}' skips from level "
+                            f"{previous_level} to {section.level}",
+                            start,
+                        )
+                    )
+                previous_level = section.level
+
+            body_lines = section.text.splitlines()[1 if section.heading else 0 :]
+            if section.heading and not any(line.strip() for line in body_lines):
+                is_last = index == len(sections) - 1
+                # A heading directly followed by a subheading is not empty
+                if is_last or sections[index + 1].level <= section.level:
+                    message = f"'{section.heading}' is empty"
+                    issues.append(Issue("structure", "minor", message, start))
+
+            in_code, lang, code = False, "", []
+            for line in body_lines:
+                fence = FENCE_RE.match(line.strip())
+                if fence and not in_code:
+                    in_code, lang, code = True, fence.group(1).lower(), []
+                    continue
+                if in_code and line.strip() == "```":
+                    in_code = False
+                    code_blocks += 1
+                    issues.extend(
+                        self._check_code(lang, "\n".join(code), section, start)
+                    )
+                    continue
+                if in_code:
+                    code.append(line)
+                    continue
+
+                for _, url in LINK_RE.findall(line):
+                    problem = self._link_problem(url, slugs)
+                    if problem:
+                        issues.append(Issue("links", "warning", problem, start))
+                prose.append(INLINE_CODE_RE.sub("code", LINK_RE.sub(r"\1", line)))
+
+            if in_code:
+                issues.append(Issue("structure", "error", "unclosed code fence", start))
+
+        if h1_count != 1:
+            message = f"expected one title heading, found {h1_count}"
+            issues.append(Issue("headings", "warning", message))
+        if sum(1 for s in sections if s.level >= 2) < 2:
+            issues.append(Issue("structure", "warning", "fewer than two sections"))
+
+        prose_text = "\n".join(line.lstrip("#>-*0123456789. ") for line in prose)
+        words = len(WORD_RE.findall(prose_text))
+        if words < self.min_words:
+            message = f"{words} words, below {self.min_words}"
+            issues.append(Issue("length", "error", message))
+        elif words > self.max_words:
+            message = f"{words} words, above {self.max_words}"
+            issues.append(Issue("length", "error", message))
+
+        readability = reading_ease(prose_text)
+        if readability < self.min_readability:
+            issues.append(
+                Issue(
+                    "readability",
+                    "warning",
+                    f"reading ease {readability:.0f}, below {self.min_readability:.0f}",
+                )
+            )
+
+        metrics = {
+            "words": words,
+            "sections": len(sections),
+            "code_blocks": code_blocks,
+            "readability": round(readability, 1),
+        }
+        return issues, metrics
+
+    def _check_code(self, lang, code, section, line) -> list:
+        if lang not in PYTHON_LANGS:
+            return []
+        try:
+            ast.parse(python_source(code, lang))
+        except SyntaxError as e:
+            return [
+                Issue(
+                    "code",
+                    "error",
+                    f"Python block in '{section.heading or 'intro'}' does not parse "
+                    f"(line {e.lineno}: {e.msg})",
+                    line,
+                )
+            ]
+        return []
+
+    def _link_problem(self, url: str, slugs: set):
+        if not url:
+            return "link with an empty target"
+        if url.startswith("#"):
+            if url[1:] not in slugs:
+                return f"anchor {url} matches no heading"
+            return None
+        parsed = urlparse(url)
+        if parsed.scheme not in LINK_SCHEMES:
+            return f"link {url} is not an absolute web link"
+        if parsed.scheme != "mailto" and not parsed.netloc:
+            return f"link {url} has no host"
+        return None
+
+
+def get_quality_gate():
+    """Return a gate configured from ``review.gate``, or None if disabled."""
+    from models.local_llm import load_yaml_config
+
+    config = load_yaml_config().get("review", {}).get("gate", {})
+    if not config.get("enabled", True):
+        return None
+    return QualityGate(
+        skip_score=config.get("skip_score", 90),
+        light_score=config.get("light_score", 70),
+        min_words=config.get("min_words", 300),
+        max_words=config.get("max_words", 3000),
+        min_readability=config.get("min_readability", 50.0),
+    )
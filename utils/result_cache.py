@@ -0,0 +1,134 @@
+# utils/result_cache.py
+import glob
+import hashlib
+import json
+import os
+import re
+import threading
+from models.local_llm import load_yaml_config
+from models.routing import get_router
+from utils.disk_cache import DiskCache
+
+
+DEFAULT_CACHE_PATH = "cache/results.sqlite"
+
+# Files whose contents define the prompts the crew runs with
+DEFINITION_FILES = ["tasks/generate_tutorial.py", "agents/*.py"]
+
+
+def normalize_topic(topic: str) -> str:
+    """Normalize an (already processed) topic for use in a cache key."""
+    topic = re.sub(r"\s+", " ", topic.strip().lower())
+    return re.sub(r"^\W+|\W+$", "", topic)
+
+
+class CrewDefinition:
+    """Hash of the agent and task definitions, recomputed only on change.
+
+    The hash covers the task and agent modules plus the ``agents`` section
+    of the crew config (and the research and review modes when they are not
+    the default), so editing a prompt changes it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._files_hash = None
+        self._mtimes = None
+
+    def hash(self) -> str:
+        files = sorted(
+            path for pattern in DEFINITION_FILES for path in glob.glob(pattern)
+        )
+        mtimes = tuple((path, os.stat(path).st_mtime_ns) for path in files)
+        config = load_yaml_config()
+        agents_config = config.get("agents", {})
+        research = config.get("research", {})
+        review = config.get("review", {})
+
+        with self._lock:
+            if mtimes != self._mtimes or self._files_hash is None:
+                digest = hashlib.sha256()
+                for path in files:
+                    with open(path, "rb") as f:
+                        digest.update(path.encode() + b"\0" + f.read())
+                self._mtimes = mtimes
+                self._files_hash = digest.hexdigest()
+
+            # The config is already cached by the registry, so hash it each time
+            digest = hashlib.sha256(self._files_hash.encode())
+            digest.update(json.dumps(agents_config, sort_keys=True).encode())
+            if research.get("mode", "single") != "single":
+                # Only hashed when it changes the crew, so existing keys stay valid
+                research_definition = [research["mode"], research.get("angles") or []]
+                digest.update(json.dumps(research_definition).encode())
+            if review.get("mode", "full") != "full":
+                digest.update(json.dumps(["review", review["mode"]]).encode())
+            return digest.hexdigest()[:16]
+
+
+_crew_definition = CrewDefinition()
+
+
+def definition_hash() -> str:
+    """Hash of the crew definition, shared by the result cache and the archive."""
+    return _crew_definition.hash()
+
+
+class TutorialResultCache:
+    """Caches finished tutorials keyed by topic, model and crew definition.
+
+    The key includes ``definition_hash()``, so editing a prompt invalidates
+    old results.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        ttl: float = None,
+        max_entries: int = 500,
+    ):
+        self._store = DiskCache(
+            path, namespace="tutorials", ttl=ttl, max_entries=max_entries
+        )
+
+    def definition_hash(self) -> str:
+        return definition_hash()
+
+    def make_key(self, topic: str, model: str = None) -> str:
+        # Just llm.model unless stages are routed to other models
+        model = model or get_router().signature()
+        return f"{normalize_topic(topic)}|{model}|{self.definition_hash()}"
+
+    def get(self, topic: str):
+        return self._store.get(self.make_key(topic))
+
+    def set(self, topic: str, content: str, model: str = None):
+        """Store ``content``; ``model`` is the signature of the models that
+        wrote it, if not the currently configured ones."""
+        self._store.set(self.make_key(topic, model), content)
+
+    def stats(self) -> dict:
+        return self._store.stats()
+
+    def clear(self):
+        self._store.clear()
+
+
+_result_cache = None
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache():
+    """Return the process-wide tutorial cache, or None if disabled in the config."""
+    global _result_cache
+    with _result_cache_lock:
+        if _result_cache is None:
+            cache_config = load_yaml_config().get("result_cache", {})
+            if not cache_config.get("enabled", True):
+                return None
+            _result_cache = TutorialResultCache(
+                path=cache_config.get("path", DEFAULT_CACHE_PATH),
+                ttl=cache_config.get("ttl_seconds"),
+                max_entries=cache_config.get("max_entries", 500),
+            )
+        return _result_cache
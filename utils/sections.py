@@ -0,0 +1,47 @@
+# utils/sections.py
+import re
+
+
+HEADING_RE = re.compile(r"^(#{1,6})\s+\S")
+
+
+class Section:
+    """A markdown heading and everything up to the next heading."""
+
+    __slots__ = ("heading", "level", "text")
+
+    def __init__(self, text: str, heading: str = "", level: int = 0):
+        self.text = text
+        self.heading = heading
+        self.level = level
+
+
+def split_sections(markdown: str, max_level: int = 3) -> list:
+    """Split markdown at headings up to ``max_level``, ignoring code blocks.
+
+    Text before the first heading becomes a section with an empty heading.
+    ``join_sections`` of the result gives back the original text.
+    """
+    sections = []
+    current = []
+    heading, level = "", 0
+    in_code = False
+
+    for line in markdown.splitlines(keepends=True):
+        if line.lstrip().startswith("```"):
+            in_code = not in_code
+        match = None if in_code else HEADING_RE.match(line)
+        if match and len(match.group(1)) <= max_level:
+            if current:
+                sections.append(Section("".join(current), heading, level))
+            current = []
+            heading, level = line.strip(), len(match.group(1))
+        current.append(line)
+
+    if current:
+        sections.append(Section("".join(current), heading, level))
+    return sections
+
+
+def join_sections(sections: list) -> str:
+    return "".join(section.text for section in sections)
@@ -0,0 +1,227 @@
+# utils/telemetry.py
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from utils.tokens import estimate_tokens
+
+
+_current_trace = contextvars.ContextVar("current_trace", default=None)
+_active_traces = []
+_active_lock = threading.Lock()
+
+
+class Span:
+    """One timed operation: a crew task, an LLM call or a search attempt."""
+
+    __slots__ = ("name", "run_id", "start", "end", "attrs")
+
+    def __init__(self, name: str, run_id: str = None, **attrs):
+        self.name = name
+        self.run_id = run_id
+        self.start = time.time()
+        self.end = None
+        self.attrs = attrs
+
+    @property
+    def seconds(self) -> float:
+        return (self.end or time.time()) - self.start
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "run_id": self.run_id,
+            "start": self.start,
+            "seconds": round(self.seconds, 6),
+            **self.attrs,
+        }
+
+
+class Trace:
+    """All spans recorded during one ``main.run()``."""
+
+    def __init__(self, topic: str = None):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.topic = topic
+        self.spans = []
+        self._lock = threading.Lock()
+        self._open_tasks = {}
+
+    def add(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+    def on_progress_event(self, event: dict):
+        """Open and close task spans from ``ProgressTracker`` events."""
+        if event["type"] == "task_started":
+            self._open_tasks[event["stage"]] = Span(
+                f"task.{event['stage']}", self.run_id
+            )
+        elif event["type"] == "task_completed":
+            span = self._open_tasks.pop(event["stage"], None)
+            if span is not None:
+                span.end = time.time()
+                span.attrs["output_tokens"] = estimate_tokens(event.get("output", ""))
+                self.add(span)
+                _metrics.observe(span)
+
+    def breakdown(self) -> list:
+        """Per-span-name totals, for showing where a run spent its time."""
+        rows = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            row = rows.setdefault(
+                span.name,
+                {
+                    "name": span.name,
+                    "count": 0,
+                    "seconds": 0.0,
+                    "prompt_tokens": 0,
+                    "completion_tokens": 0,
+                    "retries": 0,
+                },
+            )
+            row["count"] += 1
+            row["seconds"] += span.seconds
+            row["prompt_tokens"] += span.attrs.get("prompt_tokens", 0)
+            row["completion_tokens"] += span.attrs.get("completion_tokens", 0)
+            row["retries"] += span.attrs.get("retries", 0)
+        for row in rows.values():
+            row["seconds"] = round(row["seconds"], 3)
+        return sorted(rows.values(), key=lambda row: row["seconds"], reverse=True)
+
+    def to_jsonl(self) -> str:
+        with self._lock:
+            return "".join(json.dumps(span.to_dict()) + "\n" for span in self.spans)
+
+    def write_jsonl(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(self.to_jsonl())
+
+
+class Metrics:
+    """Process-wide aggregates of every recorded span, for Prometheus export."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def observe(self, span: Span):
+        with self._lock:
+            series = self._series.setdefault(
+                span.name,
+                {
+                    "count": 0,
+                    "seconds": 0.0,
+                    "prompt_tokens": 0,
+                    "completion_tokens": 0,
+                    "retries": 0,
+                    "errors": 0,
+                },
+            )
+            series["count"] += 1
+            series["seconds"] += span.seconds
+            series["prompt_tokens"] += span.attrs.get("prompt_tokens", 0)
+            series["completion_tokens"] += span.attrs.get("completion_tokens", 0)
+            series["retries"] += span.attrs.get("retries", 0)
+            if span.attrs.get("error"):
+                series["errors"] += 1
+
+    def prometheus_text(self) -> str:
+        """Render the aggregates in the Prometheus text exposition format."""
+        metrics = [
+            ("tutorial_span_total", "count", "Number of completed spans"),
+            ("tutorial_span_seconds_total", "seconds", "Wall time spent in spans"),
+            ("tutorial_prompt_tokens_total", "prompt_tokens", "Prompt tokens sent"),
+            (
+                "tutorial_completion_tokens_total",
+                "completion_tokens",
+                "Completion tokens received",
+            ),
+            ("tutorial_retries_total", "retries", "Retries performed inside spans"),
+            ("tutorial_span_errors_total", "errors", "Spans that ended in an error"),
+        ]
+        with self._lock:
+            series = {name: dict(values) for name, values in self._series.items()}
+
+        lines = []
+        for metric, field, help_text in metrics:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for name in sorted(series):
+                lines.append(f'{metric}{{span="{name}"}} {series[name][field]}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        """Write the metrics file atomically (node-exporter textfile style)."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp_path, path)
+
+
+_metrics = Metrics()
+
+
+def get_metrics() -> Metrics:
+    return _metrics
+
+
+@contextmanager
+def start_trace(topic: str = None):
+    """Make a new ``Trace`` current for the calling context."""
+    trace = Trace(topic)
+    token = _current_trace.set(trace)
+    with _active_lock:
+        _active_traces.append(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+        with _active_lock:
+            _active_traces.remove(trace)
+
+
+def current_trace():
+    """Return the trace for this context.
+
+    Threads started by CrewAI do not inherit context variables, so when the
+    caller has none and exactly one run is active, that run's trace is used.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        with _active_lock:
+            if len(_active_traces) == 1:
+                trace = _active_traces[0]
+    return trace
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """Time a block; the yielded span's ``attrs`` can be updated inside it.
+
+    The span is added to the current trace (if any) and always counted in
+    the process-wide metrics. Exceptions are recorded and re-raised.
+    """
+    trace = current_trace()
+    record = Span(name, trace.run_id if trace else None, **attrs)
+    try:
+        yield record
+    except Exception as e:
+        record.attrs["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        record.end = time.time()
+        if trace is not None:
+            trace.add(record)
+        _metrics.observe(record)
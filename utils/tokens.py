@@ -0,0 +1,32 @@
+# utils/tokens.py
+import re
+
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+
+def estimate_tokens(text) -> int:
+    """Cheap token count estimate for prompts and completions.
+
+    Counts words and punctuation marks, which tracks LLaMA/Mistral-style
+    tokenizers within roughly 10-20% for English prose and code without
+    loading a tokenizer.
+    """
+    if not text:
+        return 0
+    if not isinstance(text, str):
+        text = messages_text(text)
+    return len(_TOKEN_RE.findall(text))
+
+
+def messages_text(messages) -> str:
+    """Flatten a chat message list (or a plain prompt) into one string."""
+    if isinstance(messages, str):
+        return messages
+    parts = []
+    for message in messages or []:
+        if isinstance(message, dict):
+            parts.append(str(message.get("content", "")))
+        else:
+            parts.append(str(message))
+    return "\n".join(parts)
@@ -0,0 +1,324 @@
+# utils/topic_similarity.py
+import hashlib
+import re
+import struct
+import threading
+import time
+import zlib
+from functools import lru_cache
+
+
+# Words that do not change what a tutorial is about
+FILLER_WORDS = set(
+    "a an and are basics beginner beginners for guide how in intro introduction "
+    "is learn learning of on the to tutorial tutorials use using what with".split()
+)
+
+# Language keywords: "Python is operator" and "Python in operator" are
+# different tutorials
+KEYWORDS = set(
+    "and as break continue elif else except finally for from if import in is "
+    "lambda not or pass return try while with yield".split()
+)
+
+# A filler word that is also a keyword is kept before one of these ("the with
+# statement", "for loops") and dropped elsewhere ("lists in python")
+SYNTAX_WORDS = set("block clause expression keyword loop operator statement".split())
+
+WORD_RE = re.compile(r"[a-z0-9+#]+")
+
+# Bump when canonical_topic changes so stored signatures are rebuilt
+CANONICAL_VERSION = 2
+
+# Each 64-byte BLAKE2b digest yields this many 32-bit hash values
+HASHES_PER_DIGEST = 16
+
+
+def stem(word: str) -> str:
+    """Crude plural stripping, enough to match "lists" with "list"."""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 4 and word.endswith(("sses", "xes", "zes", "ches", "shes")):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def canonical_topic(topic: str) -> str:
+    """Order-independent form of a topic without filler words.
+
+    "Python lists", "Lists in Python" and "python list tutorial" all become
+    "list python", while "Python is operator" keeps its keyword and becomes
+    "is operator python".
+    """
+    words = [stem(w) for w in WORD_RE.findall(topic.lower())]
+    kept = {
+        word
+        for word, following in zip(words, words[1:] + [None])
+        if word not in FILLER_WORDS
+        or (word in KEYWORDS and following in SYNTAX_WORDS)
+    }
+    return " ".join(sorted(kept))
+
+
+def near_spelling(a: str, b: str) -> bool:
+    """Whether two longer words differ by one typo (edit distance 1).
+
+    Short words and numbers must match exactly: "2" and "3", or "tree" and
+    "test", name different things.
+    """
+    if min(len(a), len(b)) < 5 or not (a.isalpha() and b.isalpha()):
+        return False
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+    for i, (x, y) in enumerate(zip(a, b)):
+        if x != y:
+            # One substituted character, or one extra character in ``b``
+            tail = a[i + 1 :] if len(a) == len(b) else a[i:]
+            return tail == b[i + 1 :]
+    return True
+
+
+def same_words(a: set, b: set) -> bool:
+    """Whether two word sets pair up, allowing a typo in longer words."""
+    if len(a) != len(b):
+        return False
+    unmatched = set(b - a)
+    for word in a - b:
+        partner = next((w for w in unmatched if near_spelling(word, w)), None)
+        if partner is None:
+            return False
+        unmatched.discard(partner)
+    return True
+
+
+def canonical_similarity(a: str, b: str) -> float:
+    """Shingle Jaccard similarity of two canonical topics.
+
+    Topics only match if they have the same content words, up to a typo in
+    a longer word: an extra word ("binary search trees" for "binary
+    search"), another number ("Python 2" for "Python 3") or another noun
+    ("pytest" for "unittest") makes them different topics, however many
+    characters they share.
+    """
+    if a == b:
+        return 1.0
+    if not same_words(set(a.split()), set(b.split())):
+        return 0.0
+    return jaccard(canonical_shingles(a), canonical_shingles(b))
+
+
+def shingles(topic: str, size: int = 3) -> frozenset:
+    """Character n-grams of the canonical topic, padded so short words count."""
+    return canonical_shingles(canonical_topic(topic), size)
+
+
+@lru_cache(maxsize=65536)
+def canonical_shingles(canonical: str, size: int = 3) -> frozenset:
+    text = f" {canonical} "
+    if len(text) <= size:
+        return frozenset([text])
+    return frozenset(text[i : i + size] for i in range(len(text) - size + 1))
+
+
+def jaccard(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+@lru_cache(maxsize=65536)
+def shingle_hashes(shingle: str, count: int) -> tuple:
+    """``count`` independent 32-bit hashes of one shingle.
+
+    Topics share most of their shingles, so the cache makes signatures cheap.
+    """
+    data = shingle.encode("utf-8")
+    values = []
+    for i in range(0, count, HASHES_PER_DIGEST):
+        digest = hashlib.blake2b(data, digest_size=64, salt=i.to_bytes(16, "little"))
+        values.extend(struct.unpack("<16I", digest.digest()))
+    return tuple(values[:count])
+
+
+class MinHasher:
+    """MinHash signatures split into LSH bands.
+
+    Two topics whose shingle sets have Jaccard similarity ``s`` share at
+    least one band with probability ``1 - (1 - s**rows) ** bands``; with the
+    defaults that is about 87% at 0.7, 99% at 0.8 and 22% at 0.5. Hashes
+    are stable across processes, so band keys can be stored.
+    """
+
+    def __init__(self, num_perm: int = 96, bands: int = 16):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+
+    def signature(self, shingle_set: set) -> list:
+        rows = (shingle_hashes(s, self.num_perm) for s in shingle_set)
+        return list(map(min, zip(*rows)))
+
+    def band_keys(self, shingle_set: set) -> list:
+        """One integer key per band; similar topics share at least one."""
+        signature = self.signature(shingle_set)
+        keys = []
+        for band in range(self.bands):
+            rows = signature[band * self.rows : (band + 1) * self.rows]
+            digest = zlib.crc32(struct.pack(f"<{self.rows}I", *rows))
+            keys.append((band << 32) | digest)
+        return keys
+
+
+class TopicSimilarityIndex:
+    """In-memory LSH index that maps new topics to near-duplicates already seen.
+
+    ``add`` registers a topic with a value (for example a job); ``lookup``
+    returns the value of the most similar registered topic whose
+    ``canonical_similarity`` is at least ``threshold``. Lookups only compare the
+    topics that share an LSH band, so their cost does not grow with the
+    number of entries.
+    """
+
+    def __init__(self, threshold: float = 0.7, hasher: MinHasher = None):
+        self.threshold = threshold
+        self.hasher = hasher or MinHasher()
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._buckets = {}
+        self._stats = {"lookups": 0, "hits": 0, "lookup_seconds": 0.0}
+
+    def add(self, key, topic: str, value=None):
+        canonical = canonical_topic(topic)
+        bands = self.hasher.band_keys(canonical_shingles(canonical))
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (topic, canonical, bands, value)
+            for band in bands:
+                self._buckets.setdefault(band, set()).add(key)
+
+    def remove(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for band in entry[2]:
+            bucket = self._buckets.get(band)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band]
+
+    def lookup(self, topic: str):
+        """Return ``(key, topic, value, similarity)`` of the best match, or None."""
+        started = time.perf_counter()
+        canonical = canonical_topic(topic)
+        bands = self.hasher.band_keys(canonical_shingles(canonical))
+
+        with self._lock:
+            candidates = set()
+            for band in bands:
+                candidates |= self._buckets.get(band, set())
+            best = None
+            for key in candidates:
+                entry_topic, entry_canonical, _, value = self._entries[key]
+                similarity = canonical_similarity(canonical, entry_canonical)
+                if similarity >= self.threshold and (
+                    best is None or similarity > best[3]
+                ):
+                    best = (key, entry_topic, value, similarity)
+
+            self._stats["lookups"] += 1
+            self._stats["hits"] += best is not None
+            self._stats["lookup_seconds"] += time.perf_counter() - started
+        return best
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats, entries=len(self._entries))
+        lookups = stats["lookups"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["mean_lookup_ms"] = (
+            stats.pop("lookup_seconds") / lookups * 1000 if lookups else 0.0
+        )
+        return stats
+
+
+def similarity_threshold() -> float:
+    """``similarity.threshold`` from the config; 0 or null disables matching."""
+    from models.local_llm import load_yaml_config
+
+    config = load_yaml_config().get("similarity", {})
+    if not config.get("enabled", True):
+        return 0.0
+    return config.get("threshold", 0.7) or 0.0
+
+
+class Flight:
+    """A tutorial being generated; requests for similar topics wait on it."""
+
+    def __init__(self, topic: str):
+        self.topic = topic
+        self.content = None
+        self._done = threading.Event()
+
+    def wait(self, timeout: float = None):
+        """The generated content, or None if the run failed or timed out."""
+        self._done.wait(timeout)
+        return self.content
+
+
+class InFlightTopics:
+    """Topics being generated right now in this process.
+
+    The first request for a topic leads and generates it; a near-duplicate
+    request that arrives meanwhile follows the leader's flight and reuses
+    its result instead of starting another crew.
+    """
+
+    def __init__(self, threshold: float = 0.7):
+        self.index = TopicSimilarityIndex(threshold)
+        self._lock = threading.Lock()
+
+    def start(self, topic: str):
+        """Return ``(flight, leader)``; only the leader should generate."""
+        with self._lock:
+            match = self.index.lookup(topic)
+            if match is not None:
+                return match[2], False
+            flight = Flight(topic)
+            self.index.add(id(flight), topic, flight)
+            return flight, True
+
+    def finish(self, flight: Flight, content: str = None):
+        with self._lock:
+            self.index.remove(id(flight))
+        flight.content = content
+        flight._done.set()
+
+    def stats(self) -> dict:
+        return self.index.stats()
+
+
+_in_flight = None
+_in_flight_lock = threading.Lock()
+
+
+def get_in_flight_topics():
+    """Return the process-wide in-flight topics, or None if matching is disabled."""
+    global _in_flight
+    with _in_flight_lock:
+        if _in_flight is None:
+            threshold = similarity_threshold()
+            if not threshold:
+                return None
+            _in_flight = InFlightTopics(threshold)
+        return _in_flight
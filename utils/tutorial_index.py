@@ -0,0 +1,379 @@
+# utils/tutorial_index.py
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from models.local_llm import load_yaml_config
+from utils.result_cache import normalize_topic
+from utils.topic_similarity import (
+    CANONICAL_VERSION,
+    MinHasher,
+    canonical_shingles,
+    canonical_similarity,
+    canonical_topic,
+)
+
+
+DEFAULT_INDEX_PATH = "cache/tutorials.sqlite"
+
+TERM_RE = re.compile(r"\w+")
+
+
+class ArchivedTutorial:
+    """One archived tutorial's metadata; ``content`` is only loaded on demand."""
+
+    __slots__ = ("id", "topic", "model", "created_at", "stats", "exact", "content")
+
+    def __init__(self, id, topic, model, created_at, stats, exact=False, content=None):
+        self.id = id
+        self.topic = topic
+        self.model = model
+        self.created_at = created_at
+        self.stats = stats
+        self.exact = exact
+        self.content = content
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "topic": self.topic,
+            "model": self.model,
+            "created_at": self.created_at,
+            "exact": self.exact,
+            **self.stats,
+        }
+
+
+class TutorialIndex:
+    """Archive of every generated tutorial with a full-text index on SQLite.
+
+    Tutorials are stored with their topic, models, crew definition hash,
+    creation time and run stats, and indexed with FTS5 so earlier work on
+    the same or a related topic can be found before a crew is started.
+    Exact topic matches use a plain index on the normalized topic; related
+    topics are ranked by BM25 with the topic weighted well above the body.
+    Each topic's MinHash LSH bands are stored too, so near-duplicate topics
+    ("Lists in Python" for "Python lists") are found without scanning the
+    archive.
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._hasher = MinHasher()
+        self._similar_stats = {"lookups": 0, "hits": 0}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS tutorials (
+                id INTEGER PRIMARY KEY,
+                topic TEXT NOT NULL,
+                topic_key TEXT NOT NULL,
+                model TEXT,
+                definition TEXT,
+                content TEXT NOT NULL,
+                content_hash TEXT NOT NULL UNIQUE,
+                stats TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(tutorials)")]
+        if "definition" not in columns:
+            # Archives from before the definition hash was stored
+            self._conn.execute("ALTER TABLE tutorials ADD COLUMN definition TEXT")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_tutorials_topic "
+            "ON tutorials (topic_key, created_at)"
+        )
+        # Porter stemming lets "list" find "Python Lists"
+        self._conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS tutorials_fts USING fts5("
+            "topic, content, content='tutorials', content_rowid='id', "
+            "tokenize='porter unicode61')"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS topic_signatures ("
+            "tutorial_id INTEGER PRIMARY KEY, canonical TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_topic_canonical "
+            "ON topic_signatures (canonical)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS topic_bands ("
+            "band INTEGER NOT NULL, tutorial_id INTEGER NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_topic_bands ON topic_bands (band)"
+        )
+        # Signatures from an older canonical form are recomputed below
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != CANONICAL_VERSION:
+            self._conn.execute("DELETE FROM topic_signatures")
+            self._conn.execute("DELETE FROM topic_bands")
+            self._conn.execute(f"PRAGMA user_version = {CANONICAL_VERSION}")
+        # Tutorials archived before signatures were stored
+        missing = self._conn.execute(
+            "SELECT id, topic FROM tutorials WHERE id NOT IN "
+            "(SELECT tutorial_id FROM topic_signatures)"
+        ).fetchall()
+        for tutorial_id, topic in missing:
+            self._add_signature(tutorial_id, topic)
+        self._conn.commit()
+
+    def _add_signature(self, tutorial_id: int, topic: str):
+        canonical = canonical_topic(topic)
+        bands = self._hasher.band_keys(canonical_shingles(canonical))
+        self._conn.execute(
+            "INSERT INTO topic_signatures (tutorial_id, canonical) VALUES (?, ?)",
+            (tutorial_id, canonical),
+        )
+        self._conn.executemany(
+            "INSERT INTO topic_bands (band, tutorial_id) VALUES (?, ?)",
+            [(band, tutorial_id) for band in bands],
+        )
+
+    def add(
+        self,
+        topic: str,
+        content: str,
+        model: str = None,
+        stats: dict = None,
+        definition: str = None,
+    ):
+        """Archive a tutorial; returns its id, or None if it was already stored.
+
+        ``model`` is the router signature of the models that wrote it and
+        ``definition`` the crew definition hash, as in the result cache key.
+        """
+        content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO tutorials (topic, topic_key, model, "
+                "definition, content, content_hash, stats, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    topic,
+                    normalize_topic(topic),
+                    model,
+                    definition,
+                    content,
+                    content_hash,
+                    json.dumps(stats or {}),
+                    time.time(),
+                ),
+            )
+            if not cursor.rowcount:
+                return None
+            tutorial_id = cursor.lastrowid
+            self._conn.execute(
+                "INSERT INTO tutorials_fts (rowid, topic, content) VALUES (?, ?, ?)",
+                (tutorial_id, topic, content),
+            )
+            self._add_signature(tutorial_id, topic)
+            self._conn.commit()
+            return tutorial_id
+
+    @staticmethod
+    def _reusable(model: str, definition: str, max_age: float):
+        """SQL conditions on ``t`` and their parameters; None means any value."""
+        conditions, params = [], []
+        if model is not None:
+            conditions.append("t.model = ?")
+            params.append(model)
+        if definition is not None:
+            conditions.append("t.definition = ?")
+            params.append(definition)
+        if max_age:
+            conditions.append("t.created_at >= ?")
+            params.append(time.time() - max_age)
+        return "".join(f" AND {c}" for c in conditions), params
+
+    def find_exact(
+        self, topic: str, model: str = None, definition: str = None, max_age=None
+    ):
+        """The newest tutorial archived for exactly this (normalized) topic.
+
+        Given ``model``, ``definition`` or ``max_age`` (seconds), only
+        tutorials written by those models, with that crew definition, or
+        recently enough are considered, so the archive follows the result
+        cache's invalidation rules.
+        """
+        conditions, params = self._reusable(model, definition, max_age)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT t.id, t.topic, t.model, t.created_at, t.stats, t.content "
+                f"FROM tutorials t WHERE t.topic_key = ?{conditions} "
+                "ORDER BY t.created_at DESC LIMIT 1",
+                [normalize_topic(topic)] + params,
+            ).fetchone()
+        if row is None:
+            return None
+        return ArchivedTutorial(*row[:4], json.loads(row[4]), True, row[5])
+
+    def find_similar(
+        self,
+        topic: str,
+        threshold: float = 0.7,
+        model: str = None,
+        definition: str = None,
+        max_age=None,
+    ):
+        """The newest tutorial whose topic is a near-duplicate of ``topic``.
+
+        Topics with the same canonical form match outright. Otherwise
+        similarity is ``canonical_similarity``, computed once per distinct
+        canonical topic sharing an LSH band with ``topic``. ``model``,
+        ``definition`` and ``max_age`` filter as in ``find_exact``.
+        """
+        canonical = canonical_topic(topic)
+        query_shingles = canonical_shingles(canonical)
+        conditions, params = self._reusable(model, definition, max_age)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT t.id FROM topic_signatures s "
+                "JOIN tutorials t ON t.id = s.tutorial_id "
+                f"WHERE s.canonical = ?{conditions} "
+                "ORDER BY t.created_at DESC LIMIT 1",
+                [canonical] + params,
+            ).fetchone()
+            best, similarity = (row[0], 1.0) if row else (None, 0.0)
+
+            if best is None:
+                bands = self._hasher.band_keys(query_shingles)
+                placeholders = ",".join("?" * len(bands))
+                # The newest tutorial for each candidate canonical topic
+                rows = self._conn.execute(
+                    "SELECT s.canonical, t.id, MAX(t.created_at) FROM topic_bands b "
+                    "JOIN topic_signatures s ON s.tutorial_id = b.tutorial_id "
+                    "JOIN tutorials t ON t.id = b.tutorial_id "
+                    f"WHERE b.band IN ({placeholders}){conditions} "
+                    "GROUP BY s.canonical",
+                    bands + params,
+                ).fetchall()
+                for candidate, tutorial_id, _ in rows:
+                    score = canonical_similarity(canonical, candidate)
+                    if score >= threshold and score > similarity:
+                        best, similarity = tutorial_id, score
+
+            self._similar_stats["lookups"] += 1
+            self._similar_stats["hits"] += best is not None
+
+        if best is None:
+            return None
+        tutorial = self.get(best)
+        tutorial.stats["similarity"] = round(similarity, 3)
+        return tutorial
+
+    def search(self, query: str, limit: int = 5, topics_only: bool = True) -> list:
+        """Archived tutorials related to ``query``, best match first.
+
+        Exact topic matches lead, then topics containing every query term,
+        then (only if there are too few of those) topics sharing any term.
+        With ``topics_only=False`` tutorial bodies are searched as well.
+        Content is not loaded; use ``get``.
+        """
+        # Quoted so words like AND/OR/NOT in a topic are not read as operators
+        terms = TERM_RE.findall(query.lower())
+        terms = [f'"{term}"' for term in dict.fromkeys(terms)]
+        if not terms:
+            return []
+        topic_key = normalize_topic(query)
+
+        with self._lock:
+            ids = [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT id FROM tutorials WHERE topic_key = ? "
+                    "ORDER BY created_at DESC LIMIT ?",
+                    (topic_key, limit),
+                )
+            ]
+            expressions = [" AND ".join(terms)]
+            if len(terms) > 1:
+                # Matching any term is far less selective, so it is the fallback
+                expressions.append(" OR ".join(terms))
+            for expression in expressions:
+                if len(ids) >= limit:
+                    break
+                matches = self._match(expression, limit + len(ids), topics_only)
+                ids += [i for i in matches if i not in ids][: limit - len(ids)]
+            if not ids:
+                return []
+
+            placeholders = ",".join("?" * len(ids))
+            rows = self._conn.execute(
+                "SELECT id, topic, model, created_at, stats, topic_key "
+                f"FROM tutorials WHERE id IN ({placeholders})",
+                ids,
+            ).fetchall()
+
+        by_id = {
+            row[0]: ArchivedTutorial(*row[:4], json.loads(row[4]), row[5] == topic_key)
+            for row in rows
+        }
+        return [by_id[i] for i in ids if i in by_id]
+
+    def _match(self, expression: str, limit: int, topics_only: bool) -> list:
+        """Ids of the best BM25 matches, with topic hits weighted over the body."""
+        if topics_only:
+            expression = f"topic : ({expression})"
+        rows = self._conn.execute(
+            "SELECT rowid FROM tutorials_fts WHERE tutorials_fts MATCH ? "
+            "ORDER BY bm25(tutorials_fts, 10.0, 1.0) LIMIT ?",
+            (expression, limit),
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def get(self, tutorial_id: int):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, topic, model, created_at, stats, content FROM tutorials "
+                "WHERE id = ?",
+                (tutorial_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return ArchivedTutorial(*row[:4], json.loads(row[4]), False, row[5])
+
+    def stats(self) -> dict:
+        with self._lock:
+            count, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(content)), 0) FROM tutorials"
+            ).fetchone()
+            lookups, hits = self._similar_stats["lookups"], self._similar_stats["hits"]
+        return {
+            "tutorials": count,
+            "characters": size,
+            "similar_lookups": lookups,
+            "similar_hits": hits,
+            "similar_hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+
+_tutorial_index = None
+_tutorial_index_lock = threading.Lock()
+
+
+def get_tutorial_index():
+    """Return the process-wide tutorial archive, or None if disabled in the config."""
+    global _tutorial_index
+    with _tutorial_index_lock:
+        if _tutorial_index is None:
+            archive_config = load_yaml_config().get("archive", {})
+            if not archive_config.get("enabled", True):
+                return None
+            _tutorial_index = TutorialIndex(
+                archive_config.get("path", DEFAULT_INDEX_PATH)
+            )
+        return _tutorial_index